@@ -1,14 +1,40 @@
 import asyncio
 import logging
 from pyrogram import Client, filters
+from pyrogram.enums import ChatType
+from pyrogram.errors import MessageNotModified
 from pyrogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton
 from AntakshariBot.game_manager import GameManager
 from AntakshariBot.database import db
-from AntakshariBot.utils import format_leaderboard, get_user_stats
+from AntakshariBot.data.data_loader import data_loader
+from AntakshariBot.utils import format_bucket_leaderboard, format_leaderboard, format_word_page, get_user_stats
 import config
 
 logger = logging.getLogger(__name__)
 
+# Every command the bot handles, so game words never match a command
+COMMANDS = [
+    "start", "antakshari", "join", "leave", "endgame", "help", "stats", "leaderboard", "gamestats", "countries", "cities",
+    "wordstats", "refreshdata"
+]
+
+# Handler group checked before the command handlers (group 0)
+GAME_GROUP = -1
+
+# The dispatch filters below are coroutines, so pyrogram awaits them inline instead of in its thread pool
+
+async def is_expected_speaker(flt, client, message: Message) -> bool:
+    """Dispatch filter: pass only messages from the player whose turn it is in a chat with a running game,
+    leaving anything that looks like a command, handled or not, to the command handlers"""
+    if message.from_user is None or flt.speakers.get(message.chat.id) != message.from_user.id:
+        return False
+    return not (message.text or "").startswith("/")
+
+async def is_chatter(flt, client, message: Message) -> bool:
+    """Dispatch filter: pass group text that is not a command"""
+    text = message.text
+    return bool(text) and text[0] != "/" and message.chat is not None and message.chat.type in flt.chat_types
+
 class AntakshariBot:
     def __init__(self):
         self.app = Client(
@@ -19,7 +45,11 @@ class AntakshariBot:
         )
         
         self.game_manager = GameManager()
-        self.app.join_timers = {}
+        # Drops group chatter before any game handler runs, see GameManager.expected_speakers
+        self.expected_speaker = filters.create(
+            is_expected_speaker, "ExpectedSpeakerFilter", speakers=self.game_manager.expected_speakers
+        )
+        self.chatter = filters.create(is_chatter, "ChatterFilter", chat_types={ChatType.GROUP, ChatType.SUPERGROUP})
         self.setup_handlers()
     
     def setup_handlers(self):
@@ -53,6 +83,7 @@ class AntakshariBot:
                 "🎮 **Antakshari Game Help**\n\n"
                 "**Game Commands:**\n"
                 "🎯 `/antakshari` - Start new game\n"
+                "🗺️ `/antakshari countries` / `cities` / `cities of India` - Start a themed game\n"
                 "🚪 `/join` - Join current game\n"
                 "🚫 `/leave` - Leave current game\n"
                 "⏹️ `/endgame` - End current game (admin only)\n"
@@ -60,8 +91,10 @@ class AntakshariBot:
                 "**Player Commands:**\n"
                 "📈 `/stats` - Your statistics\n"
                 "🏆 `/leaderboard` - Top 10 players\n"
-                "🌍 `/countries` - List of valid countries\n"
-                "🏙️ `/cities` - List of valid cities\n\n"
+                "📅 `/leaderboard week` / `day` - Top players this week or today\n"
+                "👥 `/leaderboard group` - Top players in this group (add `week` or `day`)\n"
+                "🌍 `/countries [letter]` - Browse valid countries\n"
+                "🏙️ `/cities [prefix]` - Browse valid cities\n\n"
                 "**Game Rules:**\n"
                 "• Say country or city names\n"
                 "• Next word must start with last letter of previous word\n"
@@ -70,7 +103,7 @@ class AntakshariBot:
                 "• Earn points for correct answers\n\n"
                 "**Scoring:**\n"
                 f"• Correct answer: {config.POINTS_PER_WORD} points\n"
-                f"• Bonus for rare words: {config.BONUS_POINTS} points\n"
+                f"• Bonus for hard words: up to {config.BONUS_POINTS} points\n"
                 "• Streak bonus: +1 point per consecutive turn"
             )
             await message.reply_text(help_text)
@@ -81,10 +114,16 @@ class AntakshariBot:
             user_id = message.from_user.id
             user_name = message.from_user.first_name
             
-            # First try to end any existing game in the database
-            await self.game_manager.end_game(chat_id)
+            # Optional theme, e.g. "/antakshari countries" or "/antakshari cities of India"
+            theme = data_loader.index.find_theme(" ".join(message.command[1:]))
+            if theme is None:
+                await message.reply_text(
+                    "❌ Unknown theme!\n\n"
+                    "Try `/antakshari`, `/antakshari countries`, `/antakshari cities` or `/antakshari cities of India`."
+                )
+                return
             
-            result = await self.game_manager.start_game(chat_id, user_id, user_name)
+            result = await self.game_manager.start_game(chat_id, user_id, user_name, theme.key)
             
             if result["success"]:
                 keyboard = InlineKeyboardMarkup([
@@ -94,7 +133,7 @@ class AntakshariBot:
                 
                 await message.reply_text(
                     f"🎮 **Antakshari Game Started!**\n\n"
-                    f"🌍 **Theme:** Countries & Cities\n"
+                    f"🌍 **Theme:** {theme.title}\n"
                     f"👤 **Started by:** {user_name}\n"
                     f"⏰ **Join Time:** {config.JOIN_TIME} seconds\n"
                     f"👥 **Players:** 1/{config.MAX_PLAYERS}\n\n"
@@ -104,7 +143,7 @@ class AntakshariBot:
                 )
                 
                 # Start join timer
-                self.app.join_timers[chat_id] = asyncio.create_task(self.game_manager.start_join_timer(chat_id, client))
+                self.game_manager.start_join_timer(chat_id, client)
             else:
                 await message.reply_text(f"❌ {result['message']}")
         
@@ -120,7 +159,7 @@ class AntakshariBot:
                 game = result["game"]
                 await message.reply_text(
                     f"✅ {user_name} joined the game!\n"
-                    f"👥 Players: {len(game['players'])}/{config.MAX_PLAYERS}\n"
+                    f"👥 Players: {len(game.players)}/{config.MAX_PLAYERS}\n"
                     f"⏰ Time left: {result.get('time_left', 'Unknown')} seconds"
                 )
             else:
@@ -132,7 +171,7 @@ class AntakshariBot:
             user_id = message.from_user.id
             user_name = message.from_user.first_name
             
-            result = await self.game_manager.leave_game(chat_id, user_id)
+            result = await self.game_manager.leave_game(chat_id, user_id, client)
             
             if result["success"]:
                 await message.reply_text(f"👋 {user_name} left the game!")
@@ -157,7 +196,7 @@ class AntakshariBot:
             else:
                 await message.reply_text(f"❌ {result['message']}")
         
-        @self.app.on_message(filters.text & filters.group & ~filters.command(["antakshari", "join", "leave", "endgame", "help", "stats", "leaderboard", "gamestats", "countries", "cities"]))
+        @self.app.on_message(self.expected_speaker & filters.text & filters.group & ~filters.command(COMMANDS), group=GAME_GROUP)
         async def handle_game_message(client, message: Message):
             chat_id = message.chat.id
             user_id = message.from_user.id
@@ -172,16 +211,22 @@ class AntakshariBot:
                     if result["type"] == "correct":
                         points = result.get("points", config.POINTS_PER_WORD)
                         streak = result.get("streak", 0)
-                        next_letter = result.get("next_letter", "")
+                        next_letter = result.get("next_letter", "").upper() or "any letter"
+                        last_letter = result.get("last_letter", "").upper()
+                        letter_rule = result.get("letter_rule", "last")
                         next_player = result.get("next_player", "Unknown")
                         
                         # Combine both messages into one
                         response = f"✅ **Correct!** +{points} points\n"
                         if streak > 1:
                             response += f"🔥 Streak: {streak}\n"
-                        response += f"📝 Next word should start with: **{next_letter.upper()}**\n"
+                        if letter_rule == "second_last":
+                            response += f"🚫 No unused words start with **{last_letter}**, using the second-to-last letter!\n"
+                        elif letter_rule == "free":
+                            response += f"🚫 No unused words start with **{last_letter}**, any letter goes!\n"
+                        response += f"📝 Next word should start with: **{next_letter}**\n"
                         response += f"\n🎮 **{next_player}**, it's your turn!\n"
-                        response += f"📝 Say a country or city starting with **{next_letter.upper()}**\n"
+                        response += f"📝 Say a country or city starting with **{next_letter}**\n"
                         response += f"⏰ You have {config.TURN_TIME} seconds to answer."
                         
                         await message.reply_text(response)
@@ -195,12 +240,12 @@ class AntakshariBot:
                         
                         if reason == "last_player":
                             response = f"🎉 **Game Over!**\n\n"
-                            response += f"🏆 **Winner:** {winner['name']} (Last player standing!)\n"
-                            response += f"💯 **Final Score:** {winner['score']} points"
+                            response += f"🏆 **Winner:** {winner.name} (Last player standing!)\n"
+                            response += f"💯 **Final Score:** {winner.score} points"
                         else:
                             final_scores = result.get("scores", {})
                             response = f"🎉 **Game Over!**\n\n"
-                            response += f"🏆 **Winner:** {winner['name']} ({winner['score']} points)\n\n"
+                            response += f"🏆 **Winner:** {winner.name} ({winner.score} points)\n\n"
                             response += "📊 **Final Scores:**\n"
                             
                             for player_id, score in sorted(final_scores.items(), key=lambda x: x[1], reverse=True):
@@ -213,6 +258,11 @@ class AntakshariBot:
                     # Only show error message, no elimination for wrong answers
                     await message.reply_text(f"❌ {result['message']}")
         
+        @self.app.on_message(self.chatter, group=GAME_GROUP)
+        async def drop_chatter(client, message: Message):
+            # Group chatter that is not the current player's answer: skip the command handlers too
+            message.stop_propagation()
+        
         @self.app.on_message(filters.command("stats"))
         async def user_stats(client, message: Message):
             user_id = message.from_user.id
@@ -225,6 +275,9 @@ class AntakshariBot:
                 response += f"🎮 Games Played: {stats.get('games_played', 0)}\n"
                 response += f"🏆 Games Won: {stats.get('games_won', 0)}\n"
                 response += f"📈 Total Points: {stats.get('total_points', 0)}\n"
+                rank = db.get_player_rank(user_id)
+                if rank:
+                    response += f"🌐 Global Rank: #{rank[0]} of {rank[1]}\n"
                 response += f"💯 Best Score: {stats.get('best_score', 0)}\n"
                 response += f"🔥 Best Streak: {stats.get('best_streak', 0)}\n"
                 response += f"✅ Correct Words: {stats.get('correct_words', 0)}\n"
@@ -243,7 +296,19 @@ class AntakshariBot:
         
         @self.app.on_message(filters.command("leaderboard"))
         async def leaderboard(client, message: Message):
-            leaderboard_text = await format_leaderboard()
+            # /leaderboard [group] [week|day]: global all-time by default
+            args = [arg.lower() for arg in message.command[1:]]
+            group = "group" in args
+            period = "week" if "week" in args else "day" if "day" in args else "all"
+            
+            if group and message.chat.type not in (ChatType.GROUP, ChatType.SUPERGROUP):
+                await message.reply_text("❌ Group leaderboards only work in groups!")
+                return
+            
+            if group or period != "all":
+                leaderboard_text = await format_bucket_leaderboard(message.chat.id, period, group)
+            else:
+                leaderboard_text = format_leaderboard()
             await message.reply_text(leaderboard_text)
         
         @self.app.on_message(filters.command("gamestats") & filters.group)
@@ -254,17 +319,19 @@ class AntakshariBot:
             if game_info:
                 response = f"🎮 **Current Game Status**\n\n"
                 response += f"📊 Status: {game_info['status'].title()}\n"
+                response += f"🌍 Theme: {game_info['theme']}\n"
                 response += f"👥 Players: {len(game_info['players'])}\n"
                 
                 if game_info['status'] == 'active':
                     response += f"🎯 Current Turn: {game_info.get('current_player_name', 'Unknown')}\n"
                     response += f"📝 Last Word: {game_info.get('last_word', 'None')}\n"
                     response += f"🔤 Next Letter: {game_info.get('next_letter', 'Any').upper()}\n"
+                    response += f"📚 Words Left: {game_info.get('words_left', 0):,}\n"
                     response += f"📈 Round: {game_info.get('round', 1)}\n\n"
                     
                     response += "📊 **Current Scores:**\n"
                     for player in game_info['players']:
-                        response += f"• {player['name']}: {player['score']} points\n"
+                        response += f"• {player.name}: {player.score} points\n"
                 
                 await message.reply_text(response)
             else:
@@ -306,56 +373,28 @@ class AntakshariBot:
                     "• Last player wins"
                 )
                 await callback_query.answer(rules_text, show_alert=True)
+            
+            elif data.startswith("list_"):
+                # Page buttons of /countries and /cities: list_<kind>_<page>_<prefix>
+                try:
+                    _, kind, page, prefix = data.split("_", 3)
+                    text, keyboard = format_word_page(kind, prefix, int(page))
+                    await callback_query.message.edit_text(text, reply_markup=keyboard)
+                except MessageNotModified:
+                    # The button of the page already shown; nothing to redraw
+                    pass
+                except Exception as e:
+                    logger.error(f"Error turning word list page: {e}")
+                # Always answer, or the button keeps its loading spinner
+                await callback_query.answer()
     
         @self.app.on_message(filters.command("countries"))
         async def list_countries(client, message: Message):
-            try:
-                from AntakshariBot.data.data_loader import data_loader
-                
-                if not data_loader.data_loaded:
-                    await data_loader.load_all_data()
-                
-                countries_sample = list(data_loader.countries)[:50]  # Show first 50
-                
-                response = f"🌍 **Available Countries** (showing {len(countries_sample)} of {len(data_loader.countries)}):\n\n"
-                
-                for i, country in enumerate(sorted(countries_sample), 1):
-                    response += f"{i}. {country.title()}\n"
-                    if i % 20 == 0:  # Break every 20 countries
-                        response += "\n"
-                
-                response += f"\n📊 **Total Countries:** {len(data_loader.countries)}"
-                
-                await message.reply_text(response)
-                
-            except Exception as e:
-                logger.error(f"Error listing countries: {e}")
-                await message.reply_text("❌ Error loading countries list.")
+            await self.send_word_page(message, "countries")
 
         @self.app.on_message(filters.command("cities"))
         async def list_cities(client, message: Message):
-            try:
-                from AntakshariBot.data.data_loader import data_loader
-                
-                if not data_loader.data_loaded:
-                    await data_loader.load_all_data()
-                
-                cities_sample = list(data_loader.cities)[:50]  # Show first 50
-                
-                response = f"🏙️ **Available Cities** (showing {len(cities_sample)} of {len(data_loader.cities)}):\n\n"
-                
-                for i, city in enumerate(sorted(cities_sample), 1):
-                    response += f"{i}. {city.title()}\n"
-                    if i % 20 == 0:  # Break every 20 cities
-                        response += "\n"
-                
-                response += f"\n📊 **Total Cities:** {len(data_loader.cities)}"
-                
-                await message.reply_text(response)
-                
-            except Exception as e:
-                logger.error(f"Error listing cities: {e}")
-                await message.reply_text("❌ Error loading cities list.")
+            await self.send_word_page(message, "cities")
 
         @self.app.on_message(filters.command("wordstats"))
         async def word_stats(client, message: Message):
@@ -381,7 +420,7 @@ class AntakshariBot:
             try:
                 await message.reply_text("🔄 Refreshing word data...")
                 
-                success = await self.game_manager.word_validator.refresh_data()
+                success = await self.game_manager.refresh_word_data()
                 
                 if success:
                     stats = await self.game_manager.word_validator.get_word_count()
@@ -399,6 +438,20 @@ class AntakshariBot:
                 logger.error(f"Error refreshing data: {e}")
                 await message.reply_text("❌ Error refreshing word data.")
     
+    async def send_word_page(self, message: Message, kind: str):
+        """Reply with the first page of the country or city list"""
+        try:
+            if not data_loader.data_loaded:
+                await data_loader.load_all_data()
+            
+            # Optional letter or prefix filter, e.g. "/cities new"
+            text, keyboard = format_word_page(kind, " ".join(message.command[1:]))
+            await message.reply_text(text, reply_markup=keyboard)
+            
+        except Exception as e:
+            logger.error(f"Error listing {kind}: {e}")
+            await message.reply_text(f"❌ Error loading {kind} list.")
+    
     async def notify_player_turn(self, chat_id, player_name, next_letter, turn_time):
         """Send a notification to the group that it's a player's turn"""
         try:
@@ -417,6 +470,11 @@ class AntakshariBot:
             await self.app.start()
             logger.info(f"{config.BOT_NAME} started successfully")
             
+            # Pick up the games that were running before a restart
+            restored = await self.game_manager.restore_games(self.app)
+            if restored:
+                logger.info(f"Restored {restored} running games")
+            
             # Keep the bot running
             await asyncio.Event().wait()
             
@@ -424,4 +482,6 @@ class AntakshariBot:
             logger.error(f"Error starting bot: {e}")
             raise
         finally:
+            await self.game_manager.timers.stop()
+            await db.close()
             await self.app.stop()
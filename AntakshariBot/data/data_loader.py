@@ -1,23 +1,110 @@
+import asyncio
 import json
 import logging
 import os
-from typing import Set, Dict, List
+import re
+import time
+from typing import Set, Dict, Iterable, Iterator, List, Optional, Tuple
+from AntakshariBot.data.normalize import fold_word
+from AntakshariBot.data.snapshot import file_checksum, load_snapshot, save_snapshot
+from AntakshariBot.data.word_index import WordIndex, build_index
 
 logger = logging.getLogger(__name__)
 
+# Whitespace and commas between the elements of a JSON array, and the characters that can follow one
+_ARRAY_SEPARATOR = re.compile(r"[\s,]*")
+_ELEMENT_ENDS = frozenset(" \t\n\r,]")
+
+
+def iter_json_array(path: str, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """Yield the objects of a top-level JSON array one at a time without loading the whole file"""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ""
+        pos = 0
+        eof = False
+        in_array = False
+        
+        while True:
+            pos = _ARRAY_SEPARATOR.match(buffer, pos).end()
+            
+            # Need more input: keep only the unconsumed tail of the buffer
+            if pos >= len(buffer):
+                if eof:
+                    raise json.JSONDecodeError("Unterminated array", buffer, pos)
+                buffer = f.read(chunk_size)
+                pos = 0
+                eof = not buffer
+                continue
+            
+            if not in_array:
+                if buffer[pos] != '[':
+                    raise json.JSONDecodeError("Expecting '['", buffer, pos)
+                in_array = True
+                pos += 1
+                continue
+            
+            if buffer[pos] == ']':
+                return
+            
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+                # Elements end where a separator or the array does; a number cut off by the buffer,
+                # like "12" read as "1", does not
+                complete = eof or (end < len(buffer) and buffer[end] in _ELEMENT_ENDS)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                complete = False
+            
+            if not complete:
+                # The value continues past the buffer; read at least as much again and retry
+                chunk = f.read(max(chunk_size, len(buffer) - pos))
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                eof = not chunk
+                continue
+            
+            pos = end
+            yield record
+
+
+def clean_city_name(city: str) -> Optional[str]:
+    """Clean a raw city name, or return None if it is too short or not mostly letters"""
+    city_name = city.strip()
+    if not city_name or len(city_name) < 2:
+        return None
+    
+    # Clean city name - remove special characters at start
+    clean_city = city_name.lstrip("'\"").strip()
+    
+    # Only add if it contains mostly letters
+    total_chars = len(clean_city.replace(' ', '').replace('-', '').replace("'", ''))
+    if total_chars < 2:
+        return None
+    
+    # Check if it's mostly alphabetic
+    alpha_chars = sum(1 for c in clean_city if c.isalpha())
+    if (alpha_chars / total_chars) < 0.8:
+        return None
+    
+    return clean_city
+
 class DataLoader:
     def __init__(self):
-        self.countries: Set[str] = set()
-        self.cities: Set[str] = set()
-        self.rare_words: Set[str] = set()
-        self.alternative_names: Dict[str, str] = {}
+        # Every valid word with its category and rarity flags, see word_index.WordIndex
+        self.index: WordIndex = build_index((), (), ())
         self.data_loaded = False
         
         # Local JSON file path - YOU NEED TO UPLOAD YOUR JSON FILE HERE
         self.json_file = "AntakshariBot/data/countries_cities.json"
+        # Groups of alternative names for the same place, e.g. ["mumbai", "bombay"]
+        self.aliases_file = "AntakshariBot/data/aliases.json"
+        # Compiled snapshot of the word index, rebuilt whenever the JSON or aliases file changes
+        self.snapshot_file = "AntakshariBot/data/countries_cities.snapshot"
     
     async def load_data_from_json(self) -> bool:
-        """Load countries and cities data from local JSON file"""
+        """Load countries and cities data from the snapshot, or from local JSON file if it is stale"""
         try:
             # Check if file exists
             if not os.path.exists(self.json_file):
@@ -25,70 +112,18 @@ class DataLoader:
                 logger.error("Please upload your countries_cities.json file to AntakshariBot/data/ folder")
                 return False
             
-            # Load JSON data
-            with open(self.json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Clear existing data
-            self.countries.clear()
-            self.cities.clear()
-            self.rare_words.clear()
-            
-            # Process each country
-            for country_data in data:
-                country_name = country_data.get('name', '').strip()
-                cities_list = country_data.get('cities', [])
-                
-                # Add country name
-                if country_name and len(country_name) >= 2:
-                    self.countries.add(country_name.lower())
-                    
-                    # Mark long country names as rare
-                    if len(country_name) > 8:
-                        self.rare_words.add(country_name.lower())
-                
-                # Add cities for this country
-                for city in cities_list:
-                    city_name = city.strip()
-                    if city_name and len(city_name) >= 2:
-                        # Clean city name - remove special characters at start
-                        clean_city = city_name.lstrip("'\"").strip()
-                        
-                        # Only add if it contains mostly letters
-                        if clean_city and len(clean_city.replace(' ', '').replace('-', '').replace("'", '')) >= 2:
-                            # Check if it's mostly alphabetic
-                            alpha_chars = sum(1 for c in clean_city if c.isalpha())
-                            total_chars = len(clean_city.replace(' ', '').replace('-', '').replace("'", ''))
-                            
-                            if total_chars > 0 and (alpha_chars / total_chars) >= 0.8:
-                                self.cities.add(clean_city.lower())
-                                
-                                # Mark long city names as rare
-                                if len(clean_city) > 12:
-                                    self.rare_words.add(clean_city.lower())
+            # Build the new index in a worker thread so games keep running on the event loop
+            started = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            index, source = await loop.run_in_executor(None, self.load_index)
             
-            # Add manual alternative names
-            self.alternative_names.update({
-                "mumbai": "bombay",
-                "bombay": "mumbai",
-                "kolkata": "calcutta", 
-                "calcutta": "kolkata",
-                "chennai": "madras",
-                "madras": "chennai",
-                "beijing": "peking",
-                "peking": "beijing",
-                "new york": "new york city",
-                "new york city": "new york",
-                "usa": "united states",
-                "united states": "usa",
-                "uk": "united kingdom", 
-                "united kingdom": "uk",
-                "uae": "united arab emirates",
-                "united arab emirates": "uae"
-            })
+            # Swap in the complete index with a single assignment;
+            # readers holding the old index keep a consistent view until they finish
+            self.index = index
             
             self.data_loaded = True
-            logger.info(f"Data loaded successfully: {len(self.countries)} countries, {len(self.cities)} cities, {len(self.rare_words)} rare words")
+            elapsed = time.perf_counter() - started
+            logger.info(f"Data loaded successfully from {source} in {elapsed:.3f}s: {index.country_count} countries, {index.city_count} cities, {index.rare_count} rare words")
             return True
             
         except json.JSONDecodeError as e:
@@ -98,29 +133,84 @@ class DataLoader:
             logger.error(f"Error loading data from JSON: {e}")
             return False
     
+    def load_index(self) -> Tuple[WordIndex, str]:
+        """Load a new word index from the snapshot or JSON file without touching the live one"""
+        checksum = file_checksum(self.json_file, self.aliases_file)
+        
+        # Use the compiled snapshot if it matches the current JSON file
+        payload = load_snapshot(self.snapshot_file, checksum)
+        source = "snapshot"
+        
+        if payload is None:
+            payload = self.build_payload()
+            source = "JSON"
+            if save_snapshot(self.snapshot_file, checksum, payload):
+                logger.info(f"Word snapshot written to {self.snapshot_file}")
+        
+        return WordIndex.from_payload(payload), source
+    
+    def build_payload(self, records: Optional[Iterable[dict]] = None) -> dict:
+        """Build the word index stored in the snapshot, streaming the JSON file one country at a time by default"""
+        if records is None:
+            records = iter_json_array(self.json_file)
+        
+        countries: Set[str] = set()
+        cities: Set[str] = set()
+        # Country name -> its city names, for the "cities of" themes
+        country_cities: Dict[str, List[str]] = {}
+        
+        # Process each country
+        for country_data in records:
+            country_name = country_data.get('name', '').strip()
+            
+            # Add country name
+            if country_name and len(country_name) >= 2:
+                countries.add(country_name.lower())
+            
+            # Add cities for this country
+            country_city_names = country_cities.setdefault(country_name.lower(), []) if country_name else []
+            for city in country_data.get('cities', []):
+                clean_city = clean_city_name(city)
+                if clean_city:
+                    # One lowercase string shared by both tables
+                    city_name = clean_city.lower()
+                    cities.add(city_name)
+                    country_city_names.append(city_name)
+        
+        # Rarity comes from the difficulty score build_index gives every word, see difficulty.py
+        return build_index(countries, cities, (), self.load_aliases(), country_cities).to_payload()
+    
+    def load_aliases(self) -> List[List[str]]:
+        """Load the groups of alternative names"""
+        if not os.path.exists(self.aliases_file):
+            logger.warning(f"Aliases file not found: {self.aliases_file}")
+            return []
+        
+        with open(self.aliases_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
     async def load_all_data(self) -> bool:
         """Load all data from local JSON file"""
         return await self.load_data_from_json()
     
-    def get_all_words(self) -> Set[str]:
-        """Get all valid words (countries + cities)"""
-        return self.countries.union(self.cities)
-    
-    def is_rare_word(self, word: str) -> bool:
-        """Check if a word is considered rare"""
-        return word.lower() in self.rare_words
+    def get_word_id(self, word: str) -> Optional[int]:
+        """Get the word ID for any spelling of a word, or None if it is not valid"""
+        # Folded keys, as games store their used words, are found without folding them again
+        word_id = self.index.lookup(word)
+        return word_id if word_id is not None else self.index.lookup(fold_word(word))
     
-    def get_alternative_name(self, word: str) -> str:
-        """Get alternative name for a word if exists"""
-        return self.alternative_names.get(word.lower(), word)
+    def get_class_id(self, word: str) -> Optional[int]:
+        """Get the alias class ID shared by every name of the same place"""
+        word_id = self.get_word_id(word)
+        return self.index.class_of[word_id] if word_id is not None else None
     
     def get_stats(self) -> dict:
         """Get statistics about loaded data"""
         return {
-            "countries": len(self.countries),
-            "cities": len(self.cities), 
-            "rare_words": len(self.rare_words),
-            "total_words": len(self.get_all_words())
+            "countries": self.index.country_count,
+            "cities": self.index.city_count,
+            "rare_words": self.index.rare_count,
+            "total_words": len(self.index)
         }
 
 # Global data loader instance
@@ -129,3 +219,25 @@ data_loader = DataLoader()
 async def init_data_loader():
     """Initialize the data loader"""
     return await data_loader.load_all_data()
+
+def build_snapshot() -> bool:
+    """Compile the word snapshot ahead of time, so boots load it instead of rebuilding from JSON"""
+    if not os.path.exists(data_loader.json_file):
+        logger.warning(f"JSON file not found: {data_loader.json_file}; no snapshot built")
+        return False
+    
+    started = time.perf_counter()
+    index, source = data_loader.load_index()
+    if not os.path.exists(data_loader.snapshot_file):
+        logger.warning(f"Word snapshot could not be written to {data_loader.snapshot_file}")
+        return False
+    
+    logger.info(f"Word snapshot {data_loader.snapshot_file} ready from {source} in {time.perf_counter() - started:.3f}s "
+                f"with {len(index)} words")
+    return True
+
+if __name__ == "__main__":
+    # Run from the repository root by the deploy's build step: python -m AntakshariBot.data.data_loader
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    # A missing snapshot is not fatal: the bot rebuilds it at startup, only more slowly
+    build_snapshot()
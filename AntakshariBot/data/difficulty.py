@@ -0,0 +1,67 @@
+"""
+Per-word difficulty scores, computed once when the word index is built
+
+A word is hard to play when it:
+- ends with a letter few words start with, which traps the next player,
+- is long,
+- is an obscure name rather than a country everyone knows.
+
+Each factor is scaled to 0..1 and mixed into a score from 0 to MAX_DIFFICULTY,
+stored as one byte per word ID next to the word's flags.
+"""
+from array import array
+from typing import Dict, List, Tuple
+
+MAX_DIFFICULTY = 10
+
+# Words at or above this score count as rare
+RARE_DIFFICULTY = 8
+
+# Weights of the trap, length and obscurity factors
+TRAP_WEIGHT = 0.5
+LENGTH_WEIGHT = 0.3
+OBSCURITY_WEIGHT = 0.2
+
+# Letter counts at which the length factor starts and reaches its maximum
+SHORT_WORD = 3
+LONG_WORD = 20
+
+# Obscurity of a word by what it names
+COUNTRY_OBSCURITY = 0.0
+ALIAS_OBSCURITY = 0.25        # alternative names people actually use, e.g. "Bombay"
+SHARED_CITY_OBSCURITY = 0.5   # city names found in several countries, e.g. "San Jose"
+CITY_OBSCURITY = 1.0
+
+
+def trap_scores(letter_ranges: Dict[str, Tuple[int, int]]) -> Dict[str, float]:
+    """Get how hard it is to answer each next letter, from 0 for the most common first letter
+    to 1 for letters no word starts with"""
+    sizes = {letter: end - start for letter, (start, end) in letter_ranges.items()}
+    # Half the largest bucket: everything at least that common is an easy letter
+    reference = max(sizes.values(), default=0) / 2 or 1
+    return {letter: max(0.0, 1 - size / reference) for letter, size in sizes.items()}
+
+
+def score_words(keys: List[str], obscurity: List[float], letter_ranges: Dict[str, Tuple[int, int]]) -> array:
+    """Get the difficulty of every word, in word ID order"""
+    traps = trap_scores(letter_ranges)
+    span = LONG_WORD - SHORT_WORD
+    scale = MAX_DIFFICULTY
+    return array("B", (
+        int(0.5 + scale * (
+            TRAP_WEIGHT * traps.get(key[-1], 1.0)
+            + LENGTH_WEIGHT * min(1.0, max(0, len(key) - key.count(" ") - SHORT_WORD) / span)
+            + OBSCURITY_WEIGHT * word_obscurity
+        ))
+        for key, word_obscurity in zip(keys, obscurity)
+    ))
+
+
+def word_obscurity(is_country: bool, is_alias: bool, shared: bool) -> float:
+    """Get the obscurity factor of a word"""
+    if is_country:
+        return COUNTRY_OBSCURITY
+    if is_alias:
+        return ALIAS_OBSCURITY
+    return SHARED_CITY_OBSCURITY if shared else CITY_OBSCURITY
+
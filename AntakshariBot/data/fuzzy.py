@@ -0,0 +1,145 @@
+"""
+Symmetric-delete fuzzy index for "did you mean" suggestions
+
+For every word, its folded key and each single-character deletion of it are
+hashed (crc32) and stored as (hash << 32 | word ID) in one sorted array. A query
+generates the same variants for the typed key, so any word within one deletion
+per side (a substitution, insertion, deletion or adjacent swap) shares a variant
+and is found with a binary search. Candidates are then checked with a bounded
+edit distance, which also weeds out hash collisions.
+"""
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+MAX_EDIT_DISTANCE = 2
+
+# The index is sorted in buckets of the entries' top bits
+_SORT_BUCKETS = 1024
+_SORT_SHIFT = 64 - 10
+
+
+def delete_variants(key: str) -> Set[str]:
+    """Get the key and every single-character deletion of it"""
+    variants = {key}
+    for i in range(len(key)):
+        variants.add(key[:i] + key[i + 1:])
+    return variants
+
+
+def _variant_hash(variant: str) -> int:
+    return zlib.crc32(variant.encode("utf-8"))
+
+
+def edit_distance(a: str, b: str, limit: int = MAX_EDIT_DISTANCE) -> int:
+    """Optimal string alignment distance between a and b, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    # Typos usually leave most of the word intact: skip the shared prefix and suffix
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if not a or not b:
+        return len(a) + len(b) if len(a) + len(b) <= limit else limit + 1
+
+    before_previous: Optional[List[int]] = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        char_a = a[i - 1]
+        row_min = i
+        for j in range(1, len(b) + 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != b[j - 1]))
+            # Adjacent transposition
+            if before_previous is not None and j > 1 and char_a == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, before_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > limit:
+            return limit + 1
+        before_previous, previous = previous, current
+
+    return previous[-1] if previous[-1] <= limit else limit + 1
+
+
+class FuzzyIndex:
+    def __init__(self, entries: bytes = b""):
+        # Sorted (variant hash << 32 | word ID) values
+        self.entries = array("Q")
+        self.entries.frombytes(entries)
+
+    def candidates(self, key: str) -> Set[int]:
+        """Get the IDs of words sharing a delete variant with a folded key"""
+        entries = self.entries
+        found: Set[int] = set()
+        for variant in delete_variants(key):
+            variant_hash = _variant_hash(variant)
+            position = bisect_left(entries, variant_hash << 32)
+            while position < len(entries) and entries[position] >> 32 == variant_hash:
+                found.add(entries[position] & 0xFFFFFFFF)
+                position += 1
+        return found
+
+    def to_bytes(self) -> bytes:
+        return self.entries.tobytes()
+
+
+def build_fuzzy_index(keys: Sequence[str]) -> FuzzyIndex:
+    """Build the fuzzy index for folded keys listed in word ID order"""
+    # One preallocated array of 8-byte entries, sized for every key having all distinct deletions;
+    # a list of the entries as Python ints would be several times larger
+    entries = array("Q", [0]) * sum(len(key) + 1 for key in keys)
+    starts = [0] * (_SORT_BUCKETS + 1)
+    count = 0
+    for word_id, key in enumerate(keys):
+        for variant in delete_variants(key):
+            value = _variant_hash(variant) << 32 | word_id
+            entries[count] = value
+            count += 1
+            starts[(value >> _SORT_SHIFT) + 1] += 1
+    del entries[count:]
+    for bucket in range(_SORT_BUCKETS):
+        starts[bucket + 1] += starts[bucket]
+
+    # Move every entry into the bucket of its top bits in place (American flag sort),
+    # then sort each bucket of a thousand or so entries on its own
+    heads = starts[:-1]
+    for bucket in range(_SORT_BUCKETS):
+        end = starts[bucket + 1]
+        while heads[bucket] < end:
+            value = entries[heads[bucket]]
+            target = value >> _SORT_SHIFT
+            while target != bucket:
+                position = heads[target]
+                heads[target] += 1
+                value, entries[position] = entries[position], value
+                target = value >> _SORT_SHIFT
+            entries[heads[bucket]] = value
+            heads[bucket] += 1
+
+    for bucket in range(_SORT_BUCKETS):
+        start, end = starts[bucket], starts[bucket + 1]
+        if end - start > 1:
+            entries[start:end] = array("Q", sorted(entries[start:end]))
+
+    index = FuzzyIndex()
+    index.entries = entries
+    return index
+
+
+def rank_candidates(key: str, candidates: Iterable[Tuple[int, str]], limit: int) -> List[int]:
+    """Order (word ID, candidate key) pairs by edit distance to key and keep the closest ones"""
+    scored = []
+    for word_id, candidate_key in candidates:
+        distance = edit_distance(key, candidate_key)
+        if distance <= MAX_EDIT_DISTANCE:
+            scored.append((distance, abs(len(candidate_key) - len(key)), candidate_key, word_id))
+    scored.sort()
+    return [word_id for _, _, _, word_id in scored[:limit]]
@@ -0,0 +1,38 @@
+"""
+Unicode folding for word lookups
+
+fold_word turns both dataset names and player input into the same lookup key:
+"Herāt", "HERAT" and "herat" all fold to "herat", "Dasht-e Archī" to "dasht e archi".
+"""
+import re
+import unicodedata
+
+# Combining marks left over after NFKD decomposition (accents, cedillas, macrons...)
+_COMBINING_MARKS = re.compile("[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]")
+
+# Apostrophe-like characters are dropped so "Za'atara" matches "zaatara"
+_APOSTROPHES = re.compile("['`\u2018\u2019\u02bb\u02bc\u02be\u02bf\u00b4]")
+
+# Everything else that is not a letter or digit separates words
+_SEPARATORS = re.compile(r"[\W_]+")
+
+# Letters that NFKD does not decompose into a base letter plus a mark
+_LETTER_FOLDS = str.maketrans({
+    "ø": "o",
+    "ł": "l",
+    "đ": "d",
+    "ð": "d",
+    "ħ": "h",
+    "ı": "i",
+    "þ": "th",
+    "æ": "ae",
+    "œ": "oe"
+})
+
+
+def fold_word(text: str) -> str:
+    """Get the accent-folded, lowercase lookup key for a word"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = _COMBINING_MARKS.sub("", text).translate(_LETTER_FOLDS)
+    text = _APOSTROPHES.sub("", text)
+    return _SEPARATORS.sub(" ", text).strip()
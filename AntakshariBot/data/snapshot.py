@@ -0,0 +1,83 @@
+"""
+Compiled on-disk snapshot of the word index
+
+The snapshot is a small header followed by a marshal-encoded payload:
+
+    magic (4 bytes) | format version (uint16, little endian) | sha256 of source files (32 bytes) | payload
+
+A snapshot is only used when both the format version and the checksum of the
+source files match, otherwise the caller rebuilds from JSON and writes a new one.
+"""
+import hashlib
+import logging
+import marshal
+import os
+import struct
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"AKWI"
+SNAPSHOT_VERSION = 10
+
+_HEADER = struct.Struct("<4sH32s")
+
+
+def file_checksum(*paths: str) -> bytes:
+    """Get the sha256 digest of one or more files; missing files count as empty"""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode("utf-8") + b"\0")
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.digest()
+
+
+def load_snapshot(path: str, checksum: bytes) -> Optional[dict]:
+    """Load a snapshot payload, or None if it is missing, stale or unreadable"""
+    try:
+        if not os.path.exists(path):
+            return None
+
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if len(data) < _HEADER.size:
+            return None
+
+        magic, version, source_checksum = _HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            logger.info(f"Ignoring snapshot {path}: format version {version}, expected {SNAPSHOT_VERSION}")
+            return None
+        if source_checksum != checksum:
+            logger.info(f"Ignoring snapshot {path}: source files have changed")
+            return None
+
+        payload = marshal.loads(memoryview(data)[_HEADER.size:])
+        return payload if isinstance(payload, dict) else None
+
+    except Exception as e:
+        logger.warning(f"Could not read snapshot {path}: {e}")
+        return None
+
+
+def save_snapshot(path: str, checksum: bytes, payload: dict) -> bool:
+    """Write a snapshot payload atomically"""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, checksum))
+            marshal.dump(payload, f)
+        os.replace(tmp_path, path)
+        return True
+
+    except Exception as e:
+        logger.warning(f"Could not write snapshot {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
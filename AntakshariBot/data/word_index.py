@@ -0,0 +1,384 @@
+"""
+Compact word table shared by validation, stats and listings
+
+Every word is stored once, sorted by its folded key (see normalize.fold_word).
+A word's position in that order is its integer word ID, and category and rarity
+are bit flags in a bytearray indexed by word ID. Because the table is sorted,
+all words starting with a letter form one contiguous ID range.
+
+Alternative names (Bombay / Mumbai, USA / United States...) are grouped into
+equivalence classes. Every word maps to a class ID, the smallest word ID in its
+class, so "already used" is one lookup however many names a place has.
+
+Each word also has a difficulty score from 0 to difficulty.MAX_DIFFICULTY,
+one byte per word ID, which sets the points it is worth.
+
+Themes ("countries only", "cities of India"...) are sorted word ID arrays built
+with the index and shared by every game playing them.
+"""
+from array import array
+from bisect import bisect_left
+from typing import Container, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from AntakshariBot.data.difficulty import RARE_DIFFICULTY, score_words, word_obscurity
+from AntakshariBot.data.fuzzy import MAX_EDIT_DISTANCE, FuzzyIndex, build_fuzzy_index, rank_candidates
+from AntakshariBot.data.normalize import fold_word
+
+# Word flags
+COUNTRY = 1
+CITY = 2
+RARE = 4
+ALIAS = 8  # alternative name that is not in the dataset itself
+
+# country_of value for words that are not a city of any country
+NO_COUNTRY = 0xFFFF
+
+DEFAULT_THEME = "all"
+
+# What players can type to pick the built-in themes
+_THEME_NAMES = {
+    "": DEFAULT_THEME,
+    "all": DEFAULT_THEME,
+    "countries": "countries",
+    "countries only": "countries",
+    "cities": "cities",
+    "cities only": "cities"
+}
+
+# Accepted in front of a country name, e.g. "cities of india"
+_COUNTRY_THEME_PREFIXES = ("cities of ", "cities in ", "of ", "in ")
+
+
+def _unpack(data: bytes, typecode: str = "I") -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    return values
+
+
+class Theme:
+    """A playable subset of the word index"""
+
+    def __init__(self, index: "WordIndex", key: str, title: str, ids: Optional[array] = None,
+                 flag: int = 0, country: Optional[int] = None):
+        self.index = index
+        self.key = key          # stored with the game, e.g. "cities" or "in:india"
+        self.title = title      # shown to players, e.g. "Cities of India"
+        self.ids = ids          # sorted word IDs in the theme, None for the whole index
+        self.flag = flag        # word flag every word in the theme has
+        self.country = country  # country number for "cities of" themes
+
+    def __len__(self) -> int:
+        return len(self.index) if self.ids is None else len(self.ids)
+
+    def contains(self, word_id: int) -> bool:
+        """Check if a word belongs to the theme"""
+        index = self.index
+        if self.country is not None:
+            return index.country_of[word_id] == self.country or self.country in index.extra_countries.get(word_id, ())
+        return not self.flag or bool(index.flags[word_id] & self.flag)
+
+    def id_range(self, start: int, end: int) -> Tuple[int, int]:
+        """Get the positions in ids of the theme's words with word IDs in [start, end)"""
+        if self.ids is None:
+            return start, end
+        return bisect_left(self.ids, start), bisect_left(self.ids, end)
+
+    def count_starting_with(self, letter: str) -> int:
+        """Get the number of the theme's words starting with a letter"""
+        low, high = self.id_range(*self.index.letter_range(letter))
+        return high - low
+
+
+class WordIndex:
+    def __init__(self, payload: dict):
+        self.keys: List[str] = payload["keys"]          # word ID -> folded key, sorted
+        self.names: List[str] = payload["names"]        # word ID -> canonical (lowercase) name
+        self.flags = bytearray(payload["flags"])        # word ID -> COUNTRY | CITY | RARE | ALIAS bits
+        self.difficulty = _unpack(payload["difficulty"], "B")  # word ID -> difficulty score
+        self.letter_ranges: Dict[str, Tuple[int, int]] = payload["letter_ranges"]            # first letter -> (first ID, end ID)
+        self.fuzzy = FuzzyIndex(payload["fuzzy"])       # typo-tolerant lookups, see fuzzy.py
+        self.class_of = _unpack(payload["class_of"])    # word ID -> alias class ID
+        self.class_members: Dict[int, Tuple[int, ...]] = payload["class_members"]  # class ID -> word IDs, for classes with aliases
+        self.country_ids = _unpack(payload["country_ids"])     # country number -> word ID of the country
+        self.country_of = _unpack(payload["country_of"], "H")  # word ID -> country number of a city, or NO_COUNTRY
+        self.extra_countries: Dict[int, Tuple[int, ...]] = payload["extra_countries"]  # word ID -> further country numbers
+        # Folded key -> word ID, so validating a message is a single hash probe; rebuilt at load, not stored
+        self.ids: Dict[str, int] = dict(zip(self.keys, range(len(self.keys))))
+
+        self.country_count = sum(1 for flag in self.flags if flag & (COUNTRY | ALIAS) == COUNTRY)
+        self.city_count = sum(1 for flag in self.flags if flag & (CITY | ALIAS) == CITY)
+        self.rare_count = sum(1 for flag in self.flags if flag & RARE)
+
+        self.themes: Dict[str, Theme] = {
+            DEFAULT_THEME: Theme(self, DEFAULT_THEME, "Countries & Cities"),
+            "countries": Theme(self, "countries", "Countries Only", _unpack(payload["countries"]), flag=COUNTRY),
+            "cities": Theme(self, "cities", "Cities Only", _unpack(payload["cities"]), flag=CITY)
+        }
+        for number, city_ids in enumerate(payload["country_cities"]):
+            word_id = self.country_ids[number]
+            key = f"in:{self.keys[word_id]}"
+            self.themes[key] = Theme(self, key, f"Cities of {self.names[word_id].title()}",
+                                     _unpack(city_ids), flag=CITY, country=number)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, key: str) -> Optional[int]:
+        """Get the word ID for a folded key, or None if it is not a valid word"""
+        return self.ids.get(key)
+
+    def has_flag(self, word_id: int, flag: int) -> bool:
+        """Check a word's category or rarity flag"""
+        return bool(self.flags[word_id] & flag)
+
+    def letter_range(self, letter: str) -> Tuple[int, int]:
+        """Get the (first ID, end ID) range of words starting with a letter"""
+        return self.letter_ranges.get(letter, (0, 0))
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """Get the (first ID, end ID) range of words whose folded key starts with a folded prefix"""
+        if not prefix:
+            return 0, len(self.keys)
+        return bisect_left(self.keys, prefix), bisect_left(self.keys, prefix + "\U0010ffff")
+
+    def members(self, class_id: int) -> Tuple[int, ...]:
+        """Get the word IDs of every name in an alias class"""
+        return self.class_members.get(class_id, (class_id,))
+
+    def get_theme(self, key: Optional[str]) -> Theme:
+        """Get a theme by its key, falling back to the whole index"""
+        return self.themes.get(key) or self.themes[DEFAULT_THEME]
+
+    def find_theme(self, text: str) -> Optional[Theme]:
+        """Find the theme a player asked for, e.g. "countries only", "cities of india" or "japan" """
+        text = fold_word(text)
+        if text in _THEME_NAMES:
+            return self.themes[_THEME_NAMES[text]]
+
+        for prefix in _COUNTRY_THEME_PREFIXES:
+            if text.startswith(prefix):
+                text = text[len(prefix):]
+                break
+
+        # Any name of the country works, e.g. "usa" for "United States"
+        word_id = self.lookup(text)
+        if word_id is None:
+            return None
+        for member in self.members(self.class_of[word_id]):
+            theme = self.themes.get(f"in:{self.keys[member]}")
+            if theme is not None:
+                return theme
+        return None
+
+    def suggest(self, key: str, letter: str = "", exclude: Container[int] = (), limit: int = 3,
+                theme: Optional[Theme] = None) -> List[str]:
+        """Get the valid names closest to a folded key, optionally starting with a letter, within a theme
+        and skipping excluded class IDs"""
+        start, end = self.letter_range(letter) if letter else (0, len(self.keys))
+        keys, names = self.keys, self.names
+        candidates = (
+            (word_id, keys[word_id]) for word_id in self.fuzzy.candidates(key)
+            if start <= word_id < end
+            and abs(len(keys[word_id]) - len(key)) <= MAX_EDIT_DISTANCE
+            and self.class_of[word_id] not in exclude
+            and (theme is None or theme.contains(word_id))
+        )
+        return [names[word_id] for word_id in rank_candidates(key, candidates, limit)]
+
+    def to_payload(self) -> dict:
+        """Get the marshal-friendly form stored in the snapshot"""
+        return {
+            "keys": self.keys,
+            "names": self.names,
+            "flags": bytes(self.flags),
+            "difficulty": self.difficulty.tobytes(),
+            "letter_ranges": self.letter_ranges,
+            "fuzzy": self.fuzzy.to_bytes(),
+            "class_of": self.class_of.tobytes(),
+            "class_members": self.class_members,
+            "country_ids": self.country_ids.tobytes(),
+            "country_of": self.country_of.tobytes(),
+            "extra_countries": self.extra_countries,
+            "countries": self.themes["countries"].ids.tobytes(),
+            "cities": self.themes["cities"].ids.tobytes(),
+            "country_cities": [self.themes[f"in:{self.keys[word_id]}"].ids.tobytes() for word_id in self.country_ids]
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "WordIndex":
+        """Rebuild an index from its snapshot form"""
+        return cls(payload)
+
+
+def _is_playable(key: str) -> bool:
+    """Check that a folded key is made of letters and spaces only"""
+    return key.replace(" ", "").isalpha()
+
+
+def build_index(countries: Iterable[str], cities: Iterable[str], rare_words: Iterable[str],
+                alias_groups: Iterable[Sequence[str]] = (),
+                country_cities: Optional[Dict[str, Iterable[str]]] = None) -> WordIndex:
+    """Build a word index from lowercase country, city and rare names, groups of alternative names
+    and the city names of each country"""
+    # Fold every name once; names that fold to the same key are one word
+    entries: Dict[str, list] = {}
+    for names, flag in ((countries, COUNTRY), (cities, CITY), (rare_words, RARE)):
+        for name in names:
+            key = fold_word(name)
+            # Players may only type letters, so names with digits ("12th Street") are not playable
+            if not _is_playable(key):
+                continue
+            entry = entries.get(key)
+            if entry is None:
+                entries[key] = [name, flag]
+            else:
+                entry[0] = min(entry[0], name)
+                entry[1] |= flag
+
+    # Alternative names missing from the dataset join it with the categories of their known names;
+    # groups with no known name at all are skipped
+    key_groups: List[List[str]] = []
+    for group in alias_groups:
+        group_keys = {fold_word(name): name.lower() for name in group}
+        group_keys = {key: name for key, name in group_keys.items() if _is_playable(key)}
+        known = [key for key in group_keys if key in entries]
+        if not known:
+            continue
+        category = 0
+        for key in known:
+            category |= entries[key][1] & (COUNTRY | CITY)
+        for key, name in group_keys.items():
+            if key not in entries:
+                entries[key] = [name, category | ALIAS]
+        key_groups.append(list(group_keys))
+
+    keys = sorted(entries)
+    names: List[str] = []
+    flags = bytearray(len(keys))
+    letter_ranges: Dict[str, Tuple[int, int]] = {}
+
+    for word_id, key in enumerate(keys):
+        name, flag = entries[key]
+        # Share the key object when the canonical name is already folded
+        names.append(key if name == key else name)
+        flags[word_id] = flag
+
+        first = key[0]
+        start, _ = letter_ranges.get(first, (word_id, word_id))
+        letter_ranges[first] = (start, word_id + 1)
+    # The builder's tables are freed as soon as they are done with, keeping the load's peak memory down
+    del entries
+
+    # Union-find over the alias groups; groups sharing a name merge into one class
+    def word_id_of(key: str) -> Optional[int]:
+        word_id = bisect_left(keys, key)
+        return word_id if word_id < len(keys) and keys[word_id] == key else None
+
+    parent: Dict[int, int] = {}
+
+    def find(word_id: int) -> int:
+        root = word_id
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while word_id != root:
+            parent[word_id], word_id = root, parent[word_id]
+        return root
+
+    group_ids = [[word_id_of(key) for key in group] for group in key_groups]
+    del key_groups
+    for word_ids in group_ids:
+        for word_id in word_ids:
+            root, other = find(word_ids[0]), find(word_id)
+            if root != other:
+                parent[max(root, other)] = min(root, other)
+
+    class_of = array("I", range(len(keys)))
+    members: Dict[int, List[int]] = {}
+    for word_id in sorted({word_id for word_ids in group_ids for word_id in word_ids}):
+        class_of[word_id] = find(word_id)
+        members.setdefault(class_of[word_id], []).append(word_id)
+    class_members = {class_id: tuple(word_ids) for class_id, word_ids in members.items() if len(word_ids) > 1}
+    del group_ids, members, parent
+
+    # Number the countries and record which of them each city belongs to; most cities are in one,
+    # written straight to country_of, and only those in several keep a set
+    country_ids = array("I")
+    country_numbers: Dict[int, int] = {}
+    country_of = array("H", [NO_COUNTRY]) * len(keys)
+    several: Dict[int, Set[int]] = {}
+    for country_name, city_names in (country_cities or {}).items():
+        country_id = word_id_of(fold_word(country_name))
+        if country_id is None:
+            continue
+        number = country_numbers.get(country_id)
+        if number is None:
+            number = country_numbers[country_id] = len(country_ids)
+            country_ids.append(country_id)
+        for city_name in city_names:
+            city_id = word_id_of(fold_word(city_name))
+            if city_id is None or not flags[city_id] & CITY:
+                continue
+            first = country_of[city_id]
+            if first == NO_COUNTRY:
+                country_of[city_id] = number
+            elif first != number:
+                several.setdefault(city_id, {first}).add(number)
+
+    # Every name of a city belongs to the countries of all its names
+    for word_ids in class_members.values():
+        shared: Set[int] = set()
+        for word_id in word_ids:
+            if word_id in several:
+                shared |= several[word_id]
+            elif country_of[word_id] != NO_COUNTRY:
+                shared.add(country_of[word_id])
+        if not shared:
+            continue
+        for word_id in word_ids:
+            if flags[word_id] & CITY:
+                country_of[word_id] = min(shared)
+                if len(shared) > 1:
+                    several[word_id] = shared
+
+    extra_countries: Dict[int, Tuple[int, ...]] = {}
+    for word_id, numbers in sorted(several.items()):
+        numbers = sorted(numbers)
+        country_of[word_id] = numbers[0]
+        extra_countries[word_id] = tuple(numbers[1:])
+    del several
+    country_city_ids: List[array] = [array("I") for _ in country_ids]
+    for word_id, number in enumerate(country_of):
+        if number != NO_COUNTRY:
+            country_city_ids[number].append(word_id)
+            for number in extra_countries.get(word_id, ()):
+                country_city_ids[number].append(word_id)
+
+    # Score every word in one pass; hard words are also flagged rare
+    difficulty = score_words(keys, [
+        word_obscurity(bool(flags[word_id] & COUNTRY), class_of[word_id] in class_members,
+                       word_id in extra_countries)
+        for word_id in range(len(keys))
+    ], letter_ranges)
+    for word_id, score in enumerate(difficulty):
+        if score >= RARE_DIFFICULTY:
+            flags[word_id] |= RARE
+
+    # The fuzzy index is handed over as it is, rather than copied through bytes like the snapshot does
+    fuzzy = build_fuzzy_index(keys)
+    index = WordIndex({
+        "keys": keys,
+        "names": names,
+        "flags": bytes(flags),
+        "difficulty": difficulty.tobytes(),
+        "letter_ranges": letter_ranges,
+        "fuzzy": b"",
+        "class_of": class_of.tobytes(),
+        "class_members": class_members,
+        "country_ids": country_ids.tobytes(),
+        "country_of": country_of.tobytes(),
+        "extra_countries": extra_countries,
+        "countries": array("I", (word_id for word_id in range(len(keys)) if flags[word_id] & COUNTRY)).tobytes(),
+        "cities": array("I", (word_id for word_id in range(len(keys)) if flags[word_id] & CITY)).tobytes(),
+        "country_cities": [city_ids.tobytes() for city_ids in country_city_ids]
+    })
+    index.fuzzy = fuzzy
+    return index
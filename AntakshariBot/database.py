@@ -1,14 +1,137 @@
+import asyncio
 import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorClient
-from datetime import datetime
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from datetime import datetime, timedelta
+from AntakshariBot.game_state import GameState
+from AntakshariBot.journal import GameJournal
+from AntakshariBot.leaderboard import Leaderboard
 import config
 
 logger = logging.getLogger(__name__)
 
+# Player statistics counters, all zero for a new player
+STAT_FIELDS = ("games_played", "games_won", "total_points", "best_score", "best_streak", "correct_words", "wrong_words")
+
+# Finished games listed in a chat's summary, most recent first
+RECENT_GAMES = 5
+
+# IDs of the last flushes applied to a statistics document, so a retried write applies only once
+FLUSHES_KEPT = 4
+DUPLICATE_KEY = 11000
+
+def game_result(game: dict) -> dict:
+    """Summarize a finished game as its winner, their score and when it ended"""
+    winner = max(game.get("players", []), key=lambda p: p.get("score", 0), default={"name": "Unknown", "score": 0})
+    return {"winner_name": winner["name"], "winner_score": winner["score"], "end_time": game.get("end_time")}
+
+# Score buckets: all-time per chat, and per day and week both per chat and across every chat
+GLOBAL_CHAT = 0
+PERIODS = ("all", "week", "day")
+PERIOD_LENGTHS = {"week": timedelta(weeks=1), "day": timedelta(days=1)}
+
+def bucket_start(period: str, now: datetime) -> Optional[datetime]:
+    """Get the start of the day or week (from Monday, UTC) that now falls in; all-time buckets have none"""
+    if period == "all":
+        return None
+    day = datetime(now.year, now.month, now.day)
+    return day - timedelta(days=day.weekday()) if period == "week" else day
+
+def merge_update(update: dict, newer: dict):
+    """Fold a newer queued update into an older one for the same document"""
+    for field, value in newer.get("$inc", {}).items():
+        update["$inc"][field] = update["$inc"].get(field, 0) + value
+    for field, value in newer.get("$max", {}).items():
+        update["$max"][field] = max(update["$max"].get(field, 0), value)
+    update["$set"].update(newer["$set"])
+
+def requeue(queue: Dict, updates: Dict):
+    """Queue updates that did not apply again, under any queued for the same documents since"""
+    for key, update in updates.items():
+        newer = queue.get(key)
+        if newer is not None:
+            merge_update(update, newer)
+        queue[key] = update
+
+def flush_update(filter: dict, update: dict, flush_id: ObjectId) -> UpdateOne:
+    """Make an upsert that applies once per flush ID: retried after it applied, its filter misses the document
+    and the upsert fails on the unique index instead of applying again"""
+    return UpdateOne(
+        {**filter, "flushes": {"$ne": flush_id}},
+        {**update, "$push": {"flushes": {"$each": [flush_id], "$slice": -FLUSHES_KEPT}}},
+        upsert=True
+    )
+
+def write_outcome(error: Exception, count: int) -> Tuple[List[int], List[int]]:
+    """Get the positions of the flush_update operations of a failed bulk write that did not apply, and of those
+    that may or may not have; the rest applied, now or in an earlier try"""
+    if not isinstance(error, BulkWriteError):
+        return [], list(range(count))
+    write_errors = error.details.get("writeErrors", [])
+    failed = [write_error["index"] for write_error in write_errors if write_error["code"] != DUPLICATE_KEY]
+    if not error.details.get("writeConcernErrors"):
+        return failed, []
+    # Writes without an error were applied, but may not be replicated
+    reported = {write_error["index"] for write_error in write_errors}
+    return failed, [i for i in range(count) if i not in reported]
+
+def game_changes(written: Optional[dict], doc: dict) -> dict:
+    """Get the $set fields that turn the last written games document into the current one, with used words
+    only added since under "used_words+" for a $push"""
+    if written is None:
+        return dict(doc)
+    
+    changes = {
+        field: value for field, value in doc.items()
+        if field not in ("players", "used_words") and written.get(field) != value
+    }
+    
+    # Used words only grow during a game: send the new ones, as "used_words+", rather than the whole list
+    used_before, used_words = written.get("used_words", []), doc["used_words"]
+    if used_words != used_before:
+        known = set(used_before)
+        added = [key for key in used_words if key not in known]
+        if len(used_words) == len(used_before) + len(added):
+            changes["used_words+"] = added
+        else:
+            changes["used_words"] = used_words
+    
+    # Same players in the same seats: set only the scores and streaks that changed
+    players = doc["players"]
+    if [player["id"] for player in players] != [player["id"] for player in written["players"]]:
+        changes["players"] = players
+    else:
+        for i, (before, player) in enumerate(zip(written["players"], players)):
+            if before != player:
+                for field, value in player.items():
+                    if before.get(field) != value:
+                        changes[f"players.{i}.{field}"] = value
+    return changes
+
 class Database:
     def __init__(self):
         self.client = None
         self.db = None
+        # Write-behind game state: games changed since the last flush, and the document last written for each
+        self.dirty_games: Dict[int, GameState] = {}
+        self.written_games: Dict[int, dict] = {}
+        self.games_lock = asyncio.Lock()
+        self.flush_task: Optional[asyncio.Task] = None
+        # Player statistics changes since the last flush: user ID -> $inc, $max and $set fields
+        self.stats_queue: Dict[int, dict] = {}
+        # Flush ID and changes of a statistics write that may not have applied, retried before anything newer
+        self.stats_retry: Optional[Tuple[ObjectId, Dict[int, dict]]] = None
+        # Every player's totals and the top players, kept current as changes are queued
+        self.leaderboard = Leaderboard()
+        # Score bucket changes since the last flush: (chat ID, period, bucket start, user ID) -> $inc and $set fields
+        self.bucket_queue: Dict[tuple, dict] = {}
+        # Like stats_retry, for score buckets
+        self.bucket_retry: Optional[Tuple[ObjectId, Dict[tuple, dict]]] = None
+        # Optional local journal, written ahead of every flush's bulk write
+        self.journal = GameJournal(config.JOURNAL_PATH, config.JOURNAL_COMPACT_LINES) if config.JOURNAL_PATH else None
     
     async def connect(self):
         """Connect to MongoDB"""
@@ -23,6 +146,12 @@ class Database:
             # Create indexes
             await self.create_indexes()
             
+            # Rank every player once; later changes update the leaderboard in memory
+            await self.load_leaderboard()
+            
+            # Write queued game and statistics changes every GAME_FLUSH_INTERVAL seconds
+            self.flush_task = asyncio.create_task(self.run_flusher())
+            
         except Exception as e:
             logger.error(f"Database connection failed: {e}")
             raise
@@ -39,6 +168,16 @@ class Database:
             await self.db.player_stats.create_index("total_points")
             await self.db.player_stats.create_index("games_won")
             
+            # Score bucket indexes: one upserted document per player and bucket, read ranked by points
+            await self.db.score_buckets.create_index(
+                [("chat_id", 1), ("period", 1), ("bucket", 1), ("user_id", 1)], unique=True
+            )
+            await self.db.score_buckets.create_index([("chat_id", 1), ("period", 1), ("bucket", 1), ("points", -1)])
+            await self.db.score_buckets.create_index("expires_at", expireAfterSeconds=0)
+            
+            # Chat summary indexes
+            await self.db.chat_summaries.create_index("chat_id", unique=True)
+            
             # Game history indexes
             await self.db.game_history.create_index("chat_id")
             await self.db.game_history.create_index("date")
@@ -48,160 +187,353 @@ class Database:
         except Exception as e:
             logger.error(f"Error creating indexes: {e}")
     
-    async def create_game(self, game_data: dict):
-        """Create a new game record"""
+    def create_game(self, game_data: GameState):
+        """Queue a new game record; the next flush writes the whole document, replacing any left in the chat"""
+        self.written_games.pop(game_data.chat_id, None)
+        self.dirty_games[game_data.chat_id] = game_data
+    
+    def update_game(self, game_data: GameState):
+        """Queue a game's changes for the next flush"""
+        self.dirty_games[game_data.chat_id] = game_data
+    
+    def track_game(self, game_data: GameState):
+        """Record a game loaded at startup as written, so flushes send only its later changes"""
+        if self.journal is not None:
+            # After a crash the journal can be ahead of MongoDB: write restored games whole once
+            self.create_game(game_data)
+        else:
+            self.written_games[game_data.chat_id] = game_data.to_doc()
+    
+    async def load_games(self) -> List[dict]:
+        """Get every game that was joining or active when the bot stopped, from the journal if there is one,
+        else in one query"""
         try:
-            # First check if a game already exists for this chat
-            existing_game = await self.db.games.find_one({"chat_id": game_data["chat_id"]})
-            
-            if existing_game:
-                # Update the existing game instead of creating a new one
-                await self.update_game(game_data["chat_id"], game_data)
-                logger.info(f"Updated existing game for chat {game_data['chat_id']}")
-                return
-            
-            # Create new game record if none exists
-            game_record = {
-                "chat_id": game_data["chat_id"],
-                "status": game_data["status"],
-                "players": game_data["players"],
-                "creator": game_data["creator"],
-                "start_time": datetime.utcnow(),
-                "current_player": game_data["current_player"],
-                "last_word": game_data["last_word"],
-                "next_letter": game_data["next_letter"],
-                "round": game_data["round"],
-                "used_words": list(game_data["used_words"])
-            }
-            
-            await self.db.games.insert_one(game_record)
-            logger.info(f"Game created for chat {game_data['chat_id']}")
+            if self.journal is not None and self.journal.exists():
+                # Replay may compact the file, which a flush must not append to meanwhile
+                async with self.games_lock:
+                    docs = await asyncio.to_thread(self.journal.load)
+                return [doc for doc in docs if doc["status"] in ("joining", "active")]
             
+            cursor = self.db.games.find({"status": {"$in": ["joining", "active"]}})
+            return await cursor.to_list(length=None)
         except Exception as e:
-            logger.error(f"Error creating game: {e}")
+            logger.error(f"Error loading games: {e}")
+            return []
     
-    async def update_game(self, chat_id: int, game_data: dict):
-        """Update existing game record"""
-        try:
-            update_data = {
-                "status": game_data["status"],
-                "players": game_data["players"],
-                "current_player": game_data["current_player"],
-                "last_word": game_data["last_word"],
-                "next_letter": game_data["next_letter"],
-                "round": game_data["round"],
-                "used_words": list(game_data["used_words"]),
-                "updated_time": datetime.utcnow()
-            }
+    async def run_flusher(self):
+        """Flush queued game and statistics changes forever, bounding what a crash can lose to one interval"""
+        while True:
+            await asyncio.sleep(config.GAME_FLUSH_INTERVAL)
+            for flush in (self.flush_games, self.flush_player_stats, self.flush_score_buckets):
+                try:
+                    await flush()
+                except Exception as e:
+                    logger.error(f"Error in {flush.__name__}: {e}")
+    
+    async def flush_games(self):
+        """Write every queued game change"""
+        async with self.games_lock:
+            await self.write_games(list(self.dirty_games))
+    
+    async def write_games(self, chat_ids: Iterable[int]):
+        """Write the changes of queued games since their last write, in one unordered bulk write"""
+        operations = []
+        games = {}
+        written = {}
+        now = datetime.utcnow()
+        
+        for chat_id in chat_ids:
+            game = self.dirty_games.pop(chat_id, None)
+            if game is None:
+                continue
             
-            await self.db.games.update_one(
-                {"chat_id": chat_id},
-                {"$set": update_data}
-            )
+            doc = game.to_doc()
+            changes = game_changes(self.written_games.get(chat_id), doc)
+            if not changes:
+                continue
+            if self.journal is not None:
+                if chat_id in self.written_games:
+                    self.journal.write_changes(chat_id, changes)
+                else:
+                    self.journal.write_game(doc)
+            changes["updated_time"] = now
+            
+            if chat_id in self.written_games:
+                update = {"$set": changes}
+                if "used_words+" in changes:
+                    update["$push"] = {"used_words": {"$each": changes.pop("used_words+")}}
+                operations.append(UpdateOne({"chat_id": chat_id}, update))
+            else:
+                # First write of a game
+                operations.append(UpdateOne(
+                    {"chat_id": chat_id},
+                    {"$set": changes, "$setOnInsert": {"start_time": now}},
+                    upsert=True
+                ))
+            games[chat_id] = game
+            written[chat_id] = doc
+        
+        if not operations:
+            return
+        
+        try:
+            if self.journal is not None:
+                # The file write, and any compaction, runs off the event loop; entries are only recorded
+                # under games_lock, which the caller holds
+                await asyncio.to_thread(self.journal.flush)
+            await self.db.games.bulk_write(operations, ordered=False)
+            self.written_games.update(written)
             
         except Exception as e:
-            logger.error(f"Error updating game: {e}")
+            logger.error(f"Error writing games: {e}")
+            # Queue the games again and write them whole, as some of the updates may not have applied
+            for chat_id, game in games.items():
+                self.written_games.pop(chat_id, None)
+                self.dirty_games.setdefault(chat_id, game)
+    
+    async def close(self):
+        """Stop the flusher and write any queued changes"""
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            try:
+                await self.flush_task
+            except asyncio.CancelledError:
+                pass
+            self.flush_task = None
+        await self.flush_games()
+        await self.flush_player_stats()
+        await self.flush_score_buckets()
+        if self.journal is not None:
+            async with self.games_lock:
+                await asyncio.to_thread(self.journal.close)
     
     async def end_game(self, chat_id: int):
         """End a game and move to history"""
         try:
-            # Get game data
-            game = await self.db.games.find_one({"chat_id": chat_id})
-            
-            if game:
-                # Move to history
-                game["end_time"] = datetime.utcnow()
-                game["status"] = "completed"
-                await self.db.game_history.insert_one(game)
+            async with self.games_lock:
+                # Write the game's last changes first; nothing queued for it may land after it moves
+                await self.write_games([chat_id])
+                self.dirty_games.pop(chat_id, None)
+                self.written_games.pop(chat_id, None)
+                if self.journal is not None:
+                    self.journal.write_end(chat_id)
+                    await asyncio.to_thread(self.journal.flush)
                 
-                # Remove from active games
-                await self.db.games.delete_one({"chat_id": chat_id})
+                # Get game data
+                game = await self.db.games.find_one({"chat_id": chat_id})
                 
-                logger.info(f"Game ended for chat {chat_id}")
+                if game:
+                    # Move to history
+                    game["end_time"] = datetime.utcnow()
+                    game["status"] = "completed"
+                    await self.db.game_history.insert_one(game)
+                    
+                    # Remove from active games
+                    await self.db.games.delete_one({"chat_id": chat_id})
+                    
+                    # Count the game and list its result in the chat's summary, in one atomic update
+                    result = await self.db.chat_summaries.update_one(
+                        {"chat_id": chat_id},
+                        {
+                            "$inc": {"total_games": 1},
+                            "$push": {"recent_games": {"$each": [game_result(game)], "$position": 0, "$slice": RECENT_GAMES}}
+                        },
+                        upsert=True
+                    )
+                    if result.upserted_id is not None:
+                        # The chat's first summary: count the games it finished before summaries too
+                        await self.build_chat_summary(chat_id)
+                    
+                    logger.info(f"Game ended for chat {chat_id}")
             
         except Exception as e:
             logger.error(f"Error ending game: {e}")
     
-    async def update_player_stats(self, user_id: int, user_name: str, action: str, points: int = 0, won: bool = False):
-        """Update player statistics"""
+    def update_player_stats(self, user_id: int, user_name: str, action: str, points: int = 0, won: bool = False):
+        """Queue a change to a player's statistics for the next stats flush"""
+        update = self.stats_queue.get(user_id)
+        if update is None:
+            update = self.stats_queue[user_id] = {"$inc": {}, "$max": {}, "$set": {}}
+        inc = update["$inc"]
+        
+        # Update based on action
+        if action == "correct_word":
+            inc["correct_words"] = inc.get("correct_words", 0) + 1
+            inc["total_points"] = inc.get("total_points", 0) + points
+            update["$max"]["best_score"] = max(update["$max"].get("best_score", 0), points)
+            self.leaderboard.update(user_id, user_name, points=points)
+        
+        elif action == "wrong_word":
+            inc["wrong_words"] = inc.get("wrong_words", 0) + 1
+            self.leaderboard.update(user_id, user_name)
+        
+        elif action == "game_finished":
+            inc["games_played"] = inc.get("games_played", 0) + 1
+            if won:
+                inc["games_won"] = inc.get("games_won", 0) + 1
+            update["$max"]["best_score"] = max(update["$max"].get("best_score", 0), points)
+            self.leaderboard.update(user_id, user_name, won=int(won), played=1)
+        
+        update["$set"]["user_name"] = user_name  # Update name in case it changed
+        update["$set"]["last_played"] = datetime.utcnow()
+    
+    async def flush_player_stats(self):
+        """Write every queued statistics change in one unordered bulk write, after retrying any earlier write
+        that may not have applied"""
+        if self.stats_retry is not None:
+            flush_id, batch = self.stats_retry
+            self.stats_retry = None
+            if not await self.write_player_stats(flush_id, batch):
+                # Still unknown: newer changes stay queued, so only one batch waits to be retried
+                return
+        
+        queue, self.stats_queue = self.stats_queue, {}
+        if queue:
+            await self.write_player_stats(ObjectId(), queue)
+    
+    async def write_player_stats(self, flush_id: ObjectId, batch: Dict[int, dict]) -> bool:
+        """Write a batch of statistics changes under one flush ID; False if some are kept to retry"""
+        failed, unknown = await self.write_batch(self.db.player_stats, flush_id, batch, self.stats_operation)
+        requeue(self.stats_queue, failed)
+        if unknown:
+            self.stats_retry = (flush_id, unknown)
+        return not unknown
+    
+    @staticmethod
+    def stats_operation(user_id: int, update: dict, flush_id: ObjectId) -> UpdateOne:
+        # Counters this update does not touch start at zero for new players
+        new_player = {field: 0 for field in STAT_FIELDS if field not in update["$inc"] and field not in update["$max"]}
+        new_player["first_played"] = update["$set"]["last_played"]
+        return flush_update(
+            {"user_id": user_id},
+            {**{operator: fields for operator, fields in update.items() if fields}, "$setOnInsert": new_player},
+            flush_id
+        )
+    
+    async def write_batch(self, collection, flush_id: ObjectId, batch: Dict, operation: Callable) -> Tuple[Dict, Dict]:
+        """Write queued updates as flush_update operations in one unordered bulk write, and get those that did
+        not apply and those that may not have. Retrying the second with the same flush ID is safe, as an
+        update that already applied is then rejected as a duplicate key"""
+        keys = list(batch)
         try:
-            # Get current stats
-            stats = await self.db.player_stats.find_one({"user_id": user_id})
-            
-            if not stats:
-                stats = {
-                    "user_id": user_id,
-                    "user_name": user_name,
-                    "games_played": 0,
-                    "games_won": 0,
-                    "total_points": 0,
-                    "best_score": 0,
-                    "best_streak": 0,
-                    "correct_words": 0,
-                    "wrong_words": 0,
-                    "first_played": datetime.utcnow(),
-                    "last_played": datetime.utcnow()
-                }
-            
-            # Update based on action
-            if action == "correct_word":
-                stats["correct_words"] += 1
-                stats["total_points"] += points
-                stats["best_score"] = max(stats["best_score"], points)
-            
-            elif action == "wrong_word":
-                stats["wrong_words"] += 1
-            
-            elif action == "game_finished":
-                stats["games_played"] += 1
-                if won:
-                    stats["games_won"] += 1
-                stats["best_score"] = max(stats["best_score"], points)
-            
-            stats["user_name"] = user_name  # Update name in case it changed
-            stats["last_played"] = datetime.utcnow()
-            
-            # Upsert the document
-            await self.db.player_stats.update_one(
-                {"user_id": user_id},
-                {"$set": stats},
-                upsert=True
+            await collection.bulk_write([operation(key, batch[key], flush_id) for key in keys], ordered=False)
+            return {}, {}
+        
+        except Exception as e:
+            failed, unknown = write_outcome(e, len(keys))
+            logger.error(
+                f"Error updating {collection.name}, {len(failed)} of {len(keys)} queued again "
+                f"and {len(unknown)} kept to retry: {e}"
             )
-            
+            return {keys[i]: batch[keys[i]] for i in failed}, {keys[i]: batch[keys[i]] for i in unknown}
+    
+    def update_score_buckets(self, chat_id: int, user_id: int, user_name: str, points: int, won: bool):
+        """Queue a finished game's score for its player's buckets: this chat all-time, this week and today,
+        and this week and today across every chat"""
+        now = datetime.utcnow()
+        scopes = [(chat_id, period) for period in PERIODS] + [(GLOBAL_CHAT, "week"), (GLOBAL_CHAT, "day")]
+        for bucket_chat, period in scopes:
+            key = (bucket_chat, period, bucket_start(period, now), user_id)
+            update = self.bucket_queue.get(key)
+            if update is None:
+                update = self.bucket_queue[key] = {"$inc": {"points": 0, "games_won": 0, "games_played": 0}, "$set": {}}
+            inc = update["$inc"]
+            inc["points"] += points
+            inc["games_won"] += int(won)
+            inc["games_played"] += 1
+            update["$set"]["user_name"] = user_name
+    
+    async def flush_score_buckets(self):
+        """Write every queued score bucket change in one unordered bulk write, after retrying any earlier write
+        that may not have applied, like player stats"""
+        if self.bucket_retry is not None:
+            flush_id, batch = self.bucket_retry
+            self.bucket_retry = None
+            if not await self.write_score_buckets(flush_id, batch):
+                return
+        
+        queue, self.bucket_queue = self.bucket_queue, {}
+        if queue:
+            await self.write_score_buckets(ObjectId(), queue)
+    
+    async def write_score_buckets(self, flush_id: ObjectId, batch: Dict[tuple, dict]) -> bool:
+        """Write a batch of score bucket changes under one flush ID; False if some are kept to retry"""
+        failed, unknown = await self.write_batch(self.db.score_buckets, flush_id, batch, self.bucket_operation)
+        requeue(self.bucket_queue, failed)
+        if unknown:
+            self.bucket_retry = (flush_id, unknown)
+        return not unknown
+    
+    @staticmethod
+    def bucket_operation(key: tuple, update: dict, flush_id: ObjectId) -> UpdateOne:
+        chat_id, period, bucket, user_id = key
+        if bucket is not None:
+            # Buckets expire once they are LEADERBOARD_BUCKETS_KEPT periods old
+            expires_at = bucket + PERIOD_LENGTHS[period] * (config.LEADERBOARD_BUCKETS_KEPT + 1)
+            update = {**update, "$setOnInsert": {"expires_at": expires_at}}
+        return flush_update({"chat_id": chat_id, "period": period, "bucket": bucket, "user_id": user_id}, update, flush_id)
+    
+    async def get_bucket_leaderboard(self, chat_id: int, period: str, limit: int = 10):
+        """Get the top players of a chat's (or every chat's) current bucket for a period"""
+        try:
+            cursor = self.db.score_buckets.find(
+                {"chat_id": chat_id, "period": period, "bucket": bucket_start(period, datetime.utcnow())},
+                {"_id": 0, "user_id": 1, "user_name": 1, "points": 1, "games_won": 1, "games_played": 1}
+            ).sort("points", -1).limit(limit)
+            return await cursor.to_list(length=limit)
         except Exception as e:
-            logger.error(f"Error updating player stats: {e}")
+            logger.error(f"Error getting bucket leaderboard: {e}")
+            return []
     
     async def get_player_stats(self, user_id: int):
         """Get player statistics"""
         try:
-            return await self.db.player_stats.find_one({"user_id": user_id})
+            return await self.db.player_stats.find_one({"user_id": user_id}, {"flushes": 0})
         except Exception as e:
             logger.error(f"Error getting player stats: {e}")
             return None
     
-    async def get_leaderboard(self, limit: int = 10):
-        """Get top players leaderboard"""
+    def get_player_rank(self, user_id: int):
+        """Get a player's global rank by total points and the number of players, from memory"""
+        return self.leaderboard.rank(user_id)
+    
+    async def load_leaderboard(self):
+        """Load every player's totals into the in-memory leaderboard"""
         try:
-            cursor = self.db.player_stats.find().sort("total_points", -1).limit(limit)
-            return await cursor.to_list(length=limit)
+            cursor = self.db.player_stats.find(
+                {}, {"_id": 0, "user_id": 1, "user_name": 1, "total_points": 1, "games_won": 1, "games_played": 1}
+            )
+            self.leaderboard.load(await cursor.to_list(length=None))
+            logger.info(f"Leaderboard loaded with {len(self.leaderboard)} players")
         except Exception as e:
-            logger.error(f"Error getting leaderboard: {e}")
-            return []
+            logger.error(f"Error loading leaderboard: {e}")
+    
+    def get_leaderboard(self, limit: int = 10):
+        """Get top players leaderboard, from memory"""
+        return self.leaderboard.leaders(limit)
+    
+    async def build_chat_summary(self, chat_id: int) -> dict:
+        """Write a chat's summary from its game history"""
+        total_games = await self.db.game_history.count_documents({"chat_id": chat_id})
+        recent_games = await self.db.game_history.find(
+            {"chat_id": chat_id}
+        ).sort("end_time", -1).limit(RECENT_GAMES).to_list(length=RECENT_GAMES)
+        
+        summary = {"total_games": total_games, "recent_games": [game_result(game) for game in recent_games]}
+        await self.db.chat_summaries.update_one({"chat_id": chat_id}, {"$set": summary}, upsert=True)
+        return summary
     
     async def get_game_stats(self, chat_id: int):
-        """Get game statistics for a chat"""
+        """Get game statistics for a chat: its game count and latest results, from its summary"""
         try:
-            # Count total games in this chat
-            total_games = await self.db.game_history.count_documents({"chat_id": chat_id})
-            
-            # Get recent games
-            recent_games = await self.db.game_history.find(
-                {"chat_id": chat_id}
-            ).sort("end_time", -1).limit(5).to_list(length=5)
+            summary = await self.db.chat_summaries.find_one({"chat_id": chat_id}, {"_id": 0})
+            if summary is None:
+                # No game has ended here since summaries were added
+                summary = await self.build_chat_summary(chat_id)
             
             return {
-                "total_games": total_games,
-                "recent_games": recent_games
+                "total_games": summary.get("total_games", 0),
+                "recent_games": summary.get("recent_games", [])
             }
             
         except Exception as e:
@@ -1,50 +1,53 @@
-import asyncio
+import calendar
 import logging
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Optional, Tuple
 from AntakshariBot.database import db
 from AntakshariBot.word_validator import WordValidator
+from AntakshariBot.scheduler import TimerWheel
+from AntakshariBot.game_state import ACTIVE, ENDED, JOINING, NEXT_STATES, GameState, Player, UsedWords
+from AntakshariBot.data.data_loader import data_loader
+from AntakshariBot.data.difficulty import MAX_DIFFICULTY
+from AntakshariBot.data.word_index import Theme
 import config
 
 logger = logging.getLogger(__name__)
 
 class GameManager:
     def __init__(self):
-        self.active_games: Dict[int, dict] = {}
-        self.join_timers: Dict[int, asyncio.Task] = {}
-        self.turn_timers: Dict[int, asyncio.Task] = {}
+        self.active_games: Dict[int, GameState] = {}
+        # Join and turn deadlines of every game, keyed by chat ID; a game has at most one at a time
+        self.timers = TimerWheel()
+        # Chat ID -> user ID of the player whose turn it is, read by the dispatch filter in bot.py
+        self.expected_speakers: Dict[int, int] = {}
         self.word_validator = WordValidator()
+        # Points for a correct word by its difficulty score: the base points plus a share of the bonus
+        self.word_points = [
+            config.POINTS_PER_WORD + config.BONUS_POINTS * difficulty // MAX_DIFFICULTY
+            for difficulty in range(MAX_DIFFICULTY + 1)
+        ]
     
-    async def start_game(self, chat_id: int, user_id: int, user_name: str) -> dict:
-        """Start a new game in the chat"""
+    async def start_game(self, chat_id: int, user_id: int, user_name: str, theme: str = config.DEFAULT_THEME) -> dict:
+        """Start a new game in the chat, optionally limited to a theme key such as "countries" or "in:india\""""
         try:
             if chat_id in self.active_games:
                 return {"success": False, "message": "A game is already active in this group!"}
         
             # First check if there's an active game in the database
             game_info = await self.get_game_info(chat_id)
-            if game_info and game_info["status"] == "active":
+            if game_info and game_info["status"] == ACTIVE:
                 return {"success": False, "message": "A game is already active in this group!"}
         
             # Create new game
-            game_data = {
-                "chat_id": chat_id,
-                "status": "joining",
-                "players": [{"id": user_id, "name": user_name, "score": 0, "streak": 0}],
-                "current_player": 0,
-                "last_word": "",
-                "next_letter": "",
-                "used_words": set(),
-                "round": 0,
-                "max_rounds": 50,
-                "start_time": time.time(),
-                "creator": user_id
-            }
+            game_data = GameState(chat_id, user_id, theme, time.time(), data_loader.index.keys)
+            game_data.add_player(user_id, user_name)
+            # Unused words left per first letter, kept up to date as words are played
+            game_data.letter_counts = self.count_letters(game_data)
         
             self.active_games[chat_id] = game_data
         
-            # Save to database
-            await db.create_game(game_data)
+            # Save to database with the next flush
+            db.create_game(game_data)
         
             return {"success": True, "game": game_data}
         
@@ -60,23 +63,22 @@ class GameManager:
             
             game = self.active_games[chat_id]
             
-            if game["status"] != "joining":
+            if game.status != JOINING:
                 return {"success": False, "message": "Game has already started!"}
             
             # Check if user already joined
-            for player in game["players"]:
-                if player["id"] == user_id:
-                    return {"success": False, "message": "You have already joined this game!"}
+            if user_id in game.players:
+                return {"success": False, "message": "You have already joined this game!"}
             
             # Check max players
-            if len(game["players"]) >= config.MAX_PLAYERS:
+            if len(game.players) >= config.MAX_PLAYERS:
                 return {"success": False, "message": f"Game is full! Maximum {config.MAX_PLAYERS} players allowed."}
             
             # Add player
-            game["players"].append({"id": user_id, "name": user_name, "score": 0, "streak": 0})
+            game.add_player(user_id, user_name)
             
             # Update database
-            await db.update_game(chat_id, game)
+            db.update_game(game)
             
             return {"success": True, "game": game}
             
@@ -84,7 +86,7 @@ class GameManager:
             logger.error(f"Error joining game: {e}")
             return {"success": False, "message": "Failed to join game. Please try again."}
     
-    async def leave_game(self, chat_id: int, user_id: int) -> dict:
+    async def leave_game(self, chat_id: int, user_id: int, client=None) -> dict:
         """Leave the current game"""
         try:
             if chat_id not in self.active_games:
@@ -92,61 +94,85 @@ class GameManager:
             
             game = self.active_games[chat_id]
             
-            # Find and remove player
-            for i, player in enumerate(game["players"]):
-                if player["id"] == user_id:
-                    game["players"].pop(i)
-                    
-                    # Adjust current player index if needed
-                    if game["status"] == "active" and i <= game["current_player"]:
-                        game["current_player"] = max(0, game["current_player"] - 1)
-                    
-                    # End game if not enough players
-                    if len(game["players"]) < config.MIN_PLAYERS:
-                        await self.end_game(chat_id)
-                        return {"success": True, "message": "Game ended due to insufficient players."}
-                    
-                    # Update database
-                    await db.update_game(chat_id, game)
-                    return {"success": True}
+            # Remove player; if it was their turn, it passes to the next player
+            was_current = game.current is not None and game.current.id == user_id
+            if game.remove_player(user_id) is None:
+                return {"success": False, "message": "You are not in this game!"}
+            
+            if was_current and game.status == ACTIVE and game.players:
+                # The player whose turn it was left: the next player starts a fresh turn
+                self.new_turn(chat_id)
+                if client and len(game.players) >= config.MIN_PLAYERS:
+                    self.start_turn_timer(chat_id, client)
             
-            return {"success": False, "message": "You are not in this game!"}
+            # End game if not enough players
+            if len(game.players) < config.MIN_PLAYERS:
+                await self.end_game(chat_id)
+                return {"success": True, "message": "Game ended due to insufficient players."}
+            
+            # Update database
+            db.update_game(game)
+            return {"success": True}
             
         except Exception as e:
             logger.error(f"Error leaving game: {e}")
             return {"success": False, "message": "Failed to leave game. Please try again."}
     
-    async def start_join_timer(self, chat_id: int, client):
-        """Start the join timer for a game"""
+    def start_join_timer(self, chat_id: int, client, delay: Optional[float] = None):
+        """Start the join timer for a game, for the full join time unless a delay is given"""
+        delay = config.JOIN_TIME if delay is None else delay
+        self.active_games[chat_id].deadline = time.time() + delay
+        self.timers.schedule(chat_id, delay, self.join_timeout, chat_id, client)
+    
+    def start_turn_timer(self, chat_id: int, client, delay: Optional[float] = None):
+        """Start the current turn's timer, replacing the previous one"""
+        game = self.active_games[chat_id]
+        delay = config.TURN_TIME if delay is None else delay
+        game.deadline = time.time() + delay
+        self.timers.schedule(chat_id, delay, self.turn_timeout, chat_id, game.turn, client)
+    
+    def set_status(self, chat_id: int, status: str) -> bool:
+        """Move a game to a later state, ending the current turn; False if the game is gone or cannot move there"""
+        game = self.active_games.get(chat_id)
+        if game is None or status not in NEXT_STATES[game.status]:
+            return False
+        game.status = status
+        self.new_turn(chat_id)
+        return True
+    
+    def new_turn(self, chat_id: int) -> int:
+        """End the current turn: pending timers and submissions for it become stale"""
+        game = self.active_games[chat_id]
+        game.turn += 1
+        self.sync_expected_speaker(chat_id)
+        return game.turn
+    
+    async def join_timeout(self, chat_id: int, client):
+        """Start the game, or cancel it if too few players joined, once the join time is up"""
         try:
-            await asyncio.sleep(config.JOIN_TIME)
-            
             if chat_id in self.active_games:
                 game = self.active_games[chat_id]
                 
-                if game["status"] == "joining":
-                    if len(game["players"]) >= config.MIN_PLAYERS:
-                        # Start the game
-                        game["status"] = "active"
-                        game["round"] = 1
+                if game.status == JOINING:
+                    if len(game.players) >= config.MIN_PLAYERS:
+                        # Start the game and its first turn before anything awaits
+                        self.set_status(chat_id, ACTIVE)
+                        game.round = 1
+                        self.start_turn_timer(chat_id, client)
+                        current_player = game.current
                         
-                        await db.update_game(chat_id, game)
+                        db.update_game(game)
                         
-                        current_player = game["players"][game["current_player"]]
                         
                         await client.send_message(
                             chat_id,
                             f"🎮 **Game Started!**\n\n"
-                            f"👥 **Players:** {len(game['players'])}\n"
-                            f"🎯 **First Turn:** {current_player['name']}\n"
-                            f"🌍 **Say any country or city name to begin!**\n"
+                            f"👥 **Players:** {len(game.players)}\n"
+                            f"🎯 **First Turn:** {current_player.name}\n"
+                            f"🌍 **Theme:** {data_loader.index.get_theme(game.theme).title}\n"
+                            f"🌍 **Say any name from the theme to begin!**\n"
                             f"⏰ You have {config.TURN_TIME} seconds per turn"
                         )
-                        
-                        # Start turn timer
-                        self.turn_timers[chat_id] = asyncio.create_task(
-                            self.turn_timeout(chat_id, client)
-                        )
                     else:
                         # Not enough players
                         await self.end_game(chat_id)
@@ -160,30 +186,39 @@ class GameManager:
             logger.error(f"Error in join timer: {e}")
     
     async def process_word(self, chat_id: int, user_id: int, user_name: str, word: str, client=None) -> dict:
-        """Process a word submission"""
+        """Process a word submission
+        
+        All game state changes happen between the turn check after validation and the first
+        database write, so a timeout or another submission can never act on a half-finished turn.
+        """
         try:
             if chat_id not in self.active_games:
                 return {"success": False, "error": False}
             
             game = self.active_games[chat_id]
             
-            if game["status"] != "active":
+            if game.status != ACTIVE:
                 return {"success": False, "error": False}
             
             # Check if it's the player's turn
-            current_player = game["players"][game["current_player"]]
-            if current_player["id"] != user_id:
+            current_player = game.current
+            if current_player.id != user_id:
                 # Silently ignore - don't send any error message
                 return {"success": False, "error": False, "is_current_player": False}
             
             # Mark that this is the current player
             is_current_player = True
+            turn = game.turn
             
             # Validate word
             validation_result = await self.word_validator.validate_word(
-                word, game["next_letter"], game["used_words"]
+                word, game.next_letter, game.used_words, game.theme
             )
             
+            # The turn ended while the word was validated: timed out, player left or game over
+            if game.turn != turn:
+                return {"success": False, "error": False, "is_current_player": False}
+            
             if not validation_result["valid"]:
                 # Wrong answer - don't eliminate, just return error
                 # await self.eliminate_player(chat_id, user_id)
@@ -195,59 +230,50 @@ class GameManager:
                     "is_current_player": is_current_player
                 }
             
-            # Correct answer
-            points = config.POINTS_PER_WORD
-            
-            # Add bonus points for rare words
-            if validation_result.get("rare", False):
-                points += config.BONUS_POINTS
+            # Correct answer, worth more the harder the word is to play
+            points = self.word_points[validation_result["difficulty"]]
             
             # Add streak bonus
-            current_player["streak"] += 1
-            if current_player["streak"] > 1:
-                points += current_player["streak"] - 1
+            current_player.streak += 1
+            if current_player.streak > 1:
+                points += current_player.streak - 1
             
-            current_player["score"] += points
+            current_player.score += points
             
-            # Add word to used words
-            game["used_words"].add(word.lower())
-            game["last_word"] = word.title()
-            game["next_letter"] = word[-1].lower()
+            # Mark the place's alias class as used, so every name and spelling of it counts as used
+            class_id = validation_result["class_id"]
+            game.used_words.add(class_id)
+            self.discount_used_words(game.letter_counts, data_loader.index.get_theme(game.theme), (class_id,))
+            game.last_word = validation_result["word"].title()
             
-            # Update player stats
-            await db.update_player_stats(user_id, user_name, "correct_word", points)
+            # Move past letters with no unused words left instead of letting the next player time out
+            game.next_letter, letter_rule = self.choose_next_letter(game, validation_result["key"])
             
-            # Check win condition
-            if current_player["score"] >= 100 or game["round"] >= game["max_rounds"]:
+            # Check win condition; the game also ends once every word in its theme is used
+            if (current_player.score >= 100 or game.round >= game.max_rounds
+                    or not any(game.letter_counts.values())):
+                db.update_player_stats(user_id, user_name, "correct_word", points)
                 return await self.end_game_with_winner(chat_id)
             
-            # Move to next turn
-            await self.next_turn(chat_id)
-            
-            # Update database
-            await db.update_game(chat_id, game)
-            
-            # Cancel current turn timer and start new one
-            if chat_id in self.turn_timers and self.turn_timers[chat_id]:
-                self.turn_timers[chat_id].cancel()
+            # Move to next turn; rescheduling replaces the answered turn's deadline
+            self.next_turn(chat_id)
+            self.start_turn_timer(chat_id, client)
+            next_player = game.current
             
-            # Don't start new timer if game ended
-            if chat_id in self.active_games:
-                next_player = game["players"][game["current_player"]]
-                # Store the client reference for use in turn_timeout
-                game["client"] = client
-                self.turn_timers[chat_id] = asyncio.create_task(
-                    self.turn_timeout(chat_id, client)
-                )
+            # Update database and player stats; both are written by the next flush
+            db.update_game(game)
+            db.update_player_stats(user_id, user_name, "correct_word", points)
             
             return {
                 "success": True,
                 "type": "correct",
                 "points": points,
-                "streak": current_player["streak"],
-                "next_letter": game["next_letter"],
-                "next_player": next_player["name"],
-                "next_player_id": next_player["id"],
+                "streak": current_player.streak,
+                "next_letter": game.next_letter,
+                "last_letter": validation_result["next_letter"],
+                "letter_rule": letter_rule,
+                "next_player": next_player.name,
+                "next_player_id": next_player.id,
                 "is_current_player": is_current_player
             }
             
@@ -260,56 +286,52 @@ class GameManager:
                 "is_current_player": True
             }
     
-    async def eliminate_player(self, chat_id: int, user_id: int):
-        """Eliminate a player from the game"""
+    async def eliminate_player(self, chat_id: int, user_id: int, client=None):
+        """Eliminate a player from the game, starting the next turn's timer if the game goes on"""
         if chat_id in self.active_games:
             game = self.active_games[chat_id]
             
-            # Find and remove the player
-            for i, player in enumerate(game["players"]):
-                if player["id"] == user_id:
-                    eliminated_player = game["players"].pop(i)
-                    
-                    # Adjust current player index if needed
-                    if i <= game["current_player"]:
-                        game["current_player"] = game["current_player"] % max(1, len(game["players"]))
-                    
-                    # Check if only one player remains
-                    if len(game["players"]) == 1:
-                        # Last player wins - don't end the game here, let the caller handle it
-                        return {"last_player": True, "winner": game["players"][0]}
-                    elif len(game["players"]) == 0:
-                        # No players left, end game
-                        await self.end_game(chat_id)
-                        return {"no_players": True}
-                    else:
-                        # Continue with next player
-                        if game["current_player"] >= len(game["players"]):
-                            game["current_player"] = 0
-                        
-                        # Update database
-                        await db.update_game(chat_id, game)
-                        return {"next_player": game["players"][game["current_player"]]}
-                    
-                    break
+            # Remove the player; if it was their turn, it passes to the next player
+            was_current = game.current is not None and game.current.id == user_id
+            if game.remove_player(user_id) is not None:
+                if was_current:
+                    # The next player starts a fresh turn
+                    self.new_turn(chat_id)
+                    if client and len(game.players) > 1:
+                        self.start_turn_timer(chat_id, client)
+                
+                # Check if only one player remains
+                if len(game.players) == 1:
+                    # Last player wins - don't end the game here, let the caller handle it
+                    return {"last_player": True, "winner": game.current}
+                elif len(game.players) == 0:
+                    # No players left, end game
+                    await self.end_game(chat_id)
+                    return {"no_players": True}
+                else:
+                    # Update database
+                    db.update_game(game)
+                    return {"next_player": game.current}
             
         return {"player_not_found": True}
     
-    async def declare_winner(self, chat_id: int, winner: dict):
+    async def declare_winner(self, chat_id: int, winner: Player):
         """Declare the winner and end the game"""
-        if chat_id in self.active_games:
+        # Only the first caller to end the game records it
+        if self.set_status(chat_id, ENDED):
             game = self.active_games[chat_id]
             
             # Update player stats
-            for player in game["players"]:
-                is_winner = player["id"] == winner["id"]
-                await db.update_player_stats(
-                    player["id"], 
-                    player["name"], 
+            for player in game.players.values():
+                is_winner = player is winner
+                db.update_player_stats(
+                    player.id, 
+                    player.name, 
                     "game_finished", 
-                    player["score"],
+                    player.score,
                     is_winner
                 )
+                db.update_score_buckets(chat_id, player.id, player.name, player.score, is_winner)
             
             # End the game
             await self.end_game(chat_id)
@@ -321,124 +343,117 @@ class GameManager:
                 "reason": "last_player"
             }
     
-    async def next_turn(self, chat_id: int):
+    def next_turn(self, chat_id: int):
         """Move to the next player's turn"""
         if chat_id in self.active_games:
             game = self.active_games[chat_id]
-            game["current_player"] = (game["current_player"] + 1) % len(game["players"])
-            game["round"] += 1
+            game.advance()
+            game.round += 1
+            self.new_turn(chat_id)
+    
+    def sync_expected_speaker(self, chat_id: int):
+        """Record whose turn it is in a chat, or forget the chat when no turn is running"""
+        game = self.active_games.get(chat_id)
+        if game and game.status == ACTIVE and game.current is not None:
+            self.expected_speakers[chat_id] = game.current.id
+        else:
+            self.expected_speakers.pop(chat_id, None)
     
-    async def turn_timeout(self, chat_id: int, client):
+    async def turn_timeout(self, chat_id: int, turn: int, client):
         """Handle turn timeout - eliminate player"""
         try:
-            # Wait for the turn time
-            await asyncio.sleep(config.TURN_TIME)
-            
-            # Check if the game still exists and is active
-            if chat_id in self.active_games:
-                game = self.active_games[chat_id]
-                if len(game["players"]) == 0:
-                    return
+            # Ignore timers whose turn already ended: answered, player left or game over
+            game = self.active_games.get(chat_id)
+            if game is None or game.status != ACTIVE or game.turn != turn or game.current is None:
+                return
             
             # Get the current player who timed out
-            if game["current_player"] >= len(game["players"]):
-                game["current_player"] = 0
-                
-            current_player = game["players"][game["current_player"]]
-            current_player_name = current_player["name"]
-            current_player_id = current_player["id"]
+            current_player = game.current
+            current_player_name = current_player.name
+            current_player_id = current_player.id
             
             logger.info(f"Player {current_player_name} timed out in chat {chat_id}")
             
-            # Eliminate the player who timed out
-            elimination_result = await self.eliminate_player(chat_id, current_player_id)
+            # Eliminate the player who timed out; the next turn and its timer start before anything awaits
+            elimination_result = await self.eliminate_player(chat_id, current_player_id, client)
             
             # Send appropriate messages if client is provided
-            if client and chat_id in self.active_games:
-                game = self.active_games[chat_id]  # Get updated game state
-                remaining_players = len(game["players"])
-                
-                if remaining_players == 1:
-                    # Last player wins
-                    winner = game["players"][0]
-                    await client.send_message(
-                        chat_id,
-                        f"⏰ **{current_player_name} eliminated due to timeout!**\n\n"
-                        f"🎉 **{winner['name']} wins the game!**\n"
-                        f"🏆 **Final Score:** {winner['score']} points"
-                    )
-                    # Declare winner and end game
-                    await self.declare_winner(chat_id, winner)
+            if not client:
+                logger.warning(f"Client not available for chat {chat_id}")
+            
+            elif "last_player" in elimination_result:
+                # Last player wins
+                winner = elimination_result["winner"]
+                await client.send_message(
+                    chat_id,
+                    f"⏰ **{current_player_name} eliminated due to timeout!**\n\n"
+                    f"🎉 **{winner.name} wins the game!**\n"
+                    f"🏆 **Final Score:** {winner.score} points"
+                )
+                # Declare winner and end game
+                await self.declare_winner(chat_id, winner)
+            
+            elif "next_player" in elimination_result:
+                # Game continues with next player
+                next_player = elimination_result["next_player"]
+                next_letter = game.next_letter.upper() if game.next_letter else "Any"
+                await client.send_message(
+                    chat_id,
+                    f"⏰ **{current_player_name} eliminated due to timeout!**\n"
+                    f"👥 **Players remaining:** {len(game.players)}\n"
+                    f"🎯 **Next turn:** {next_player.name}\n"
+                    f"📝 **Next letter:** {next_letter}"
+                )
                 
-                elif remaining_players > 1:
-                    # Game continues with next player
-                    next_player = game["players"][game["current_player"]]
-                    await client.send_message(
-                        chat_id,
-                        f"⏰ **{current_player_name} eliminated due to timeout!**\n"
-                        f"👥 **Players remaining:** {remaining_players}\n"
-                        f"🎯 **Next turn:** {next_player['name']}\n"
-                        f"📝 **Next letter:** {game['next_letter'].upper() if game['next_letter'] else 'Any'}"
-                    )
-                    
-                    # Notify the next player it's their turn
-                    await client.send_message(
-                        chat_id,
-                        f"🎮 **{next_player['name']}**, it's your turn!\n"
-                        f"📝 Say a country or city starting with **{game['next_letter'].upper() if game['next_letter'] else 'Any'}**\n"
-                        f"⏰ You have {config.TURN_TIME} seconds to answer."
-                    )
-                    
-                    # Start next turn timer
-                    self.turn_timers[chat_id] = asyncio.create_task(
-                        self.turn_timeout(chat_id, client)
-                    )
-                else:
-                    # No players left
-                    await client.send_message(
-                        chat_id,
-                        f"⏰ **{current_player_name} eliminated!**\n\n"
-                        f"🎮 **Game Over** - No players remaining!"
-                    )
-                    await self.end_game(chat_id)
-            else:
-                logger.warning(f"Client not available or game ended for chat {chat_id}")
+                # Notify the next player it's their turn
+                await client.send_message(
+                    chat_id,
+                    f"🎮 **{next_player.name}**, it's your turn!\n"
+                    f"📝 Say a country or city starting with **{next_letter}**\n"
+                    f"⏰ You have {config.TURN_TIME} seconds to answer."
+                )
+            
+            elif "no_players" in elimination_result:
+                # No players left
+                await client.send_message(
+                    chat_id,
+                    f"⏰ **{current_player_name} eliminated!**\n\n"
+                    f"🎮 **Game Over** - No players remaining!"
+                )
                 
-        except asyncio.CancelledError:
-            # Timer was cancelled, do nothing
-            logger.info(f"Turn timer cancelled for chat {chat_id}")
-            pass
         except Exception as e:
             logger.error(f"Error in turn timeout: {e}")
     
     async def end_game_with_winner(self, chat_id: int) -> dict:
         """End game and declare winner"""
-        if chat_id not in self.active_games:
+        # Only the first caller to end the game records it
+        if not self.set_status(chat_id, ENDED):
             return {"success": False}
         
         game = self.active_games[chat_id]
         
         # Find winner (highest score)
-        winner = max(game["players"], key=lambda p: p["score"])
+        winner = max(game.players.values(), key=lambda p: p.score)
         
         # Update player stats
-        for player in game["players"]:
-            is_winner = player["id"] == winner["id"]
-            await db.update_player_stats(
-                player["id"], 
-                player["name"], 
+        for player in game.players.values():
+            is_winner = player is winner
+            db.update_player_stats(
+                player.id, 
+                player.name, 
                 "game_finished", 
-                player["score"],
+                player.score,
                 is_winner
             )
+            db.update_score_buckets(chat_id, player.id, player.name, player.score, is_winner)
         
         # Prepare result
         result = {
             "success": True,
             "type": "game_won",
             "winner": winner,
-            "scores": {str(p["id"]): p["score"] for p in game["players"]},
-            "player_names": {str(p["id"]): p["name"] for p in game["players"]}
+            "scores": {str(p.id): p.score for p in game.players.values()},
+            "player_names": {str(p.id): p.name for p in game.players.values()}
         }
         
         # Clean up
@@ -450,21 +465,22 @@ class GameManager:
         """End the current game"""
         try:
             if chat_id in self.active_games:
-                # Cancel timers
-                if chat_id in self.join_timers:
-                    self.join_timers[chat_id].cancel()
-                    del self.join_timers[chat_id]
-                
-                if chat_id in self.turn_timers:
-                    self.turn_timers[chat_id].cancel()
-                    del self.turn_timers[chat_id]
+                # Cancel timers; the state change also makes in-flight submissions stale
+                self.set_status(chat_id, ENDED)
+                self.timers.cancel(chat_id)
                 
                 # Remove from active games
-                del self.active_games[chat_id]
+                game = self.active_games.pop(chat_id)
+                self.sync_expected_speaker(chat_id)
                 
-                # Update database
+                # Write the final scores, then move the game to history
+                db.update_game(game)
                 await db.end_game(chat_id)
                 
+                # Write the game's player statistics and leaderboard scores now rather than at the next interval
+                await db.flush_player_stats()
+                await db.flush_score_buckets()
+                
                 return {"success": True}
             
             return {"success": False, "message": "No active game in this group!"}
@@ -473,22 +489,127 @@ class GameManager:
             logger.error(f"Error ending game: {e}")
             return {"success": False, "message": "Failed to end game."}
     
+    def count_letters(self, game: GameState) -> Dict[str, int]:
+        """Count the unused words in the game's theme for every first letter"""
+        index = data_loader.index
+        theme = index.get_theme(game.theme)
+        
+        # O(log n) per letter on the theme's sorted IDs, then one pass over the game's used places
+        counts = {letter: theme.count_starting_with(letter) for letter in index.letter_ranges}
+        counts = {letter: count for letter, count in counts.items() if count}
+        self.discount_used_words(counts, theme, game.used_words)
+        return counts
+    
+    def discount_used_words(self, counts: Dict[str, int], theme: Theme, class_ids: Iterable[int]):
+        """Take every name of newly used places in a theme off per-letter counts"""
+        keys = theme.index.keys
+        for class_id in class_ids:
+            for word_id in theme.index.members(class_id):
+                if theme.contains(word_id):
+                    counts[keys[word_id][0]] -= 1
+    
+    def choose_next_letter(self, game: GameState, key: str) -> Tuple[str, str]:
+        """Pick the next required letter for a played word's folded key, with the rule used:
+        its last letter, else its second-to-last letter, else a free choice ("")"""
+        counts = game.letter_counts
+        letters = key.replace(" ", "")
+        if counts.get(letters[-1], 0) > 0:
+            return letters[-1], "last"
+        if len(letters) > 1 and counts.get(letters[-2], 0) > 0:
+            return letters[-2], "second_last"
+        return "", "free"
+    
+    def remaining_words_for_letter(self, chat_id: int, letter: Optional[str] = None) -> int:
+        """Count valid words in the game's theme starting with a letter that have not been used in the game yet"""
+        if chat_id not in self.active_games:
+            return 0
+        
+        game = self.active_games[chat_id]
+        letter = (letter if letter is not None else game.next_letter).lower()
+        if not letter:
+            return sum(game.letter_counts.values())
+        return game.letter_counts.get(letter, 0)
+    
+    async def refresh_word_data(self) -> bool:
+        """Reload word data and carry every active game's used words over to the new index"""
+        old_index = data_loader.index
+        success = await self.word_validator.refresh_data()
+        new_index = data_loader.index
+        
+        # Word and class IDs are positions in the sorted index, so they can shift when the data changes;
+        # the folded keys the games store do not
+        if success and new_index is not old_index:
+            for game in self.active_games.values():
+                game.used_words = UsedWords.from_doc(game.used_words.to_doc(), data_loader.get_class_id, new_index.keys)
+                game.letter_counts = self.count_letters(game)
+        
+        return success
+    
+    async def restore_games(self, client) -> int:
+        """Load the games that were running when the bot stopped and re-arm their deadlines"""
+        try:
+            docs = await db.load_games()
+            now = time.time()
+            restored = 0
+            
+            for doc in docs:
+                chat_id = doc.get("chat_id")
+                # One bad document must not keep the other games from coming back
+                try:
+                    if chat_id in self.active_games:
+                        continue
+                    
+                    start_time = doc.get("start_time")
+                    game = GameState.from_doc(doc, calendar.timegm(start_time.utctimetuple()) if start_time else now,
+                                              data_loader.get_class_id, data_loader.index.keys)
+                    if not game.players:
+                        await db.end_game(chat_id)
+                        continue
+                    
+                    game.letter_counts = self.count_letters(game)
+                    self.active_games[chat_id] = game
+                    if sorted(doc.get("used_words", ())) == game.used_words.to_doc():
+                        db.track_game(game)
+                    else:
+                        # Stored in an older form, or holding words the data no longer has: write it whole once
+                        db.create_game(game)
+                    
+                    # Deadlines that passed while the bot was down fire on the next tick;
+                    # games stored without one get the full join or turn time
+                    delay = max(0.0, game.deadline - now) if game.deadline else None
+                    if game.status == JOINING:
+                        self.start_join_timer(chat_id, client, delay)
+                    else:
+                        self.start_turn_timer(chat_id, client, delay)
+                    self.sync_expected_speaker(chat_id)
+                    restored += 1
+                    
+                except Exception as e:
+                    logger.error(f"Error restoring game {chat_id}: {e}")
+            
+            return restored
+            
+        except Exception as e:
+            logger.error(f"Error restoring games: {e}")
+            return 0
+    
     async def get_game_info(self, chat_id: int) -> Optional[dict]:
         """Get current game information"""
         if chat_id in self.active_games:
             game = self.active_games[chat_id]
             
             info = {
-                "status": game["status"],
-                "players": game["players"],
-                "round": game.get("round", 0),
-                "last_word": game.get("last_word", ""),
-                "next_letter": game.get("next_letter", "")
+                "status": game.status,
+                "players": list(game.players.values()),
+                "round": game.round,
+                "last_word": game.last_word,
+                "next_letter": game.next_letter,
+                "theme": data_loader.index.get_theme(game.theme).title
             }
             
-            if game["status"] == "active" and game["players"]:
-                current_player = game["players"][game["current_player"]]
-                info["current_player_name"] = current_player["name"]
+            if game.status == ACTIVE and game.current is not None:
+                info["current_player_name"] = game.current.name
+                info["words_left"] = self.remaining_words_for_letter(chat_id)
             
             return info
         
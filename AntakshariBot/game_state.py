@@ -0,0 +1,205 @@
+"""
+In-memory state of a running game
+
+Players sit in a ring: each links to the players before and after them, and the
+game maps user IDs to players in seating order. Joining, leaving, elimination,
+membership checks and passing the turn are all O(1), and the order never needs
+reindexing. to_doc and from_doc convert to and from the document stored in the
+games collection, where players are a list and the current player is an index.
+
+The places used in a game are a sorted array of alias class IDs (see
+data.word_index): 4 bytes each, checked by binary search. Class IDs are
+positions in the word index and shift when the word data changes, so the
+database stores the folded keys of the used classes instead, and games map
+them back to class IDs of whichever index is current when they load.
+
+This module needs only config, so it can be used without a bot or database.
+"""
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+import config
+
+# Game states; a game only moves forward, and every state change ends the current turn
+JOINING = "joining"
+ACTIVE = "active"
+ENDED = "ended"
+NEXT_STATES = {
+    JOINING: (ACTIVE, ENDED),
+    ACTIVE: (ENDED,),
+    ENDED: ()
+}
+
+MAX_ROUNDS = 50
+
+
+class UsedWords:
+    """Alias class IDs used in a game, kept as a sorted array, with the folded keys of the index they number"""
+
+    __slots__ = ("ids", "keys")
+
+    def __init__(self, ids: Iterable[int] = (), keys: Sequence[str] = ()):
+        self.ids = array("I", sorted(set(ids)))
+        # Word ID -> folded key, the index's sorted keys; only read to store the used words
+        self.keys = keys
+
+    def __contains__(self, class_id: int) -> bool:
+        i = bisect_left(self.ids, class_id)
+        return i < len(self.ids) and self.ids[i] == class_id
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, class_id: int):
+        i = bisect_left(self.ids, class_id)
+        if i == len(self.ids) or self.ids[i] != class_id:
+            self.ids.insert(i, class_id)
+
+    def to_doc(self) -> List[str]:
+        """Get the form stored in the database: the folded key of every used class, sorted"""
+        keys = self.keys
+        return [keys[class_id] for class_id in self.ids]
+
+    @classmethod
+    def from_doc(cls, stored: Iterable[str], class_id: Callable[[str], Optional[int]],
+                 keys: Sequence[str] = ()) -> "UsedWords":
+        """Load stored used words: folded keys, or the names older documents stored, which class_id maps to
+        class IDs of the index with these keys; words it does not know are dropped"""
+        ids = (class_id(word) for word in stored)
+        return cls((word_id for word_id in ids if word_id is not None), keys)
+
+
+class Player:
+    """A player in one game, linked to the players seated before and after them"""
+
+    __slots__ = ("id", "name", "score", "streak", "prev", "next")
+
+    def __init__(self, user_id: int, name: str, score: int = 0, streak: int = 0):
+        self.id = user_id
+        self.name = name
+        self.score = score
+        self.streak = streak
+        self.prev: "Player" = self
+        self.next: "Player" = self
+
+    def __repr__(self) -> str:
+        return f"Player({self.id}, {self.name!r}, score={self.score})"
+
+    def to_doc(self) -> dict:
+        return {"id": self.id, "name": self.name, "score": self.score, "streak": self.streak}
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "Player":
+        return cls(doc["id"], doc["name"], doc.get("score", 0), doc.get("streak", 0))
+
+
+class GameState:
+    """A game's players, turn and word state"""
+
+    __slots__ = (
+        "chat_id", "status", "turn", "players", "current", "last_word", "next_letter",
+        "used_words", "round", "max_rounds", "theme", "start_time", "creator", "letter_counts", "deadline"
+    )
+
+    def __init__(self, chat_id: int, creator: int, theme: str, start_time: float, keys: Sequence[str] = ()):
+        self.chat_id = chat_id
+        self.status = JOINING
+        # Bumped whenever a turn ends; timers and submissions from an older turn are ignored
+        self.turn = 0
+        # User ID -> player, in seating order
+        self.players: Dict[int, Player] = {}
+        # The player whose turn it is; the first player to join until the game starts
+        self.current: Optional[Player] = None
+        self.last_word = ""
+        self.next_letter = ""
+        # Played places by class ID; keys are the word index's, to store them by folded key
+        self.used_words = UsedWords((), keys)
+        self.round = 0
+        self.max_rounds = MAX_ROUNDS
+        self.theme = theme
+        self.start_time = start_time
+        self.creator = creator
+        # Unused words left per first letter, kept up to date by the game manager
+        self.letter_counts: Dict[str, int] = {}
+        # Wall-clock time of the pending join or turn deadline, so it can be re-armed after a restart
+        self.deadline = 0.0
+
+    def add_player(self, user_id: int, name: str, score: int = 0, streak: int = 0) -> Player:
+        """Seat a new player last in turn order"""
+        player = Player(user_id, name, score, streak)
+        if self.current is None:
+            self.current = player
+        else:
+            # Last in the ring is the player before the first one
+            first = next(iter(self.players.values()))
+            player.prev, player.next = first.prev, first
+            first.prev.next = player
+            first.prev = player
+        self.players[user_id] = player
+        return player
+
+    def remove_player(self, user_id: int) -> Optional[Player]:
+        """Take a player out of the ring; if it was their turn, it passes to the next player"""
+        player = self.players.pop(user_id, None)
+        if player is None:
+            return None
+        if not self.players:
+            self.current = None
+        else:
+            if player is self.current:
+                self.current = player.next
+            player.prev.next = player.next
+            player.next.prev = player.prev
+        player.prev = player.next = player
+        return player
+
+    def advance(self) -> Optional[Player]:
+        """Pass the turn to the next player in seating order"""
+        if self.current is not None:
+            self.current = self.current.next
+        return self.current
+
+    def current_index(self) -> int:
+        """Position of the current player in seating order, as stored in the database"""
+        for i, player in enumerate(self.players.values()):
+            if player is self.current:
+                return i
+        return 0
+
+    def to_doc(self) -> dict:
+        """Convert to the games collection document shape"""
+        return {
+            "chat_id": self.chat_id,
+            "status": self.status,
+            "players": [player.to_doc() for player in self.players.values()],
+            "creator": self.creator,
+            "current_player": self.current_index(),
+            "last_word": self.last_word,
+            "next_letter": self.next_letter,
+            "round": self.round,
+            "theme": self.theme,
+            "used_words": self.used_words.to_doc(),
+            "deadline": self.deadline
+        }
+
+    @classmethod
+    def from_doc(cls, doc: dict, start_time: float,
+                 class_id: Callable[[str], Optional[int]], keys: Sequence[str] = ()) -> "GameState":
+        """Rebuild a game from its games collection document; class_id maps the stored used words to class IDs
+        of the word index with these keys"""
+        game = cls(doc["chat_id"], doc.get("creator"), doc.get("theme") or config.DEFAULT_THEME, start_time, keys)
+        game.status = doc.get("status", JOINING)
+        for player in doc.get("players", []):
+            game.add_player(player["id"], player["name"], player.get("score", 0), player.get("streak", 0))
+        players = list(game.players.values())
+        if players:
+            game.current = players[doc.get("current_player", 0) % len(players)]
+        game.last_word = doc.get("last_word", "")
+        game.next_letter = doc.get("next_letter", "")
+        game.used_words = UsedWords.from_doc(doc.get("used_words", []), class_id, keys)
+        game.round = doc.get("round", 0)
+        game.deadline = doc.get("deadline") or 0.0
+        return game
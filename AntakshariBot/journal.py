@@ -0,0 +1,150 @@
+"""
+Local append-only journal of game state, for restarts that do not wait on MongoDB
+
+Every database flush appends one JSON line per changed game before its bulk
+write: the whole games document when a game is first written, then the fields
+that changed, and an end entry when the game moves to history. Used words are
+journaled as the folded keys added since the last entry rather than the whole
+list, unless some were dropped. Lines are written in one batch per flush; the
+database runs flushes in a worker thread, so file writes and compaction never
+block the event loop.
+
+Replaying the journal applies the entries in order and yields the documents of
+the games still running. Once the file holds several lines per running game it
+is compacted: rewritten as one document entry per running game and swapped in
+atomically, so replay time stays proportional to the games in progress.
+"""
+import json
+import logging
+import os
+from typing import Dict, List, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+# The journal is compacted once it has this many lines per running game, and at least COMPACT_LINES
+COMPACT_RATIO = 10
+COMPACT_LINES = 10_000
+
+
+def dumps(entry: dict) -> str:
+    return json.dumps(entry, separators=(",", ":"))
+
+
+def loads(line: str) -> dict:
+    return json.loads(line)
+
+
+class GameJournal:
+    """Appends game entries to a JSON lines file and replays them into games documents"""
+
+    def __init__(self, path: str, compact_lines: int = COMPACT_LINES):
+        self.path = path
+        self.compact_lines = compact_lines
+        # Chat ID -> document of every game the journal holds as running
+        self.games: Dict[int, dict] = {}
+        self.pending: List[str] = []
+        self.lines = 0
+        self.file: Optional[TextIO] = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> List[dict]:
+        """Replay the journal into the documents of the games still running, then compact it"""
+        self.games = {}
+        lines = 0
+        torn = False
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        entry = loads(line)
+                    except ValueError:
+                        # A line cut short by a crash can only be the last one
+                        logger.warning(f"Ignoring a torn line at the end of {self.path}")
+                        torn = True
+                        break
+                    self.apply(entry)
+                    lines += 1
+        except FileNotFoundError:
+            pass
+
+        # Rewrite the file unless it already holds exactly one entry per running game
+        if torn or lines != len(self.games) or not self.exists():
+            self.compact()
+        else:
+            self.lines = lines
+        return list(self.games.values())
+
+    def apply(self, entry: dict):
+        """Apply an entry to the running games, copying what it shares with the caller"""
+        chat_id = entry["chat_id"]
+        if entry["op"] == "end":
+            self.games.pop(chat_id, None)
+        elif entry["op"] == "game":
+            doc = dict(entry["doc"])
+            doc["players"] = [dict(player) for player in doc["players"]]
+            self.games[chat_id] = doc
+        elif chat_id in self.games:
+            doc = self.games[chat_id]
+            for field, value in entry["fields"].items():
+                if field == "players":
+                    doc["players"] = [dict(player) for player in value]
+                elif field == "used_words+":
+                    doc["used_words"] = doc["used_words"] + value
+                elif field.startswith("players."):
+                    # players.<seat>.<field>
+                    _, seat, player_field = field.split(".")
+                    doc["players"][int(seat)][player_field] = value
+                else:
+                    doc[field] = value
+
+    def record(self, entry: dict):
+        self.apply(entry)
+        self.pending.append(dumps(entry))
+
+    def write_game(self, doc: dict):
+        """Record a game's whole document"""
+        self.record({"op": "game", "chat_id": doc["chat_id"], "doc": doc})
+
+    def write_changes(self, chat_id: int, fields: dict):
+        """Record changed fields of a game, as database.game_changes gives them"""
+        self.record({"op": "set", "chat_id": chat_id, "fields": fields})
+
+    def write_end(self, chat_id: int):
+        """Record that a game ended"""
+        self.record({"op": "end", "chat_id": chat_id})
+
+    def flush(self):
+        """Append the recorded entries in one write, compacting once the file has grown long"""
+        if not self.pending:
+            return
+        if self.file is None:
+            self.file = open(self.path, "a", encoding="utf-8")
+        self.file.write("\n".join(self.pending) + "\n")
+        self.file.flush()
+        self.lines += len(self.pending)
+        self.pending = []
+        if self.lines >= max(self.compact_lines, COMPACT_RATIO * len(self.games)):
+            self.compact()
+
+    def compact(self):
+        """Rewrite the journal as one entry per running game"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for chat_id, doc in self.games.items():
+                entry = {"op": "game", "chat_id": chat_id, "doc": doc}
+                file.write(dumps(entry) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+        self.lines = len(self.games)
+
+    def close(self):
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
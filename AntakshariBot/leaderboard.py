@@ -0,0 +1,170 @@
+"""
+In-memory global leaderboard
+
+Holds every player's total points, wins and games, seeded once from the
+player_stats collection at startup and then kept current by
+Database.update_player_stats as changes are queued, so it never waits for a
+flush. The top players are kept sorted beside the full table. Points only ever
+grow, so a change can only move a player up: it re-sorts the top when the
+player is already in it or has passed the last of it, and is a dictionary
+update otherwise.
+
+version counts changes to the top, so renderings of it can be cached until it
+moves.
+
+Global ranks come from a Fenwick tree counting players at every point total:
+a player's rank is one more than the number of players with more points, a
+prefix sum, so looking it up and moving a player whose points changed are both
+O(log P) for P the highest total. Players with equal points share a rank.
+
+This module has no dependencies, so it can be used without a bot or database.
+"""
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Players kept ranked; /leaderboard shows up to this many
+TOP_SIZE = 10
+
+
+class Standing:
+    """A player's all-time totals"""
+
+    __slots__ = ("user_id", "name", "points", "won", "played")
+
+    def __init__(self, user_id: int, name: str, points: int = 0, won: int = 0, played: int = 0):
+        self.user_id = user_id
+        self.name = name
+        self.points = points
+        self.won = won
+        self.played = played
+
+    def rank_key(self) -> tuple:
+        # Most points first; ties keep the order they were first ranked in, by user ID
+        return -self.points, self.user_id
+
+
+class ScoreCounts:
+    """Fenwick tree of how many players have each point total"""
+
+    __slots__ = ("tree", "total")
+
+    def __init__(self, size: int = 1024):
+        # One node per total from 0 up, 1-based; the size stays a power of two so the tree can double in place
+        capacity = 1
+        while capacity < size:
+            capacity *= 2
+        self.tree = array("I", bytes(4 * (capacity + 1)))
+        self.total = 0
+
+    @classmethod
+    def from_points(cls, points: Iterable[int]) -> "ScoreCounts":
+        """Build the tree from every player's total in O(n + P)"""
+        points = list(points)
+        counts = cls(max(points, default=0) + 1)
+        tree = counts.tree
+        for value in points:
+            tree[value + 1] += 1
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        counts.total = len(points)
+        return counts
+
+    def grow(self, points: int):
+        """Double the tree until it covers a total: each new top node counts every total below it"""
+        while points + 1 >= len(self.tree):
+            capacity = len(self.tree) - 1
+            self.tree.frombytes(bytes(4 * capacity))
+            self.tree[2 * capacity] = self.tree[capacity]
+
+    def add(self, points: int, count: int):
+        """Add count players (or remove them, if negative) at a point total"""
+        if points + 1 >= len(self.tree):
+            self.grow(points)
+        self.total += count
+        i = points + 1
+        tree = self.tree
+        while i < len(tree):
+            tree[i] += count
+            i += i & -i
+
+    def count_at_most(self, points: int) -> int:
+        """Count the players with at most this many points"""
+        i = min(points + 1, len(self.tree) - 1)
+        count = 0
+        tree = self.tree
+        while i > 0:
+            count += tree[i]
+            i -= i & -i
+        return count
+
+    def count_above(self, points: int) -> int:
+        """Count the players with more points"""
+        return self.total - self.count_at_most(points)
+
+
+class Leaderboard:
+    """Totals of every player, with the top TOP_SIZE ranked by points"""
+
+    def __init__(self, size: int = TOP_SIZE):
+        self.size = size
+        self.players: Dict[int, Standing] = {}
+        self.top: List[Standing] = []
+        self.version = 0
+        self.counts = ScoreCounts()
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def load(self, docs: Iterable[dict]):
+        """Replace the table with player_stats documents"""
+        self.players = {
+            doc["user_id"]: Standing(
+                doc["user_id"], doc.get("user_name", "Unknown"), doc.get("total_points", 0),
+                doc.get("games_won", 0), doc.get("games_played", 0)
+            )
+            for doc in docs
+        }
+        self.top = sorted(self.players.values(), key=Standing.rank_key)[:self.size]
+        self.counts = ScoreCounts.from_points(standing.points for standing in self.players.values())
+        self.version += 1
+
+    def update(self, user_id: int, name: str, points: int = 0, won: int = 0, played: int = 0):
+        """Add to a player's totals, ranking them if they reach the top"""
+        standing = self.players.get(user_id)
+        if standing is None:
+            standing = self.players[user_id] = Standing(user_id, name)
+            self.counts.add(0, 1)
+        if points:
+            self.counts.add(standing.points, -1)
+            self.counts.add(standing.points + points, 1)
+        renamed = standing.name != name
+        standing.name = name
+        standing.points += points
+        standing.won += won
+        standing.played += played
+
+        if standing in self.top:
+            if not (points or won or played or renamed):
+                return
+            if points:
+                self.top.sort(key=Standing.rank_key)
+        elif len(self.top) < self.size or standing.rank_key() < self.top[-1].rank_key():
+            self.top.append(standing)
+            self.top.sort(key=Standing.rank_key)
+            del self.top[self.size:]
+        else:
+            return
+        self.version += 1
+
+    def leaders(self, limit: int = TOP_SIZE) -> List[Standing]:
+        """Get the top players, most points first"""
+        return self.top[:limit]
+
+    def rank(self, user_id: int) -> Optional[Tuple[int, int]]:
+        """Get a player's global rank and the number of players ranked, or None for a player not yet seen"""
+        standing = self.players.get(user_id)
+        if standing is None:
+            return None
+        return self.counts.count_above(standing.points) + 1, self.counts.total
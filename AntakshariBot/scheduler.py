@@ -0,0 +1,124 @@
+"""
+Hashed timer wheel for game deadlines
+
+Every join window and turn limit runs on one wheel driven by a single asyncio
+task. A deadline is a (key, token) entry in the slot of the tick it expires on;
+rescheduling a key only stores a new token and appends to another slot, so it
+is O(1) and never creates or cancels a task. Superseded entries are skipped
+when their slot comes round.
+
+Only an expiring deadline starts a task, to run its callback.
+"""
+import asyncio
+import logging
+import math
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds per tick: deadlines fire at most this late
+TICK = 0.5
+
+# Slots in the wheel; deadlines further away than one revolution wait extra rounds
+SLOTS = 256
+
+
+class TimerWheel:
+    """Runs coroutine callbacks at per-key deadlines from one loop task"""
+
+    def __init__(self, tick: float = TICK, slots: int = SLOTS):
+        self.tick = tick
+        self.slots: List[List[Tuple[Hashable, int]]] = [[] for _ in range(slots)]
+        # Key -> (due tick, token, callback, args) of its pending deadline
+        self.timers: Dict[Hashable, Tuple[int, int, Callable[..., Awaitable[Any]], tuple]] = {}
+        self.token = 0
+        self.started_at: Optional[float] = None
+        self.processed = 0  # every tick up to this one has fired
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.running: Set[asyncio.Task] = set()  # fired callbacks, referenced until they finish
+
+    def __len__(self) -> int:
+        return len(self.timers)
+
+    def current_tick(self) -> int:
+        return int((asyncio.get_running_loop().time() - self.started_at) / self.tick)
+
+    def schedule(self, key: Hashable, delay: float, callback: Callable[..., Awaitable[Any]], *args):
+        """Run callback(*args) after delay seconds, replacing any pending deadline for key"""
+        loop = asyncio.get_running_loop()
+        if self.started_at is None:
+            self.started_at = loop.time()
+        if self.task is None or self.task.done():
+            self.task = loop.create_task(self.run())
+
+        now = self.current_tick()
+        if not self.timers:
+            # Nothing is pending, so every tick up to now is done; the run loop, which may still be waking
+            # from idle, catches up from here and reaches this deadline however late the loop gets to it
+            self.processed = max(self.processed, now)
+        due = now + max(1, math.ceil(delay / self.tick))
+        timer = self.timers.get(key)
+        if timer is not None and timer[0] == due:
+            # Same tick as the pending deadline: reuse its slot entry
+            self.timers[key] = (due, timer[1], callback, args)
+            return
+        self.token += 1
+        self.timers[key] = (due, self.token, callback, args)
+        self.slots[due % len(self.slots)].append((key, self.token))
+        self.wakeup.set()
+
+    def cancel(self, key: Hashable):
+        """Drop the pending deadline for key, if any"""
+        self.timers.pop(key, None)
+
+    async def run(self):
+        """Advance the wheel one tick at a time, firing due deadlines; idles while nothing is scheduled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self.timers:
+                self.wakeup.clear()
+                await self.wakeup.wait()
+
+            next_time = self.started_at + (self.processed + 1) * self.tick
+            await asyncio.sleep(max(0.0, next_time - loop.time()))
+
+            # Catch up on every tick that has passed, in case the loop was busy
+            now = self.current_tick()
+            while self.processed < now:
+                self.processed += 1
+                self.fire(self.processed)
+
+    def fire(self, tick: int):
+        """Run the callbacks due on a tick and carry later rounds over"""
+        position = tick % len(self.slots)
+        entries, self.slots[position] = self.slots[position], []
+        for key, token in entries:
+            timer = self.timers.get(key)
+            if timer is None or timer[1] != token:
+                continue  # cancelled or rescheduled
+            due, _, callback, args = timer
+            if due > tick:
+                self.slots[position].append((key, token))  # due on a later revolution
+                continue
+            del self.timers[key]
+            task = asyncio.get_running_loop().create_task(self.call(key, callback, args))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+    async def call(self, key: Hashable, callback: Callable[..., Awaitable[Any]], args: tuple):
+        try:
+            await callback(*args)
+        except Exception as e:
+            logger.error(f"Error in timer callback for {key}: {e}")
+
+    async def stop(self):
+        """Stop the wheel and drop every pending deadline"""
+        self.timers.clear()
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
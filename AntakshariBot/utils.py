@@ -1,37 +1,86 @@
 import logging
-from AntakshariBot.database import db
+from typing import Dict, Iterable, Optional, Tuple
+from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from AntakshariBot.database import GLOBAL_CHAT, db
+from AntakshariBot.data.data_loader import data_loader
+from AntakshariBot.data.normalize import fold_word
 
 logger = logging.getLogger(__name__)
 
-async def format_leaderboard(limit: int = 10) -> str:
-    """Format leaderboard for display"""
+# Names per page of /countries and /cities
+WORDS_PER_PAGE = 20
+
+# Telegram limits callback data to 64 bytes, so long prefixes are cut short
+MAX_PREFIX_BYTES = 40
+
+# Theme listed by each command, with its emoji and heading
+WORD_LISTS = {
+    "countries": ("🌍", "Countries"),
+    "cities": ("🏙️", "Cities")
+}
+
+# Rendered leaderboards by limit, with the leaderboard version they show
+leaderboard_texts: Dict[int, Tuple[int, str]] = {}
+
+# Headings of the windowed leaderboards by (this chat only, period)
+BUCKET_TITLES = {
+    (True, "all"): "Group Leaderboard",
+    (True, "week"): "This Week in This Group",
+    (True, "day"): "Today in This Group",
+    (False, "week"): "This Week's Leaderboard",
+    (False, "day"): "Today's Leaderboard"
+}
+
+def render_leaderboard(title: str, rows: Iterable[Tuple[str, int, int, int]]) -> str:
+    """Render ranked (name, points, wins, games) rows under a heading"""
+    lines = [f"🏆 **{title}**\n"]
+    
+    for i, (name, points, games_won, games_played) in enumerate(rows, 1):
+        emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}️⃣"
+        
+        win_rate = (games_won / max(games_played, 1)) * 100
+        
+        lines.append(f"{emoji} **{name}**")
+        lines.append(f"   💯 {points} points | 🏆 {games_won} wins | 📊 {win_rate:.1f}%\n")
+    
+    if len(lines) == 1:
+        return lines[0] + "\nNo players yet! Be the first to play!"
+    return "\n".join(lines) + "\n"
+
+def format_leaderboard(limit: int = 10) -> str:
+    """Format leaderboard for display, reusing the last rendering until the ranking changes"""
     try:
-        leaderboard = await db.get_leaderboard(limit)
-        
-        if not leaderboard:
-            return "🏆 **Global Leaderboard**\n\nNo players yet! Be the first to play!"
-        
-        text = "🏆 **Global Leaderboard**\n\n"
-        
-        for i, player in enumerate(leaderboard, 1):
-            emoji = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}️⃣"
-            
-            name = player.get("user_name", "Unknown")
-            points = player.get("total_points", 0)
-            games_won = player.get("games_won", 0)
-            games_played = player.get("games_played", 0)
-            
-            win_rate = (games_won / max(games_played, 1)) * 100
-            
-            text += f"{emoji} **{name}**\n"
-            text += f"   💯 {points} points | 🏆 {games_won} wins | 📊 {win_rate:.1f}%\n\n"
+        version = db.leaderboard.version
+        cached = leaderboard_texts.get(limit)
+        if cached is not None and cached[0] == version:
+            return cached[1]
         
+        leaderboard = db.get_leaderboard(limit)
+        text = render_leaderboard(
+            "Global Leaderboard",
+            ((player.name, player.points, player.won, player.played) for player in leaderboard)
+        )
+        leaderboard_texts[limit] = (version, text)
         return text
         
     except Exception as e:
         logger.error(f"Error formatting leaderboard: {e}")
         return "❌ Error loading leaderboard. Please try again."
 
+async def format_bucket_leaderboard(chat_id: int, period: str, group: bool, limit: int = 10) -> str:
+    """Format this chat's or every chat's leaderboard for the current week or day, or this chat's for all time"""
+    try:
+        leaderboard = await db.get_bucket_leaderboard(chat_id if group else GLOBAL_CHAT, period, limit)
+        return render_leaderboard(
+            BUCKET_TITLES[group, period],
+            ((player.get("user_name", "Unknown"), player.get("points", 0), player.get("games_won", 0),
+              player.get("games_played", 0)) for player in leaderboard)
+        )
+        
+    except Exception as e:
+        logger.error(f"Error formatting leaderboard: {e}")
+        return "❌ Error loading leaderboard. Please try again."
+
 async def get_user_stats(user_id: int) -> dict:
     """Get user statistics"""
     try:
@@ -51,11 +100,55 @@ async def format_game_history(chat_id: int) -> str:
         if stats['recent_games']:
             text += "📈 **Recent Games:**\n"
             for game in stats['recent_games']:
-                winner = max(game.get('players', []), key=lambda p: p.get('score', 0), default={'name': 'Unknown', 'score': 0})
-                text += f"• Winner: {winner['name']} ({winner['score']} pts)\n"
+                text += f"• Winner: {game['winner_name']} ({game['winner_score']} pts)\n"
         
         return text
         
     except Exception as e:
         logger.error(f"Error formatting game history: {e}")
         return "❌ Error loading game history."
+
+def format_word_page(kind: str, prefix: str = "", page: int = 0) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
+    """Format one page of the sorted country or city list, optionally filtered by a letter or prefix"""
+    try:
+        emoji, heading = WORD_LISTS[kind]
+        index = data_loader.index
+        theme = index.themes[kind]
+        
+        # Cut the prefix to fit the page buttons' callback data
+        key = fold_word(prefix)
+        while len(key.encode("utf-8")) > MAX_PREFIX_BYTES:
+            key = key[:-1]
+        
+        # The theme's IDs are sorted by key: a prefix is one bisected range and a page a window of it
+        low, high = index.prefix_range(key)
+        low, high = theme.id_range(low, high)
+        total = high - low
+        pages = max(1, -(-total // WORDS_PER_PAGE))
+        page = min(max(page, 0), pages - 1)
+        first = low + page * WORDS_PER_PAGE
+        last = min(first + WORDS_PER_PAGE, high)
+        
+        title = f"{emoji} **Available {heading}**"
+        if key:
+            title += f" starting with \"{key.title()}\""
+        
+        if not total:
+            return f"{title}\n\nNo matches found.", None
+        
+        text = f"{title} ({first - low + 1}-{last - low} of {total:,}):\n\n"
+        for position in range(first, last):
+            text += f"{position - low + 1}. {index.names[theme.ids[position]].title()}\n"
+        text += f"\n📄 Page {page + 1} of {pages:,}"
+        
+        buttons = []
+        if page > 0:
+            buttons.append(InlineKeyboardButton("⬅️ Previous", callback_data=f"list_{kind}_{page - 1}_{key}"))
+        if page < pages - 1:
+            buttons.append(InlineKeyboardButton("Next ➡️", callback_data=f"list_{kind}_{page + 1}_{key}"))
+        
+        return text, InlineKeyboardMarkup([buttons]) if buttons else None
+        
+    except Exception as e:
+        logger.error(f"Error formatting word list: {e}")
+        return "❌ Error loading word list.", None
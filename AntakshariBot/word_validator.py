@@ -1,12 +1,18 @@
 import logging
-from typing import Set
+import re
+from typing import Container
 from AntakshariBot.data.data_loader import data_loader
+from AntakshariBot.data.normalize import fold_word
+from AntakshariBot.data.word_index import DEFAULT_THEME, RARE, Theme, WordIndex, build_index
 
 logger = logging.getLogger(__name__)
 
+# Anything other than letters, spaces, hyphens and apostrophes
+_NON_LETTERS = re.compile(r"[^\w\s\-'`\u2018\u2019]|[\d_]")
+
 class WordValidator:
     def __init__(self):
-        self.valid_words = set()
+        self.index: WordIndex = data_loader.index
         self.data_ready = False
     
     async def ensure_data_loaded(self):
@@ -16,65 +22,105 @@ class WordValidator:
             success = await data_loader.load_all_data()
             if not success:
                 logger.error("Failed to load word data from JSON file")
-                # Fallback to basic words if data loading fails
-                self.valid_words = {
-                    "india", "america", "china", "japan", "france", "germany", "italy", "spain",
-                    "london", "paris", "tokyo", "delhi", "mumbai", "sydney", "berlin", "rome"
-                }
+                # Fallback to basic words if data loading fails; the data loader serves the same index
+                # so game stats and listings agree with validation
+                self.index = data_loader.index = build_index(
+                    ("india", "america", "china", "japan", "france", "germany", "italy", "spain"),
+                    ("london", "paris", "tokyo", "delhi", "mumbai", "sydney", "berlin", "rome"),
+                    ()
+                )
                 return False
             
-        self.valid_words = data_loader.get_all_words()
+        self.index = data_loader.index
         self.data_ready = True
-        logger.info(f"Word validator ready with {len(self.valid_words)} words")
+        logger.info(f"Word validator ready with {len(self.index)} words")
         return True
     
-    async def validate_word(self, word: str, required_letter: str, used_words: Set[str]) -> dict:
-        """Validate a submitted word"""
+    async def validate_word(self, word: str, required_letter: str, used_words: Container[int], theme: str = DEFAULT_THEME) -> dict:
+        """Validate a submitted word against the game's theme and the alias class IDs already used in it"""
         try:
             # Ensure data is loaded
             if not self.data_ready:
                 await self.ensure_data_loaded()
             
-            word_clean = word.lower().strip()
-            
-            # Check if word is empty
-            if not word_clean:
-                return {"valid": False, "reason": "Please enter a word!"}
+            # A single probe on the folded key covers case, accents and punctuation
+            index = self.index
+            game_theme = index.get_theme(theme)
+            key = fold_word(word)
+            word_id = index.lookup(key)
             
-            # Check if word contains only letters and spaces/hyphens/apostrophes
-            if not all(c.isalpha() or c in [' ', '-', "'"] for c in word_clean):
-                return {"valid": False, "reason": "Word must contain only letters!"}
-            
-            # Check minimum length
-            if len(word_clean.replace(' ', '').replace('-', '').replace("'", '')) < 2:
-                return {"valid": False, "reason": "Word must be at least 2 letters long!"}
+            if word_id is None:
+                return {"valid": False, "reason": self.rejection_reason(word, key, required_letter, used_words, game_theme)}
             
             # Check if word starts with required letter
-            if required_letter and word_clean[0] != required_letter.lower():
+            if required_letter and key[0] != required_letter.lower():
                 return {"valid": False, "reason": f"Word must start with '{required_letter.upper()}'!"}
             
-            # Check if word was already used
-            if word_clean in used_words:
-                return {"valid": False, "reason": "This word has already been used!"}
-            
-            # Check alternative names
-            alternative_word = data_loader.get_alternative_name(word_clean)
-            if alternative_word != word_clean and alternative_word in used_words:
-                return {"valid": False, "reason": f"This word has already been used as '{alternative_word.title()}'!"}
+            # Themed games check membership in the theme's precomputed word set
+            if not game_theme.contains(word_id):
+                return {"valid": False, "reason": self.theme_reason(key, required_letter, used_words, game_theme)}
             
-            # Check if word is valid (country or city)
-            if word_clean not in self.valid_words and alternative_word not in self.valid_words:
-                return {"valid": False, "reason": "Invalid word! Only country and city names are allowed."}
+            # Check if the word, or any alternative name of the same place, was already used
+            class_id = index.class_of[word_id]
+            if class_id in used_words:
+                members = index.members(class_id)
+                if len(members) == 1:
+                    return {"valid": False, "reason": "This word has already been used!"}
+                known_as = " / ".join(index.names[member].title() for member in members)
+                return {"valid": False, "reason": f"This place has already been used! ({known_as})"}
             
-            # Check if it's a rare word (bonus points)
-            is_rare = data_loader.is_rare_word(word_clean) or data_loader.is_rare_word(alternative_word)
-            
-            return {"valid": True, "rare": is_rare}
+            return {
+                "valid": True,
+                "rare": index.has_flag(word_id, RARE),
+                "difficulty": index.difficulty[word_id],
+                "word": index.names[word_id],
+                "class_id": class_id,
+                "key": key,
+                "next_letter": key[-1]
+            }
             
         except Exception as e:
             logger.error(f"Error validating word: {e}")
             return {"valid": False, "reason": "An error occurred while validating the word."}
     
+    def rejection_reason(self, word: str, key: str, required_letter: str, used_words: Container[int],
+                         theme: Theme) -> str:
+        """Explain why a word that is not in the dictionary was rejected"""
+        # Check if word is empty
+        if not word.strip():
+            return "Please enter a word!"
+        
+        # Check if word contains only letters and spaces/hyphens/apostrophes
+        if _NON_LETTERS.search(word):
+            return "Word must contain only letters!"
+        
+        # Check minimum length
+        if len(key.replace(' ', '')) < 2:
+            return "Word must be at least 2 letters long!"
+        
+        # Check if word starts with required letter
+        if required_letter and key[0] != required_letter.lower():
+            return f"Word must start with '{required_letter.upper()}'!"
+        
+        return self.with_suggestions("Invalid word! Only country and city names are allowed.",
+                                     key, required_letter, used_words, theme)
+    
+    def theme_reason(self, key: str, required_letter: str, used_words: Container[int], theme: Theme) -> str:
+        """Explain why a valid word outside the game's theme was rejected"""
+        return self.with_suggestions(f"Not part of this game's theme: {theme.title}!",
+                                     key, required_letter, used_words, theme)
+    
+    def with_suggestions(self, reason: str, key: str, required_letter: str, used_words: Container[int],
+                         theme: Theme) -> str:
+        """Append the closest unused names in the theme for the required letter to a rejection reason"""
+        # The prebuilt fuzzy index finds the candidates, the theme only filters the few it returns
+        suggestions = self.index.suggest(key, required_letter.lower() if required_letter else "", used_words,
+                                         theme=None if theme.key == DEFAULT_THEME else theme)
+        if suggestions:
+            reason += f"\n💡 Did you mean: {', '.join(name.title() for name in suggestions)}?"
+        
+        return reason
+    
     async def get_word_count(self) -> dict:
         """Get statistics about loaded words"""
         if not self.data_ready:
@@ -85,13 +131,11 @@ class WordValidator:
     async def refresh_data(self) -> bool:
         """Refresh word data from JSON file"""
         try:
-            # Clear current data
-            data_loader.data_loaded = False
-            
-            # Reload from JSON
+            # The current index stays live while the new one is built off the event loop,
+            # then both data_loader and the validator switch to it in one assignment each
             success = await data_loader.load_all_data()
             if success:
-                self.valid_words = data_loader.get_all_words()
+                self.index = data_loader.index
                 self.data_ready = True
             return success
         except Exception as e:
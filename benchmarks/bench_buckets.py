@@ -0,0 +1,73 @@
+"""
+Write cost of the score buckets behind /leaderboard week, day and group
+
+Ends 1,000 games of 20 players in 50 chats, flushing after every game as
+GameManager.end_game does, and counts the requests and upserts that reach the
+score_buckets collection and the documents it ends up holding. Each windowed
+/leaderboard is then one find on the (chat_id, period, bucket, points) index
+returning at most 10 documents, where aggregating game_history would read
+every game the chat finished in the window. Nothing connects to MongoDB.
+
+Run from the repository root:
+    python benchmarks/bench_buckets.py
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AntakshariBot.database import Database
+
+GAMES = 1_000
+PLAYERS = 20
+CHATS = 50
+
+
+class CountingCollection:
+    def __init__(self):
+        self.requests = 0
+        self.upserts = 0
+        self.documents = set()
+
+    async def bulk_write(self, operations, ordered=True):
+        self.requests += 1
+        self.upserts += len(operations)
+        # Every filter also excludes documents that already have the flush's ID
+        self.documents.update(
+            tuple(value for field, value in operation._filter.items() if field != "flushes") for operation in operations
+        )
+
+
+class CountingDB:
+    def __init__(self):
+        self.score_buckets = CountingCollection()
+
+
+async def main():
+    rng = random.Random(7)
+    database = Database()
+    database.db = CountingDB()
+    queueing = 0.0
+    started = time.perf_counter()
+    for game in range(GAMES):
+        chat_id = -(game % CHATS) - 1
+        players = rng.sample(range(CHATS * PLAYERS * 2), PLAYERS)
+        queue_started = time.perf_counter()
+        for user_id in players:
+            database.update_score_buckets(chat_id, user_id, f"Player {user_id}", rng.randint(0, 100), user_id == players[0])
+        queueing += time.perf_counter() - queue_started
+        await database.flush_score_buckets()
+    elapsed = time.perf_counter() - started
+
+    collection = database.db.score_buckets
+    print(f"{collection.requests:,} requests | {collection.upserts / GAMES:.0f} upserts per game | "
+          f"{len(collection.documents):,} bucket documents for {GAMES * PLAYERS:,} results")
+    print(f"queue {queueing / (GAMES * PLAYERS) * 1e6:.1f} us per player | "
+          f"queue and flush {elapsed / GAMES * 1e6:.0f} us CPU per game")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
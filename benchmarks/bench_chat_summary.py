@@ -0,0 +1,68 @@
+"""
+Reads behind /gamestats history: game_history queries versus the chat summary
+
+Builds a chat with 2,000 finished games of 20 players each and compares what
+one history view reads. The old path is count_documents over the chat's
+history, which walks an index entry per game, plus a sorted find returning the
+5 latest whole games, with each winner found by max() over the players. The
+new path reads the chat's one summary document. Sizes are BSON bytes; nothing
+connects to MongoDB.
+
+Run from the repository root:
+    python benchmarks/bench_chat_summary.py
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bson
+from AntakshariBot.database import RECENT_GAMES, game_result
+from AntakshariBot.game_state import ACTIVE, GameState
+
+GAMES = 2_000
+PLAYERS = 20
+CALLS = 10_000
+# Folded keys for the class IDs the games use
+KEYS = [f"place {class_id:04d}" for class_id in range(5_000)]
+
+
+def history(rng: random.Random) -> list:
+    games = []
+    for number in range(GAMES):
+        game = GameState(-1, 1, "all", 0, KEYS)
+        for user_id in range(1, PLAYERS + 1):
+            game.add_player(user_id, f"Player {user_id}")
+            game.players[user_id].score = rng.randint(0, 120)
+        for class_id in rng.sample(range(len(KEYS)), 40):
+            game.used_words.add(class_id)
+        game.status = ACTIVE
+        doc = game.to_doc()
+        doc["end_time"] = datetime(2026, 1, 1) + timedelta(minutes=number)
+        doc["status"] = "completed"
+        games.append(doc)
+    return games
+
+
+def main():
+    games = history(random.Random(7))
+    recent = sorted(games, key=lambda game: game["end_time"], reverse=True)[:RECENT_GAMES]
+    summary = {"chat_id": -1, "total_games": GAMES, "recent_games": [game_result(game) for game in recent]}
+
+    old_bytes = sum(len(bson.encode(game)) for game in recent)
+    new_bytes = len(bson.encode(summary))
+    print(f"  history queries: 2 requests | {GAMES:,} index entries counted | {old_bytes:,} B returned")
+    print(f"    chat summary: 1 request | 1 document read | {new_bytes:,} B returned")
+
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        [max(game["players"], key=lambda p: p.get("score", 0)) for game in recent]
+    winners = time.perf_counter() - started
+    print(f"  winners by max(): {winners / CALLS * 1e6:.1f} us per view, now precomputed at game end")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Cost of group chatter reaching the game handler, with and without the expected-speaker filter
+
+Replays non-command text messages through the handlers the bot registers, the
+same way pyrogram's dispatcher does: in every handler group, check each
+handler's filters and await the first match, until a handler stops propagation.
+Nothing connects to Telegram or MongoDB: no message here is from the player
+whose turn it is, so the game handler never replies or writes.
+
+The old layout is the game handler without the expected-speaker filter,
+registered among the command handlers as before.
+
+Run from the repository root:
+    python benchmarks/bench_dispatch.py
+"""
+import asyncio
+from pyrogram import StopPropagation
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pyrogram import filters
+from pyrogram.enums import ChatType
+from pyrogram.handlers import MessageHandler
+from pyrogram.types import Chat, Message, User
+from AntakshariBot.bot import COMMANDS, AntakshariBot
+from AntakshariBot.game_state import ACTIVE, GameState
+
+MESSAGES = 100_000
+CHATS = 2_000
+GAMES = 500
+
+
+async def dispatch(client, groups, message, game_handler) -> bool:
+    """Run the first matching handler of every group, like pyrogram's handler_worker; True if the game handler ran"""
+    ran_game_handler = False
+    try:
+        for group in groups:
+            for handler in group:
+                if await handler.check(client, message):
+                    ran_game_handler |= handler.callback is game_handler.callback
+                    await handler.callback(client, message)
+                    break
+    except StopPropagation:
+        pass
+    return ran_game_handler
+
+
+async def replay(client, groups, messages, game_handler) -> tuple:
+    started = time.perf_counter()
+    handled = 0
+    for message in messages:
+        handled += await dispatch(client, groups, message, game_handler)
+    return time.perf_counter() - started, handled
+
+
+async def main():
+    bot = AntakshariBot()
+    await asyncio.sleep(0.1)  # handlers are added to the dispatcher by tasks
+    client = bot.app
+    client.me = User(id=1, username="bench_bot")
+    groups = [[handler for handler in group if isinstance(handler, MessageHandler)]
+              for _, group in sorted(client.dispatcher.groups.items())]
+
+    # Half the chats have a running game between two players
+    manager = bot.game_manager
+    for chat_id in range(-GAMES, 0):
+        game = GameState(chat_id, 1000, "all", time.time())
+        game.add_player(1000, "A")
+        game.add_player(1001, "B")
+        game.status, game.next_letter = ACTIVE, "a"
+        manager.active_games[chat_id] = game
+        manager.sync_expected_speaker(chat_id)
+
+    # Chatter: other users in game chats and anyone in chats without a game
+    rng = random.Random(7)
+    messages = [
+        Message(id=i, chat=Chat(id=-rng.randrange(1, CHATS + 1), type=ChatType.SUPERGROUP),
+                from_user=User(id=rng.randrange(2000, 100_000)), text="anyone up for lunch?")
+        for i in range(MESSAGES)
+    ]
+
+    # The old layout: the unfiltered game handler right after /endgame among the command handlers
+    game_handler = next(handler for group in groups for handler in group
+                        if handler.callback.__name__ == "handle_game_message")
+    commands = groups[-1]
+    position = next(i for i, handler in enumerate(commands) if handler.callback.__name__ == "end_game") + 1
+    old_handler = MessageHandler(game_handler.callback, filters.text & filters.group & ~filters.command(COMMANDS))
+    old_groups = [commands[:position] + [old_handler] + commands[position:]]
+
+    for label, layout in (("without filter", old_groups), ("with filter", groups)):
+        elapsed, handled = await replay(client, layout, messages, game_handler)
+        print(f"{label:>15}: {MESSAGES / elapsed:>9,.0f} msg/s | {elapsed / MESSAGES * 1e6:5.1f} us/msg | "
+              f"game handler ran {handled:,} times")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
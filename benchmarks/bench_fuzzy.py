@@ -0,0 +1,60 @@
+"""
+Latency of "did you mean" suggestions over the full dictionary
+
+Run from the repository root:
+    python benchmarks/bench_fuzzy.py
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AntakshariBot.data.data_loader import DataLoader
+
+QUERIES = 5000
+
+
+def make_typo(key: str, rng: random.Random) -> str:
+    position = rng.randrange(len(key))
+    kind = rng.choice(("substitute", "delete", "insert", "transpose"))
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    if kind == "substitute":
+        return key[:position] + letter + key[position + 1:]
+    if kind == "delete" and len(key) > 3:
+        return key[:position] + key[position + 1:]
+    if kind == "transpose" and position < len(key) - 1:
+        return key[:position] + key[position + 1] + key[position] + key[position + 2:]
+    return key[:position] + letter + key[position:]
+
+
+async def main():
+    loader = DataLoader()
+    assert await loader.load_data_from_json()
+    index = loader.index
+    rng = random.Random(42)
+
+    timings, hits = [], 0
+    for _ in range(QUERIES):
+        word_id = rng.randrange(len(index))
+        key = index.keys[word_id]
+        typo = make_typo(key, rng)
+        started = time.perf_counter()
+        suggestions = index.suggest(typo, key[0])
+        timings.append(time.perf_counter() - started)
+        hits += index.names[word_id] in suggestions
+
+    timings.sort()
+    print(f"{len(index):,} words, {len(index.fuzzy.entries):,} fuzzy entries "
+          f"({len(index.fuzzy.entries) * 8 / 2**20:.1f} MiB)")
+    print(f"suggest: median {statistics.median(timings) * 1e6:.0f} us | "
+          f"p95 {timings[int(len(timings) * 0.95)] * 1e6:.0f} us | "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1e6:.0f} us")
+    print(f"original word among suggestions: {hits / QUERIES:.1%}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
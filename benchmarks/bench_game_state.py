@@ -0,0 +1,146 @@
+"""
+Memory and latency of in-memory games: the old dicts of player dicts versus GameState
+
+Builds 10,000 games of 20 players, then plays them the way GameManager does:
+every player joins with a duplicate check, turns pass around the table, and
+players are eliminated from random seats until one is left. The dict version
+is the old layout with its linear scans and index fixups.
+
+Run from the repository root:
+    python benchmarks/bench_game_state.py
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AntakshariBot.game_state import ACTIVE, GameState
+
+GAMES = 10_000
+PLAYERS = 20
+TURNS = 40  # turns per game before the eliminations
+
+
+class DictGames:
+    """The old layout: a dict per game holding a list of player dicts"""
+
+    @staticmethod
+    def create(chat_id: int, user_id: int) -> dict:
+        return {
+            "chat_id": chat_id, "status": "joining", "turn": 0,
+            "players": [{"id": user_id, "name": f"user{user_id}", "score": 0, "streak": 0}],
+            "current_player": 0, "last_word": "", "next_letter": "", "used_words": set(),
+            "round": 0, "max_rounds": 50, "theme": "all", "start_time": time.time(), "creator": user_id,
+            "letter_counts": {}
+        }
+
+    @staticmethod
+    def join(game: dict, user_id: int) -> bool:
+        for player in game["players"]:
+            if player["id"] == user_id:
+                return False
+        game["players"].append({"id": user_id, "name": f"user{user_id}", "score": 0, "streak": 0})
+        return True
+
+    @staticmethod
+    def next_turn(game: dict):
+        game["current_player"] = (game["current_player"] + 1) % len(game["players"])
+        game["players"][game["current_player"]]["score"] += 10
+
+    @staticmethod
+    def eliminate(game: dict, user_id: int):
+        for i, player in enumerate(game["players"]):
+            if player["id"] == user_id:
+                game["players"].pop(i)
+                if i < game["current_player"]:
+                    game["current_player"] -= 1
+                game["current_player"] %= max(1, len(game["players"]))
+                return
+
+
+class SlottedGames:
+    @staticmethod
+    def create(chat_id: int, user_id: int) -> GameState:
+        game = GameState(chat_id, user_id, "all", time.time())
+        game.add_player(user_id, f"user{user_id}")
+        return game
+
+    @staticmethod
+    def join(game: GameState, user_id: int) -> bool:
+        if user_id in game.players:
+            return False
+        game.add_player(user_id, f"user{user_id}")
+        return True
+
+    @staticmethod
+    def next_turn(game: GameState):
+        game.advance().score += 10
+
+    @staticmethod
+    def eliminate(game: GameState, user_id: int):
+        game.remove_player(user_id)
+
+
+def build(layout) -> dict:
+    games = {}
+    for chat_id in range(GAMES):
+        first = chat_id * PLAYERS
+        games[chat_id] = layout.create(chat_id, first)
+        for user_id in range(first + 1, first + PLAYERS):
+            layout.join(games[chat_id], user_id)
+    return games
+
+
+def play(layout, games: dict, eliminations: list) -> tuple:
+    """Time turns and eliminations; returns (seconds per turn, seconds per elimination)"""
+    started = time.perf_counter()
+    for _ in range(TURNS):
+        for game in games.values():
+            layout.next_turn(game)
+    turns = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for chat_id, order in enumerate(eliminations):
+        game = games[chat_id]
+        for user_id in order:
+            layout.eliminate(game, user_id)
+    eliminated = time.perf_counter() - started
+    return turns / (TURNS * GAMES), eliminated / (GAMES * (PLAYERS - 1))
+
+
+def main():
+    rng = random.Random(7)
+    eliminations = []
+    for chat_id in range(GAMES):
+        order = list(range(chat_id * PLAYERS, (chat_id + 1) * PLAYERS))
+        rng.shuffle(order)
+        eliminations.append(order[:-1])
+
+    for label, layout in (("dicts", DictGames), ("GameState", SlottedGames)):
+        tracemalloc.start()
+        games = build(layout)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del games
+
+        started = time.perf_counter()
+        games = build(layout)
+        joined = (time.perf_counter() - started) / (GAMES * PLAYERS)
+        turn, eliminate = play(layout, games, eliminations)
+        print(f"{label:>9}: {size / 2**20:6.1f} MiB for {GAMES:,} games x {PLAYERS} players | "
+              f"join {joined * 1e6:5.2f} us | turn {turn * 1e6:5.2f} us | eliminate {eliminate * 1e6:5.2f} us")
+
+    # Serialization round trip to the games collection document
+    game = build(SlottedGames)[0]
+    game.status = ACTIVE
+    game.advance()
+    game.remove_player(game.current.id)
+    doc = game.to_doc()
+    assert GameState.from_doc(doc, game.start_time, lambda key: None).to_doc() == doc  # no words used
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Game state writes per accepted word: a full $set awaited per word versus write-behind deltas
+
+Plays 1,000 games of 20 players for 50 words each, every game making one move
+per flush interval, and records what reaches the games collection. The old
+path is one update_one per word carrying the whole document; the new one is
+Database.update_game plus one flush per interval. The collection only counts
+requests and BSON bytes, nothing connects to MongoDB.
+
+Run from the repository root:
+    python benchmarks/bench_game_writes.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bson
+from datetime import datetime
+from AntakshariBot.database import Database
+from AntakshariBot.game_state import ACTIVE, GameState
+
+GAMES = 1_000
+PLAYERS = 20
+WORDS = 50
+# Folded keys for the class IDs the games use, WORDS per game
+KEYS = [f"place {class_id:06d}" for class_id in range(GAMES * WORDS)]
+
+
+class CountingCollection:
+    """Counts requests, operations and update bytes sent to a collection"""
+
+    def __init__(self):
+        self.requests = 0
+        self.operations = 0
+        self.bytes = 0
+
+    async def update_one(self, filter, update):
+        self.requests += 1
+        self.operations += 1
+        self.bytes += len(bson.encode(filter)) + len(bson.encode(update))
+
+    async def bulk_write(self, operations, ordered=True):
+        self.requests += 1
+        for operation in operations:
+            self.operations += 1
+            self.bytes += len(bson.encode(operation._filter)) + len(bson.encode(operation._doc))
+
+
+class CountingDB:
+    def __init__(self):
+        self.games = CountingCollection()
+
+
+def new_games() -> list:
+    games = []
+    for chat_id in range(GAMES):
+        game = GameState(chat_id, chat_id * PLAYERS, "all", time.time(), KEYS)
+        for user_id in range(chat_id * PLAYERS, (chat_id + 1) * PLAYERS):
+            game.add_player(user_id, f"Player {user_id}")
+        game.status, game.round = ACTIVE, 1
+        games.append(game)
+    return games
+
+
+def play_word(game: GameState, word: int):
+    """Apply an accepted word the way GameManager.process_word does"""
+    player = game.current
+    player.streak += 1
+    player.score += 10 + player.streak - 1
+    game.used_words.add(game.chat_id * WORDS + word)
+    game.last_word = f"Place {word}"
+    game.next_letter = "abcdefghijklmnopqrstuvwxyz"[word % 26]
+    game.advance()
+    game.round += 1
+
+
+async def full_writes() -> CountingCollection:
+    collection = CountingCollection()
+    games = new_games()
+    for word in range(WORDS):
+        for game in games:
+            play_word(game, word)
+            update = game.to_doc()
+            update["updated_time"] = datetime.utcnow()
+            await collection.update_one({"chat_id": game.chat_id}, {"$set": update})
+    return collection
+
+
+async def write_behind() -> CountingCollection:
+    database = Database()
+    database.db = CountingDB()
+    games = new_games()
+    for game in games:
+        database.create_game(game)
+    await database.flush_games()
+    database.db.games = CountingCollection()  # count the per-word writes only
+
+    for word in range(WORDS):
+        for game in games:
+            play_word(game, word)
+            database.update_game(game)
+        await database.flush_games()
+    return database.db.games
+
+
+async def main():
+    words = GAMES * WORDS
+    for label, run in (("full $set per word", full_writes), ("write-behind deltas", write_behind)):
+        started = time.perf_counter()
+        collection = await run()
+        elapsed = time.perf_counter() - started
+        print(f"{label:>19}: {collection.requests:>6,} requests | {collection.operations:>6,} updates | "
+              f"{collection.bytes / words:6.0f} B per word | {elapsed / words * 1e6:5.1f} us CPU per word")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
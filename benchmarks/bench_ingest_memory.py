@@ -0,0 +1,47 @@
+"""
+Peak memory of building the word data: whole-file json.load vs streaming ingestion
+
+Run from the repository root:
+    python benchmarks/bench_ingest_memory.py
+"""
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AntakshariBot.data.data_loader import DataLoader
+
+
+def legacy_build(loader: DataLoader) -> dict:
+    """The pre-streaming path: json.load the whole file, then build the same index from it"""
+    with open(loader.json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return loader.build_payload(data)
+
+
+def measure(label: str, build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} peak {peak / 2**20:7.1f} MiB | retained {retained / 2**20:6.1f} MiB | "
+          f"peak/retained {peak / retained:4.2f} | {elapsed:.2f}s")
+    return result
+
+
+def main():
+    loader = DataLoader()
+    legacy = measure("json.load + build", lambda: legacy_build(loader))
+    streamed = measure("streaming build", loader.build_payload)
+    assert legacy == streamed
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Cost of the local game journal: appending each flush's entries, replaying it at startup and compacting it
+
+Journals 5,000 games of 20 players through 9 words each, one flush per word
+round as Database.write_games would, then replays the file at its longest
+before compaction (COMPACT_RATIO lines per game) and once compacted.
+
+Run from the repository root:
+    python benchmarks/bench_journal.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AntakshariBot.database import game_changes
+from AntakshariBot.game_state import ACTIVE, GameState
+from AntakshariBot.journal import COMPACT_RATIO, GameJournal
+
+GAMES = 5_000
+PLAYERS = 20
+WORDS = COMPACT_RATIO - 1  # the most lines per game an uncompacted journal holds
+# Folded keys for the class IDs the games use, WORDS per game
+KEYS = [f"place {class_id:06d}" for class_id in range(GAMES * WORDS)]
+
+
+def new_games() -> list:
+    games = []
+    for chat_id in range(GAMES):
+        game = GameState(chat_id, chat_id * PLAYERS, "all", time.time(), KEYS)
+        for user_id in range(chat_id * PLAYERS, (chat_id + 1) * PLAYERS):
+            game.add_player(user_id, f"Player {user_id}")
+        game.status, game.round = ACTIVE, 1
+        games.append(game)
+    return games
+
+
+def play_word(game: GameState, word: int):
+    player = game.current
+    player.streak += 1
+    player.score += 10 + player.streak - 1
+    game.used_words.add(game.chat_id * WORDS + word)
+    game.last_word = f"Place {word}"
+    game.next_letter = "abcdefghijklmnopqrstuvwxyz"[word % 26]
+    game.advance()
+    game.round += 1
+    game.deadline = time.time() + 30
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "games.jsonl")
+        journal = GameJournal(path, compact_lines=10**9)
+        games = new_games()
+        written = {}
+        for game in games:
+            written[game.chat_id] = game.to_doc()
+            journal.write_game(written[game.chat_id])
+        journal.flush()
+
+        appending = 0.0
+        for word in range(WORDS):
+            for game in games:
+                play_word(game, word)
+                doc = game.to_doc()
+                changes = game_changes(written[game.chat_id], doc)
+                written[game.chat_id] = doc
+                started = time.perf_counter()
+                journal.write_changes(game.chat_id, changes)
+                appending += time.perf_counter() - started
+            started = time.perf_counter()
+            journal.flush()
+            appending += time.perf_counter() - started
+        journal.close()
+        size = os.path.getsize(path)
+
+        for label in ("longest", "compacted"):
+            replay = GameJournal(path)
+            started = time.perf_counter()
+            docs = replay.load()  # compacts after replaying
+            elapsed = time.perf_counter() - started
+            assert len(docs) == GAMES and {doc["chat_id"]: doc for doc in docs} == written
+            print(f"{label:>11}: {size / 2**20:6.1f} MiB | replay and compact {elapsed * 1e3:5.0f} ms "
+                  f"for {GAMES:,} games")
+            size = os.path.getsize(path)
+
+        print(f"    append: {appending / (GAMES * WORDS) * 1e6:.1f} us per journaled word")
+
+
+if __name__ == "__main__":
+    main()
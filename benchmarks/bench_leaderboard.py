@@ -0,0 +1,78 @@
+"""
+Cost of the in-memory leaderboard: seeding it, keeping it current and serving /leaderboard
+
+Seeds the leaderboard with 100,000 player_stats documents as
+Database.load_leaderboard would, applies a stream of statistics changes the
+way Database.update_player_stats does, and times format_leaderboard with its
+rendering cached and with every call re-rendering. The old /leaderboard sent
+one sorted query to MongoDB per call; nothing here connects to MongoDB.
+
+Run from the repository root:
+    python benchmarks/bench_leaderboard.py
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AntakshariBot import utils
+from AntakshariBot.database import db
+
+PLAYERS = 100_000
+UPDATES = 200_000
+CALLS = 100_000
+
+
+def player_documents(rng: random.Random) -> list:
+    docs = []
+    for user_id in range(PLAYERS):
+        played = rng.randint(1, 200)
+        docs.append({
+            "user_id": user_id,
+            "user_name": f"Player {user_id}",
+            "total_points": rng.randint(0, 50 * played),
+            "games_won": rng.randint(0, played),
+            "games_played": played
+        })
+    return docs
+
+
+def main():
+    rng = random.Random(7)
+    docs = player_documents(rng)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    db.leaderboard.load(docs)
+    elapsed = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"      load: {PLAYERS:,} players in {elapsed * 1e3:.0f} ms | {memory / 2**20:.1f} MiB")
+
+    changes = [(rng.randrange(PLAYERS), rng.choice(("correct_word", "wrong_word")), rng.randint(10, 20))
+               for _ in range(UPDATES)]
+    versions = db.leaderboard.version
+    started = time.perf_counter()
+    for user_id, action, points in changes:
+        db.leaderboard.update(user_id, f"Player {user_id}", points=points if action == "correct_word" else 0)
+    elapsed = time.perf_counter() - started
+    print(f"    update: {elapsed / UPDATES * 1e9:.0f} ns per change | "
+          f"top changed by {db.leaderboard.version - versions:,} of {UPDATES:,}")
+
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        utils.format_leaderboard()
+    cached = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        utils.leaderboard_texts.clear()
+        utils.format_leaderboard()
+    rendered = time.perf_counter() - started
+    print(f"    cached: {cached / CALLS * 1e9:.0f} ns per /leaderboard | rendered: {rendered / CALLS * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
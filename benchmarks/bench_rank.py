@@ -0,0 +1,63 @@
+"""
+Cost of global rank lookups for /stats
+
+Seeds the leaderboard with 100,000 players, then times Leaderboard.rank for
+random players and the points changes that move them in the Fenwick tree, and
+reports the tree's size. For comparison it times counting the players with
+more points by scanning every total, the work count_documents({"total_points":
+{"$gt": x}}) does over its index range on each call. Nothing connects to MongoDB.
+
+Run from the repository root:
+    python benchmarks/bench_rank.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AntakshariBot.leaderboard import Leaderboard
+
+PLAYERS = 100_000
+LOOKUPS = 100_000
+SCANS = 100
+
+
+def main():
+    rng = random.Random(7)
+    leaderboard = Leaderboard()
+    started = time.perf_counter()
+    leaderboard.load(
+        {"user_id": user_id, "user_name": f"Player {user_id}", "total_points": int(rng.expovariate(1 / 2_000))}
+        for user_id in range(PLAYERS)
+    )
+    elapsed = time.perf_counter() - started
+    tree = leaderboard.counts.tree
+    print(f"   load: {PLAYERS:,} players in {elapsed * 1e3:.0f} ms | tree of {len(tree):,} totals, "
+          f"{tree.itemsize * len(tree) / 2**10:.0f} KiB")
+
+    users = [rng.randrange(PLAYERS) for _ in range(LOOKUPS)]
+    started = time.perf_counter()
+    for user_id in users:
+        leaderboard.rank(user_id)
+    elapsed = time.perf_counter() - started
+    print(f"   rank: {elapsed / LOOKUPS * 1e9:.0f} ns per lookup")
+
+    started = time.perf_counter()
+    for user_id in users:
+        leaderboard.update(user_id, f"Player {user_id}", points=rng.randint(10, 20))
+    elapsed = time.perf_counter() - started
+    print(f" update: {elapsed / LOOKUPS * 1e9:.0f} ns per points change, moving the player in the tree")
+
+    points = [standing.points for standing in leaderboard.players.values()]
+    started = time.perf_counter()
+    for user_id in users[:SCANS]:
+        mine = leaderboard.players[user_id].points
+        assert sum(1 for other in points if other > mine) + 1 == leaderboard.rank(user_id)[0]
+    elapsed = time.perf_counter() - started
+    print(f"   scan: {elapsed / SCANS * 1e6:.0f} us per lookup counting every higher total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Time to restore running games at startup
+
+Feeds GameManager.restore_games the documents of 5,000 running games of 20
+players with 30 words played, as db.load_games would return them from its one
+query, and times rebuilding the games, their letter counts and their deadlines.
+The query itself is not included: nothing connects to MongoDB.
+
+Run from the repository root:
+    python benchmarks/bench_restore.py
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import datetime
+from AntakshariBot.data.data_loader import data_loader
+from AntakshariBot.database import db
+from AntakshariBot.game_manager import GameManager
+from AntakshariBot.game_state import ACTIVE, GameState
+
+GAMES = 5_000
+PLAYERS = 20
+WORDS = 30
+
+
+def game_documents(rng: random.Random) -> list:
+    index = data_loader.index
+    docs = []
+    for chat_id in range(GAMES):
+        game = GameState(chat_id, chat_id * PLAYERS, "all", time.time(), index.keys)
+        for user_id in range(chat_id * PLAYERS, (chat_id + 1) * PLAYERS):
+            game.add_player(user_id, f"Player {user_id}")
+        game.status, game.round = ACTIVE, WORDS
+        for word_id in rng.sample(range(len(index)), WORDS):
+            game.used_words.add(index.class_of[word_id])
+        game.deadline = time.time() + rng.uniform(0, 30)
+        doc = game.to_doc()
+        doc["start_time"] = datetime.utcnow()
+        docs.append(doc)
+    return docs
+
+
+async def main():
+    assert await data_loader.load_all_data()
+    docs = game_documents(random.Random(7))
+
+    async def load_games():
+        return docs
+
+    db.load_games = load_games
+    manager = GameManager()
+    started = time.perf_counter()
+    restored = await manager.restore_games(client=None)
+    elapsed = time.perf_counter() - started
+    await manager.timers.stop()
+
+    assert restored == GAMES and len(manager.timers) == 0 and len(manager.expected_speakers) == GAMES
+    print(f"restored {restored:,} games in {elapsed * 1e3:.0f} ms | {elapsed / restored * 1e6:.0f} us per game")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
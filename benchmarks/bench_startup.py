@@ -0,0 +1,39 @@
+"""
+Startup timing: rebuilding the word data from JSON vs loading the compiled snapshot
+
+Run from the repository root:
+    python benchmarks/bench_startup.py
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AntakshariBot.data.data_loader import DataLoader
+
+RUNS = 5
+
+
+async def time_load(force_rebuild: bool) -> float:
+    loader = DataLoader()
+    if force_rebuild and os.path.exists(loader.snapshot_file):
+        os.remove(loader.snapshot_file)
+    started = time.perf_counter()
+    assert await loader.load_data_from_json()
+    return time.perf_counter() - started
+
+
+async def main():
+    cold = [await time_load(force_rebuild=True) for _ in range(RUNS)]
+    warm = [await time_load(force_rebuild=False) for _ in range(RUNS)]
+
+    print(f"JSON rebuild (+ snapshot write): median {statistics.median(cold) * 1000:.1f} ms")
+    print(f"Snapshot load:                   median {statistics.median(warm) * 1000:.1f} ms")
+    print(f"Speedup:                         {statistics.median(cold) / statistics.median(warm):.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Round trips for player statistics: find_one and $set per change versus queued $inc updates
+
+Plays 1,000 games of 20 players for 50 words each, one word per game per
+flush interval, then ends every game, and counts the requests that reach the
+player_stats collection. The old path is the read-modify-write that
+update_player_stats used to await for every word and every player at game
+end. Nothing connects to MongoDB.
+
+Run from the repository root:
+    python benchmarks/bench_stats.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AntakshariBot.database import Database
+
+GAMES = 1_000
+PLAYERS = 20
+WORDS = 50
+
+
+class CountingCollection:
+    def __init__(self):
+        self.requests = 0
+        self.updates = 0
+
+    async def find_one(self, filter):
+        self.requests += 1
+        return None
+
+    async def update_one(self, filter, update, upsert=False):
+        self.requests += 1
+        self.updates += 1
+
+    async def bulk_write(self, operations, ordered=True):
+        self.requests += 1
+        self.updates += len(operations)
+
+
+class CountingDB:
+    def __init__(self):
+        self.player_stats = CountingCollection()
+
+
+async def read_modify_write(collection: CountingCollection, user_id: int):
+    """The old update_player_stats: read the document, then write all of it back"""
+    await collection.find_one({"user_id": user_id})
+    await collection.update_one({"user_id": user_id}, {"$set": {}}, upsert=True)
+
+
+async def old_path() -> CountingCollection:
+    collection = CountingCollection()
+    for word in range(WORDS):
+        for chat_id in range(GAMES):
+            await read_modify_write(collection, chat_id * PLAYERS + word % PLAYERS)
+    for chat_id in range(GAMES):
+        for user_id in range(chat_id * PLAYERS, (chat_id + 1) * PLAYERS):
+            await read_modify_write(collection, user_id)
+    return collection
+
+
+async def queued() -> CountingCollection:
+    database = Database()
+    database.db = CountingDB()
+    for word in range(WORDS):
+        for chat_id in range(GAMES):
+            database.update_player_stats(chat_id * PLAYERS + word % PLAYERS, "Player", "correct_word", 10)
+        await database.flush_player_stats()
+    for chat_id in range(GAMES):
+        for user_id in range(chat_id * PLAYERS, (chat_id + 1) * PLAYERS):
+            database.update_player_stats(user_id, "Player", "game_finished", 100, user_id % PLAYERS == 0)
+        await database.flush_player_stats()  # once per game end
+    return database.db.player_stats
+
+
+async def main():
+    words = GAMES * WORDS
+    for label, run in (("find_one + $set", old_path), ("queued $inc", queued)):
+        started = time.perf_counter()
+        collection = await run()
+        elapsed = time.perf_counter() - started
+        print(f"{label:>15}: {collection.requests:>7,} requests | {collection.updates:>7,} updates | "
+              f"{collection.requests / words:.2f} requests per word | {elapsed * 1e3:5.0f} ms CPU")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""
+Cost of rearming turn deadlines: one asyncio task per turn versus the shared timer wheel
+
+Every "word" cancels a game's pending deadline and arms a new one, as
+GameManager does on each accepted answer. The task version is the old
+create_task(turn_timeout) / cancel() pattern.
+
+Run from the repository root:
+    python benchmarks/bench_timers.py
+"""
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AntakshariBot.scheduler import TimerWheel
+
+GAMES = 5_000
+WORDS = 20  # rearms per game
+TURN_TIME = 30
+
+
+async def turn_timeout(chat_id: int):
+    pass
+
+
+async def sleeping_timeout(chat_id: int):
+    await asyncio.sleep(TURN_TIME)
+    await turn_timeout(chat_id)
+
+
+async def with_tasks() -> float:
+    timers = {}
+    started = time.perf_counter()
+    for _ in range(WORDS):
+        for chat_id in range(GAMES):
+            task = timers.get(chat_id)
+            if task:
+                task.cancel()
+            timers[chat_id] = asyncio.create_task(sleeping_timeout(chat_id))
+        # Let the loop run the new tasks and deliver the cancellations, as between real messages
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    for task in timers.values():
+        task.cancel()
+    await asyncio.gather(*timers.values(), return_exceptions=True)
+    return elapsed
+
+
+async def with_wheel() -> float:
+    wheel = TimerWheel()
+    started = time.perf_counter()
+    for _ in range(WORDS):
+        for chat_id in range(GAMES):
+            wheel.schedule(chat_id, TURN_TIME, turn_timeout, chat_id)
+        await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    await wheel.stop()
+    return elapsed
+
+
+async def measure(run) -> tuple:
+    elapsed = await run()
+    # A second run under tracemalloc for memory, which would distort the timing
+    tracemalloc.start()
+    await run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+async def fire_check():
+    """Check deadlines fire once, on time, and only for their latest schedule"""
+    fired = []
+
+    async def record(chat_id: int):
+        fired.append((chat_id, loop.time() - started))
+
+    loop = asyncio.get_running_loop()
+    wheel = TimerWheel(tick=0.01, slots=8)
+    started = loop.time()
+    wheel.schedule(1, 0.05, record, 1)
+    wheel.schedule(2, 0.05, record, 2)
+    wheel.schedule(2, 0.15, record, 2)  # rescheduled past one revolution of the wheel
+    wheel.schedule(3, 0.05, record, 3)
+    wheel.cancel(3)
+    await asyncio.sleep(0.3)
+    await wheel.stop()
+    assert [chat_id for chat_id, _ in fired] == [1, 2], fired
+    assert 0.05 <= fired[0][1] < 0.08 and 0.15 <= fired[1][1] < 0.18, fired
+
+
+async def main():
+    await fire_check()
+    rearms = GAMES * WORDS
+    for label, run in (("task per turn", with_tasks), ("timer wheel", with_wheel)):
+        elapsed, peak = await measure(run)
+        print(f"{label:>13}: {elapsed / rearms * 1e6:5.2f} us per rearm | {rearms / elapsed:>10,.0f} rearms/s | "
+              f"peak {peak / 2**20:5.1f} MiB for {GAMES:,} games")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+"""
+Size and lookup cost of a game's used words: word strings, a set of class IDs and UsedWords
+
+For games of 50 words drawn from the real dictionary, compares the in-memory
+size, the BSON size of the used_words field stored in the games collection and
+copied into game_history, and the time of an "already used?" check.
+
+Run from the repository root:
+    python benchmarks/bench_used_words.py
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bson
+from AntakshariBot.data.data_loader import DataLoader
+from AntakshariBot.game_state import UsedWords
+
+GAMES = 10_000
+WORDS = 50  # the round limit
+CHECKS = 1_000_000
+
+
+def memory(build) -> int:
+    tracemalloc.start()
+    games = [build(words) for words in GAMES_WORDS]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del games
+    return size
+
+
+def check_time(used, probes) -> float:
+    started = time.perf_counter()
+    for class_id in probes:
+        class_id in used
+    return (time.perf_counter() - started) / len(probes)
+
+
+async def main():
+    global GAMES_WORDS
+    loader = DataLoader()
+    assert await loader.load_data_from_json()
+    index = loader.index
+    rng = random.Random(7)
+    GAMES_WORDS = [rng.sample(range(len(index)), WORDS) for _ in range(GAMES)]
+    probes = [rng.randrange(len(index)) for _ in range(CHECKS)]
+
+    layouts = (
+        ("word strings", lambda words: {index.keys[word_id] for word_id in words},
+         lambda used: list(used)),
+        ("set of IDs", lambda words: {index.class_of[word_id] for word_id in words},
+         lambda used: list(used)),
+        ("UsedWords", lambda words: UsedWords((index.class_of[word_id] for word_id in words), index.keys),
+         lambda used: used.to_doc()),
+    )
+    for label, build, persist in layouts:
+        size = memory(build)
+        used = build(GAMES_WORDS[0])
+        stored = len(bson.encode({"used_words": persist(used)}))
+        probe = probes if label != "word strings" else [index.keys[word_id] for word_id in probes]
+        print(f"{label:>12}: {size / GAMES:6.0f} B per game in memory | {stored:5,} B stored | "
+              f"{check_time(used, probe) * 1e9:4.0f} ns per check")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""
+Retained memory and lookup speed: three word sets plus a union copy vs the compact WordIndex
+
+Run from the repository root:
+    python benchmarks/bench_word_store.py
+"""
+import gc
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AntakshariBot.data.data_loader import DataLoader, clean_city_name, iter_json_array
+from AntakshariBot.data.normalize import fold_word
+from AntakshariBot.data.word_index import RARE, build_index
+
+
+def read_names(json_file: str):
+    countries, cities, rare_words = [], [], []
+    for country_data in iter_json_array(json_file):
+        name = country_data.get('name', '').strip()
+        if len(name) >= 2:
+            countries.append(name.lower())
+            if len(name) > 8:
+                rare_words.append(name.lower())
+        for city in country_data.get('cities', []):
+            clean_city = clean_city_name(city)
+            if clean_city:
+                cities.append(clean_city.lower())
+                if len(clean_city) > 12:
+                    rare_words.append(clean_city.lower())
+    return countries, cities, rare_words
+
+
+def build_sets(countries, cities, rare_words):
+    """The previous layout: three sets, the get_all_words() union, the folded map and letter lists"""
+    country_set, city_set, rare_set = set(countries), set(cities), set(rare_words)
+    all_words = country_set.union(city_set)
+    word_keys = {}
+    for word in sorted(all_words):
+        key = fold_word(word)
+        if key and key not in word_keys:
+            word_keys[key] = word
+    words_by_letter = {}
+    for key in sorted(word_keys):
+        words_by_letter.setdefault(key[0], []).append(word_keys[key])
+    return country_set, city_set, rare_set, all_words, word_keys, words_by_letter
+
+
+def retained(label: str, build, *names):
+    # Copy the names so both layouts pay for their own strings
+    names = [[name[:1] + name[1:] for name in group] for group in names]
+    gc.collect()
+    tracemalloc.start()
+    result = build(*names)
+    del names
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {size / 2**20:6.1f} MiB")
+    return result
+
+
+def main():
+    names = read_names(DataLoader().json_file)
+    old = retained("sets + union + folded map", build_sets, *names)
+    index = retained("WordIndex", build_index, *names)
+    fuzzy = index.fuzzy.entries
+    print(f"{'  of which fuzzy index':<28} {fuzzy.itemsize * len(fuzzy) / 2**20:6.1f} MiB")
+
+    country_set, city_set, rare_set, all_words, word_keys, _ = old
+    probe = "jalalabad"
+    old_lookup = timeit.timeit(lambda: (word_keys.get(probe) in rare_set), number=200000) / 200000
+    new_lookup = timeit.timeit(lambda: index.has_flag(index.lookup(probe), RARE), number=200000) / 200000
+    old_stats = timeit.timeit(lambda: len(country_set.union(city_set)), number=20) / 20
+    new_stats = timeit.timeit(lambda: len(index), number=20) / 20
+    print(f"membership + rarity lookup:  sets {old_lookup * 1e9:6.0f} ns | index {new_lookup * 1e9:6.0f} ns")
+    print(f"total word count (stats):    sets {old_stats * 1e6:6.0f} us | index {new_stats * 1e6:6.3f} us")
+
+
+if __name__ == "__main__":
+    main()
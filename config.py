@@ -25,3 +25,10 @@ MIN_PLAYERS = 2  # Minimum players to start game
 MAX_PLAYERS = 20  # Maximum players in a game
 POINTS_PER_WORD = 10  # Points for correct answer
 BONUS_POINTS = 5  # Bonus for difficult words
+DEFAULT_THEME = "all"  # Theme of games started without one, and of stored games that name none
+
+# Persistence Settings
+GAME_FLUSH_INTERVAL = 2  # seconds between game state writes; a crash loses at most this much play
+JOURNAL_PATH = os.getenv("JOURNAL_PATH", "")  # local game journal for restarts without MongoDB; empty to disable
+JOURNAL_COMPACT_LINES = 10_000  # fewest journal lines before it is compacted; more with many games running
+LEADERBOARD_BUCKETS_KEPT = 4  # past days or weeks kept for the windowed leaderboards before they expire
@@ -0,0 +1,29 @@
+"""
+Dispatch filters: only the current player's words reach the game handler, never commands
+"""
+import asyncio
+from types import SimpleNamespace
+
+from pyrogram import filters
+
+from AntakshariBot.bot import is_expected_speaker
+
+
+def message(user_id, text, chat_id=10):
+    return SimpleNamespace(chat=SimpleNamespace(id=chat_id), from_user=SimpleNamespace(id=user_id), text=text)
+
+
+def passes(text, user_id=1, chat_id=10):
+    expected_speaker = filters.create(is_expected_speaker, "ExpectedSpeakerFilter", speakers={10: 1})
+    return asyncio.run(expected_speaker(None, message(user_id, text, chat_id)))
+
+
+def test_current_player_words_pass():
+    assert passes("Agra")
+    assert not passes("Agra", user_id=2)
+    assert not passes("Agra", chat_id=20)
+
+
+def test_commands_never_reach_the_game():
+    for text in ("/wordstats", "/refreshdata", "/start", "/stats@AntakshariBot", "/unknown"):
+        assert not passes(text)
@@ -0,0 +1,37 @@
+"""
+iter_json_array: streaming the elements of a JSON array whatever the chunk boundaries
+"""
+import json
+
+import pytest
+
+from AntakshariBot.data.data_loader import iter_json_array
+
+DOCUMENTS = [
+    '[12, 3]',
+    '[-1.5e3,true,null,"a]b",7]',
+    '[{"name": "India", "cities": ["Agra", "Delhi"]}, {"name": "Nepal", "cities": []}]',
+    ' \n[ [1, [2, 3]], {"a": {"b": "]"}} , 45 ]\n',
+    '[]',
+]
+
+
+def write(tmp_path, text):
+    path = tmp_path / "data.json"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("text", DOCUMENTS)
+def test_every_chunk_size_yields_the_elements(tmp_path, text):
+    path = write(tmp_path, text)
+    for chunk_size in range(1, len(text) + 2):
+        assert list(iter_json_array(path, chunk_size)) == json.loads(text), chunk_size
+
+
+@pytest.mark.parametrize("text", ['[1, 2', '[{"name": "India"', '{"name": "India"}', '[1, }]', '[1x]', ''])
+def test_malformed_documents_raise(tmp_path, text):
+    path = write(tmp_path, text)
+    for chunk_size in (1, 4, 1 << 16):
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array(path, chunk_size))
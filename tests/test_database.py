@@ -0,0 +1,324 @@
+"""
+Database write-behind: game deltas, restoring from the journal while the flusher runs, and games, statistics
+and score bucket writes that fail
+"""
+import asyncio
+from types import SimpleNamespace
+
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+import config
+from AntakshariBot.database import DUPLICATE_KEY, Database, game_changes, write_outcome
+from AntakshariBot.game_state import ACTIVE, GameState, UsedWords
+from AntakshariBot.journal import GameJournal
+
+
+KEYS = ["agra", "delhi", "india", "nepal"]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def new_game(chat_id=10):
+    game = GameState(chat_id, 1, "all", 0, KEYS)
+    game.add_player(1, "Asha")
+    game.add_player(2, "Ravi")
+    return game
+
+
+class RecordingCollection:
+    """Records the operations of every bulk write, failing while fail is set"""
+
+    def __init__(self):
+        self.writes = []
+        self.fail = False
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.fail:
+            raise AutoReconnect("connection closed")
+        self.writes.append([(operation._filter, operation._doc, operation._upsert) for operation in operations])
+
+
+def games_database():
+    database = Database()
+    database.journal = None
+    database.db = SimpleNamespace(games=RecordingCollection())
+    return database, database.db.games
+
+
+def test_first_write_upserts_the_whole_game():
+    database, collection = games_database()
+    game = new_game()
+    database.create_game(game)
+    run(database.flush_games())
+
+    [[(filter, update, upsert)]] = collection.writes
+    assert filter == {"chat_id": 10} and upsert
+    assert {field: value for field, value in update["$set"].items() if field != "updated_time"} == game.to_doc()
+    assert set(update["$setOnInsert"]) == {"start_time"}
+
+
+def test_later_writes_send_changed_fields_and_push_new_words():
+    database, collection = games_database()
+    game = new_game()
+    game.used_words.add(0)
+    database.create_game(game)
+    run(database.flush_games())
+
+    game.status = ACTIVE
+    game.used_words.add(3)
+    game.players[2].score = 10
+    database.update_game(game)
+    run(database.flush_games())
+
+    [(filter, update, upsert)] = collection.writes[1]
+    assert filter == {"chat_id": 10} and not upsert
+    assert update["$push"] == {"used_words": {"$each": ["nepal"]}}
+    assert {field for field in update["$set"] if field != "updated_time"} == {"status", "players.1.score"}
+
+    # Nothing changed: nothing is written
+    database.update_game(game)
+    run(database.flush_games())
+    assert len(collection.writes) == 2
+
+
+def test_game_changes_replace_used_words_and_players_that_did_not_only_grow():
+    game = new_game()
+    game.used_words = UsedWords([0, 2], KEYS)
+    written = game.to_doc()
+
+    game.used_words = UsedWords([2], KEYS)  # a data refresh dropped a word
+    game.remove_player(1)
+    changes = game_changes(written, game.to_doc())
+    assert changes["used_words"] == ["india"] and "used_words+" not in changes
+    assert [player["id"] for player in changes["players"]] == [2]
+
+
+def test_failed_write_is_queued_again_and_written_whole():
+    database, collection = games_database()
+    game = new_game()
+    database.create_game(game)
+    run(database.flush_games())
+
+    game.used_words.add(1)
+    database.update_game(game)
+    collection.fail = True
+    run(database.flush_games())
+    assert database.dirty_games == {10: game} and 10 not in database.written_games
+
+    collection.fail = False
+    run(database.flush_games())
+    [(filter, update, upsert)] = collection.writes[1]
+    assert upsert and update["$set"]["used_words"] == ["delhi"] and "$push" not in update
+    assert database.written_games[10] == game.to_doc()
+
+
+def test_journal_replay_holds_the_games_lock(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    game = GameState(10, 1, "all", 0)
+    game.add_player(1, "Asha")
+    game.status = ACTIVE
+    journal = GameJournal(path)
+    journal.write_game(game.to_doc())
+    journal.close()
+
+    class RecordingJournal(GameJournal):
+        def load(self):
+            self.locked = database.games_lock.locked()
+            return super().load()
+
+    database = Database()
+    database.journal = RecordingJournal(path)
+    docs = run(database.load_games())
+    assert [doc["chat_id"] for doc in docs] == [10]
+    assert database.journal.locked
+
+
+class FakeCollection:
+    """Applies flush_update operations as MongoDB would, with a unique index on the key fields"""
+
+    def __init__(self, name, key_fields):
+        self.name = name
+        self.key_fields = key_fields
+        self.docs = {}
+        # "before" or "after": the connection drops before the batch reaches the server, or after it applied
+        self.drop = None
+        # Keys whose writes the server rejects, like a failed document validation
+        self.rejected = set()
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.drop == "before":
+            raise AutoReconnect("connection closed")
+        write_errors = []
+        for i, operation in enumerate(operations):
+            filter, update = operation._filter, operation._doc
+            key = tuple(filter[field] for field in self.key_fields)
+            doc = self.docs.get(key)
+            if key in self.rejected:
+                write_errors.append({"index": i, "code": 121, "errmsg": "Document failed validation"})
+                continue
+            if doc is not None and filter["flushes"]["$ne"] in doc["flushes"]:
+                # The filter misses, so the upsert inserts a second document with the same key
+                write_errors.append({"index": i, "code": DUPLICATE_KEY, "errmsg": "E11000 duplicate key error"})
+                continue
+            if doc is None:
+                doc = self.docs[key] = {field: filter[field] for field in self.key_fields}
+                doc.update(update.get("$setOnInsert", {}))
+                doc["flushes"] = []
+            for field, value in update.get("$inc", {}).items():
+                doc[field] = doc.get(field, 0) + value
+            for field, value in update.get("$max", {}).items():
+                doc[field] = max(doc.get(field, value), value)
+            doc.update(update.get("$set", {}))
+            push = update["$push"]["flushes"]
+            doc["flushes"] = (doc["flushes"] + push["$each"])[push["$slice"]:]
+        if self.drop == "after":
+            raise AutoReconnect("connection closed")
+        if write_errors:
+            raise BulkWriteError({"writeErrors": write_errors, "writeConcernErrors": []})
+
+
+def stats_database():
+    database = Database()
+    database.db = SimpleNamespace(player_stats=FakeCollection("player_stats", ("user_id",)))
+    return database, database.db.player_stats
+
+
+def points(collection, user_id):
+    return collection.docs[(user_id,)]["total_points"]
+
+
+def test_stats_write_that_applied_before_the_connection_dropped_applies_once():
+    database, collection = stats_database()
+    database.update_player_stats(1, "Asha", "correct_word", 10)
+    collection.drop = "after"
+    run(database.flush_player_stats())
+    assert points(collection, 1) == 10
+    assert database.stats_retry is not None and database.stats_queue == {}
+
+    database.update_player_stats(1, "Asha", "correct_word", 5)
+    collection.drop = None
+    run(database.flush_player_stats())
+    assert points(collection, 1) == 15
+    assert collection.docs[(1,)]["correct_words"] == 2
+    assert database.stats_retry is None and database.stats_queue == {}
+    assert database.leaderboard.rank(1) == (1, 1)
+
+
+def test_stats_write_that_never_arrived_is_retried_before_newer_changes():
+    database, collection = stats_database()
+    database.update_player_stats(1, "Asha", "correct_word", 10)
+    collection.drop = "before"
+    run(database.flush_player_stats())
+
+    # Still unreachable: the retry is kept and newer changes wait in the queue
+    database.update_player_stats(1, "Asha", "correct_word", 5)
+    database.update_player_stats(2, "Ravi", "wrong_word")
+    run(database.flush_player_stats())
+    assert collection.docs == {}
+    assert set(database.stats_queue) == {1, 2}
+
+    collection.drop = None
+    run(database.flush_player_stats())
+    assert points(collection, 1) == 15
+    assert collection.docs[(2,)]["wrong_words"] == 1
+    assert database.stats_retry is None and database.stats_queue == {}
+
+
+def test_rejected_stats_writes_are_queued_again_under_newer_changes():
+    database, collection = stats_database()
+    database.update_player_stats(1, "Asha", "correct_word", 10)
+    database.update_player_stats(2, "Ravi", "correct_word", 20)
+    collection.rejected = {(2,)}
+    run(database.flush_player_stats())
+    assert points(collection, 1) == 10 and (2,) not in collection.docs
+    assert database.stats_retry is None and list(database.stats_queue) == [2]
+
+    database.update_player_stats(2, "Ravi", "correct_word", 5)
+    collection.rejected = set()
+    run(database.flush_player_stats())
+    assert points(collection, 1) == 10 and points(collection, 2) == 25
+    assert collection.docs[(2,)]["best_score"] == 20
+
+
+def buckets_database():
+    database = Database()
+    database.db = SimpleNamespace(score_buckets=FakeCollection("score_buckets", ("chat_id", "period", "bucket", "user_id")))
+    return database, database.db.score_buckets
+
+
+def bucket_points(collection, chat_id, period, user_id):
+    return sum(doc["points"] for (chat, doc_period, _, user), doc in collection.docs.items()
+               if (chat, doc_period, user) == (chat_id, period, user_id))
+
+
+def test_bucket_writes_apply_once_across_dropped_connections():
+    database, collection = buckets_database()
+    database.update_score_buckets(10, 1, "Asha", 30, True)
+    collection.drop = "after"
+    run(database.flush_score_buckets())
+    assert database.bucket_retry is not None and database.bucket_queue == {}
+
+    database.update_score_buckets(10, 1, "Asha", 20, False)
+    collection.drop = "before"
+    run(database.flush_score_buckets())
+    assert len(database.bucket_queue) == 5
+
+    collection.drop = None
+    run(database.flush_score_buckets())
+    assert database.bucket_retry is None and database.bucket_queue == {}
+    for chat_id, period in ((10, "all"), (10, "week"), (10, "day"), (0, "week"), (0, "day")):
+        assert bucket_points(collection, chat_id, period, 1) == 50
+    assert all(doc["games_played"] == 2 and doc["games_won"] == 1 for doc in collection.docs.values())
+    assert all("expires_at" in doc for key, doc in collection.docs.items() if key[2] is not None)
+
+
+def test_rejected_bucket_writes_are_queued_again_under_newer_changes():
+    database, collection = buckets_database()
+    database.update_score_buckets(10, 1, "Asha", 30, True)
+    collection.rejected = {key for key in database.bucket_queue if key[1] == "all"}
+    run(database.flush_score_buckets())
+    assert [key[1] for key in database.bucket_queue] == ["all"]
+
+    database.update_score_buckets(10, 1, "Asha", 20, False)
+    collection.rejected = set()
+    run(database.flush_score_buckets())
+    assert bucket_points(collection, 10, "all", 1) == 50
+    assert bucket_points(collection, 10, "week", 1) == 50
+
+
+def test_write_outcome_with_a_write_concern_error():
+    error = BulkWriteError({
+        "writeErrors": [{"index": 1, "code": DUPLICATE_KEY}, {"index": 2, "code": 121}],
+        "writeConcernErrors": [{"code": 64, "errmsg": "waiting for replication timed out"}]
+    })
+    assert write_outcome(error, 4) == ([2], [0, 3])
+    assert write_outcome(AutoReconnect(), 2) == ([], [0, 1])
+
+
+def test_flusher_keeps_running_after_a_failed_flush(monkeypatch):
+    monkeypatch.setattr(config, "GAME_FLUSH_INTERVAL", 0.01)
+    database = Database()
+    flushed = []
+
+    async def flush_games():
+        raise RuntimeError("boom")
+
+    async def flush_player_stats():
+        flushed.append(True)
+
+    async def flush_score_buckets():
+        pass
+
+    database.flush_games = flush_games
+    database.flush_player_stats = flush_player_stats
+    database.flush_score_buckets = flush_score_buckets
+
+    async def scenario():
+        task = asyncio.create_task(database.run_flusher())
+        await asyncio.sleep(0.1)
+        task.cancel()
+
+    run(scenario())
+    assert len(flushed) > 1
@@ -0,0 +1,107 @@
+"""
+Fuzzy lookup: bounded edit distance, the symmetric-delete index and WordIndex.suggest
+"""
+import random
+
+import pytest
+
+from AntakshariBot.data.fuzzy import MAX_EDIT_DISTANCE, build_fuzzy_index, edit_distance, rank_candidates
+from AntakshariBot.data.word_index import build_index
+
+
+def full_distance(a, b):
+    """Optimal string alignment distance over the whole table, for comparison"""
+    rows = [[i + j if i * j == 0 else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            rows[i][j] = min(rows[i - 1][j] + 1, rows[i][j - 1] + 1, rows[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                rows[i][j] = min(rows[i][j], rows[i - 2][j - 2] + 1)
+    return rows[-1][-1]
+
+
+@pytest.mark.parametrize("a, b, distance", [
+    ("delhi", "delhi", 0),
+    ("delhi", "dehli", 1),
+    ("delhi", "delh", 1),
+    ("paris", "parris", 1),
+    ("nepal", "napal", 1),
+    ("berlin", "brelni", 2),
+    ("", "ab", 2),
+    ("agra", "india", 3),
+    ("a", "abcdef", 3),
+])
+def test_edit_distance(a, b, distance):
+    assert edit_distance(a, b) == min(distance, MAX_EDIT_DISTANCE + 1)
+    assert edit_distance(b, a) == min(distance, MAX_EDIT_DISTANCE + 1)
+
+
+def test_edit_distance_matches_the_full_table():
+    rng = random.Random(11)
+    for _ in range(2_000):
+        a = "".join(rng.choice("abc ") for _ in range(rng.randrange(8)))
+        b = "".join(rng.choice("abc ") for _ in range(rng.randrange(8)))
+        for limit in (1, 2, 3):
+            assert edit_distance(a, b, limit) == min(full_distance(a, b), limit + 1), (a, b, limit)
+
+
+def typos(key):
+    """Every substitution, insertion, deletion and adjacent swap of a key, over a small alphabet"""
+    for i in range(len(key) + 1):
+        for char in "aez":
+            yield key[:i] + char + key[i:]
+            if i < len(key):
+                yield key[:i] + char + key[i + 1:]
+        if i < len(key):
+            yield key[:i] + key[i + 1:]
+        if i + 1 < len(key):
+            yield key[:i] + key[i + 1] + key[i] + key[i + 2:]
+
+
+def test_index_finds_every_single_typo():
+    keys = sorted(["agra", "delhi", "india", "nepal", "new york", "paris", "pune"])
+    index = build_fuzzy_index(keys)
+    assert list(index.entries) == sorted(index.entries)
+    for word_id, key in enumerate(keys):
+        for typo in typos(key):
+            assert word_id in index.candidates(typo), (key, typo)
+
+
+def test_index_of_many_keys_is_sorted():
+    rng = random.Random(3)
+    keys = sorted({"".join(rng.choice("abcdefgh") for _ in range(rng.randrange(3, 10))) for _ in range(3_000)})
+    index = build_fuzzy_index(keys)
+    assert list(index.entries) == sorted(index.entries)
+    assert all(word_id in index.candidates(key) for word_id, key in enumerate(keys))
+
+
+def test_rank_by_distance_then_length_difference():
+    candidates = [(0, "dehli"), (1, "delhi"), (2, "dili"), (3, "agra"), (4, "deli")]
+    assert rank_candidates("delhi", candidates, 5) == [1, 0, 4, 2]
+    assert rank_candidates("delhi", candidates, 2) == [1, 0]
+
+
+def build():
+    return build_index(
+        ("india", "indonesia", "nepal", "niger", "nigeria"), ("delhi", "dili", "agra", "nagpur"), (),
+        alias_groups=[("India", "Bharat")],
+        country_cities={"india": ["delhi", "agra", "nagpur"]}
+    )
+
+
+def test_suggest_ranks_the_closest_names():
+    index = build()
+    assert index.suggest("nigeira") == ["nigeria"]
+    # Equally close: the name closest in length first
+    assert index.suggest("deli") == ["dili", "delhi"]
+    assert index.suggest("deli", limit=1) == ["dili"]
+    assert index.suggest("xyz") == []
+
+
+def test_suggest_follows_the_letter_theme_and_used_classes():
+    index = build()
+    assert index.suggest("deli", letter="n") == []
+    assert index.suggest("deli", theme=index.find_theme("cities of india")) == ["delhi"]
+    assert index.suggest("deli", exclude={index.class_of[index.lookup("delhi")]}) == ["dili"]
+    # Used under another name: every name of the place is skipped
+    assert index.suggest("indi", exclude={index.class_of[index.lookup("bharat")]}) == []
@@ -0,0 +1,210 @@
+"""
+GameManager turns: state changes only move forward, timers or submissions from an ended turn do nothing,
+and the next letter skips letters with no unused words left
+"""
+import asyncio
+
+import pytest
+
+from AntakshariBot import game_manager as game_manager_module
+from AntakshariBot.data.data_loader import data_loader
+from AntakshariBot.data.word_index import build_index
+from AntakshariBot.game_manager import GameManager
+from AntakshariBot.game_state import ACTIVE, ENDED, JOINING, GameState
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.updated = []
+
+    def update_game(self, game):
+        self.updated.append(game.chat_id)
+
+    def update_player_stats(self, *args):
+        pass
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(game_manager_module, "db", database)
+    return database
+
+
+def run(scenario):
+    """Run a scenario with a fresh manager, stopping its timers afterwards"""
+    async def main():
+        manager = GameManager()
+        try:
+            return await scenario(manager)
+        finally:
+            await manager.timers.stop()
+
+    return asyncio.run(main())
+
+
+def start(manager: GameManager, chat_id: int = 10, players: int = 3) -> GameState:
+    game = GameState(chat_id, 1, "all", 0)
+    for user_id in range(1, players + 1):
+        game.add_player(user_id, f"P{user_id}")
+    game.next_letter = "a"
+    manager.active_games[chat_id] = game
+    manager.set_status(chat_id, ACTIVE)
+    return game
+
+
+def test_status_only_moves_forward(database):
+    async def scenario(manager):
+        game = start(manager)
+        turn = game.turn
+        moves = [
+            manager.set_status(10, JOINING),
+            manager.set_status(10, ACTIVE),
+            manager.set_status(10, ENDED),
+            manager.set_status(10, ACTIVE),
+            manager.set_status(10, ENDED),
+            manager.set_status(20, ENDED),
+        ]
+        return moves, game.status, game.turn - turn
+
+    moves, status, turns = run(scenario)
+    assert moves == [False, False, True, False, False, False]
+    assert status == ENDED
+    # Only the move that happened ended a turn
+    assert turns == 1
+
+
+def test_joining_game_can_end_without_starting(database):
+    async def scenario(manager):
+        game = GameState(10, 1, "all", 0)
+        manager.active_games[10] = game
+        return manager.set_status(10, ENDED), game.status
+
+    assert run(scenario) == (True, ENDED)
+
+
+def test_stale_turn_timeout_is_a_no_op(database):
+    async def scenario(manager):
+        game = start(manager)
+        stale = game.turn
+        manager.next_turn(10)
+        await manager.turn_timeout(10, stale, None)
+        return game
+
+    game = run(scenario)
+    assert list(game.players) == [1, 2, 3]
+    assert game.current.id == 2
+    assert database.updated == []
+
+
+def test_current_turn_timeout_eliminates(database):
+    async def scenario(manager):
+        game = start(manager)
+        await manager.turn_timeout(10, game.turn, None)
+        return manager, game
+
+    manager, game = run(scenario)
+    assert list(game.players) == [2, 3]
+    assert game.current.id == 2
+    assert manager.expected_speakers == {10: 2}
+    assert database.updated == [10]
+
+
+def test_submission_is_dropped_when_the_turn_ends_during_validation(database):
+    async def scenario(manager):
+        game = start(manager)
+
+        async def validate_word(word, letter, used_words, theme):
+            # The turn times out while the word is being validated
+            manager.next_turn(10)
+            return {"valid": True, "difficulty": 0, "class_id": 0, "word": word, "key": word,
+                    "next_letter": "a"}
+
+        manager.word_validator.validate_word = validate_word
+        result = await manager.process_word(10, 1, "P1", "agra")
+        return result, game
+
+    result, game = run(scenario)
+    assert result["success"] is False and result["is_current_player"] is False
+    assert game.players[1].score == 0 and game.players[1].streak == 0
+    assert len(game.used_words) == 0
+    assert game.current.id == 2
+    assert database.updated == []
+
+
+def test_submission_from_another_player_is_ignored(database):
+    async def scenario(manager):
+        start(manager)
+        return await manager.process_word(10, 2, "P2", "agra")
+
+    assert run(scenario) == {"success": False, "error": False, "is_current_player": False}
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = build_index(
+        ("india", "nepal"), ("mumbai", "delhi", "agra", "aizawl", "kathmandu"), (),
+        alias_groups=[("Mumbai", "Bombay")],
+        country_cities={"india": ["mumbai", "delhi", "agra", "aizawl"], "nepal": ["kathmandu"]}
+    )
+    monkeypatch.setattr(data_loader, "index", index)
+    return index
+
+
+def class_id(index, key):
+    return index.class_of[index.lookup(key)]
+
+
+def test_counts_skip_every_name_of_used_places(database, index):
+    async def scenario(manager):
+        game = start(manager)
+        game.used_words.add(class_id(index, "bombay"))
+        return manager.count_letters(game)
+
+    assert run(scenario) == {"a": 2, "b": 0, "d": 1, "i": 1, "k": 1, "m": 0, "n": 1}
+
+
+def test_discount_counts_only_names_in_the_theme(database, index):
+    theme = index.find_theme("cities of india")
+    counts = {"a": 2, "b": 1, "d": 1, "m": 1}
+    GameManager.discount_used_words(None, counts, theme, [class_id(index, "mumbai"), class_id(index, "agra")])
+    assert counts == {"a": 1, "b": 0, "d": 1, "m": 0}
+
+
+def test_next_letter_skips_exhausted_letters(database, index):
+    async def scenario(manager):
+        game = start(manager)
+        game.letter_counts = {"a": 1, "i": 1, "k": 1}
+        choices = [manager.choose_next_letter(game, key) for key in ("delhi", "nepal", "kathmandu", "mumbai")]
+        game.letter_counts["i"] = 0
+        choices.append(manager.choose_next_letter(game, "delhi"))
+        return choices
+
+    assert run(scenario) == [("i", "last"), ("a", "second_last"), ("", "free"), ("i", "last"), ("", "free")]
+
+
+def test_next_letter_ignores_spaces(database, index):
+    async def scenario(manager):
+        game = start(manager)
+        game.letter_counts = {"k": 1, "r": 1}
+        return manager.choose_next_letter(game, "new york"), manager.choose_next_letter(game, "cape town")
+
+    assert run(scenario) == (("k", "last"), ("", "free"))
+
+
+def test_playing_a_word_discounts_it_and_picks_a_live_letter(database, index):
+    async def scenario(manager):
+        game = start(manager)
+        game.next_letter = "b"
+        game.letter_counts = manager.count_letters(game)
+        manager.word_validator.index = index
+        manager.word_validator.data_ready = True
+        result = await manager.process_word(10, 1, "P1", "bombay")
+        return result, game
+
+    result, game = run(scenario)
+    assert result["success"] and result["letter_rule"] == "second_last"
+    # No place left starting with "y"; every name of Mumbai is used
+    assert game.next_letter == "a"
+    assert game.letter_counts["b"] == game.letter_counts["m"] == 0
+    assert class_id(index, "mumbai") in game.used_words
@@ -0,0 +1,129 @@
+"""
+GameJournal: replaying entries into running games, deltas of used words, torn lines and compaction
+"""
+from AntakshariBot.database import game_changes
+from AntakshariBot.game_state import ACTIVE, GameState, UsedWords
+from AntakshariBot.journal import COMPACT_RATIO, GameJournal
+
+KEYS = ["berlin", "delhi", "india", "nepal", "paris", "spain"]
+
+
+def new_game(chat_id: int) -> GameState:
+    game = GameState(chat_id, 1, "all", 0, KEYS)
+    game.add_player(1, "Asha")
+    game.add_player(2, "Ravi")
+    return game
+
+
+def journal_changes(journal: GameJournal, written: dict, game: GameState) -> dict:
+    """Record a game's changes the way Database.write_games does"""
+    doc = game.to_doc()
+    journal.write_changes(game.chat_id, game_changes(written, doc))
+    return doc
+
+
+def test_replay_applies_entries_in_order(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    journal = GameJournal(path)
+    game = new_game(10)
+    journal.write_game(game.to_doc())
+    written = game.to_doc()
+
+    game.status = ACTIVE
+    game.used_words.add(2)
+    game.players[1].score = 10
+    game.advance()
+    written = journal_changes(journal, written, game)
+    game.used_words.add(4)
+    written = journal_changes(journal, written, game)
+
+    ended = new_game(20)
+    journal.write_game(ended.to_doc())
+    journal.write_end(20)
+    journal.close()
+
+    docs = GameJournal(path).load()
+    assert len(docs) == 1
+    restored = GameState.from_doc(docs[0], 0, lambda key: KEYS.index(key), KEYS)
+    assert restored.status == ACTIVE
+    assert list(restored.used_words) == [2, 4]
+    assert restored.players[1].score == 10
+    assert restored.current.id == 2
+
+
+def test_used_words_journaled_as_delta_unless_some_were_dropped(tmp_path):
+    journal = GameJournal(str(tmp_path / "games.jsonl"))
+    game = new_game(10)
+    game.used_words.add(0)
+    journal.write_game(game.to_doc())
+    written = game.to_doc()
+
+    game.used_words.add(3)
+    written = journal_changes(journal, written, game)
+    assert '"used_words+":["nepal"]' in journal.pending[-1]
+
+    # A data refresh can drop words: the whole list is written
+    game.used_words = UsedWords([3], KEYS)
+    journal_changes(journal, written, game)
+    assert '"used_words":["nepal"]' in journal.pending[-1]
+    assert journal.games[10]["used_words"] == ["nepal"]
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    journal = GameJournal(path)
+    journal.write_game(new_game(10).to_doc())
+    journal.close()
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"op":"set","chat_id":10,"fie')
+
+    docs = GameJournal(path).load()
+    assert [doc["chat_id"] for doc in docs] == [10]
+    with open(path, encoding="utf-8") as file:
+        assert len(file.readlines()) == 1
+
+
+def test_compaction_keeps_one_entry_per_running_game(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    # Two games: compacted once the file reaches COMPACT_RATIO lines per game
+    journal = GameJournal(path, compact_lines=5)
+    games = [new_game(chat_id) for chat_id in (1, 2)]
+    written = {}
+    for game in games:
+        journal.write_game(game.to_doc())
+        written[game.chat_id] = game.to_doc()
+    journal.flush()
+
+    for turn in range(COMPACT_RATIO + 2):
+        for game in games:
+            game.round += 1
+            game.used_words.add(turn % len(KEYS))
+            written[game.chat_id] = journal_changes(journal, written[game.chat_id], game)
+        journal.flush()
+    journal.close()
+
+    with open(path, encoding="utf-8") as file:
+        lines = file.readlines()
+    assert len(lines) < COMPACT_RATIO * len(games)
+    docs = GameJournal(path).load()
+    assert sorted(doc["chat_id"] for doc in docs) == [1, 2]
+    assert all(doc["round"] == COMPACT_RATIO + 2 and sorted(doc["used_words"]) == KEYS for doc in docs)
+
+
+def test_load_compacts_a_long_journal(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    journal = GameJournal(path)
+    game = new_game(10)
+    journal.write_game(game.to_doc())
+    written = game.to_doc()
+    for word in range(4):
+        game.used_words.add(word)
+        written = journal_changes(journal, written, game)
+    journal.close()
+
+    replay = GameJournal(path)
+    docs = replay.load()
+    assert replay.lines == 1
+    assert docs[0]["used_words"] == KEYS[:4]
+    with open(path, encoding="utf-8") as file:
+        assert len(file.readlines()) == 1
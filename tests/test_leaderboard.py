@@ -0,0 +1,66 @@
+"""
+Leaderboard and its ScoreCounts Fenwick tree: counts, growth past the tree's size and ranks
+"""
+import random
+
+from AntakshariBot.leaderboard import Leaderboard, ScoreCounts
+
+
+def test_counts_match_a_direct_count():
+    rng = random.Random(3)
+    points = [rng.randrange(500) for _ in range(300)]
+    counts = ScoreCounts.from_points(points)
+    for value in (0, 1, 17, 250, 499, 10_000):
+        assert counts.count_at_most(value) == sum(1 for p in points if p <= value)
+        assert counts.count_above(value) == sum(1 for p in points if p > value)
+
+
+def test_grow_keeps_existing_counts():
+    counts = ScoreCounts(size=4)
+    for value in (0, 1, 2, 3, 3):
+        counts.add(value, 1)
+    counts.add(1_000, 1)  # several doublings
+    assert len(counts.tree) - 1 >= 1_001
+    assert counts.count_at_most(3) == 5
+    assert counts.count_at_most(999) == 5
+    assert counts.count_at_most(1_000) == 6
+    assert counts.count_above(2) == 3
+
+
+def test_grow_matches_tree_built_at_full_size():
+    rng = random.Random(5)
+    points = [rng.randrange(3_000) for _ in range(200)]
+    grown = ScoreCounts(size=2)
+    for value in points:
+        grown.add(value, 1)
+    built = ScoreCounts.from_points(points)
+    for value in range(0, 3_000, 37):
+        assert grown.count_at_most(value) == built.count_at_most(value)
+
+
+def test_ranks_share_ties_and_follow_updates():
+    board = Leaderboard()
+    board.load([
+        {"user_id": 1, "user_name": "A", "total_points": 50},
+        {"user_id": 2, "user_name": "B", "total_points": 30},
+        {"user_id": 3, "user_name": "C", "total_points": 30},
+    ])
+    assert board.rank(1) == (1, 3)
+    assert board.rank(2) == board.rank(3) == (2, 3)
+    assert board.rank(4) is None
+
+    board.update(3, "C", points=40)
+    board.update(4, "D")
+    assert board.rank(3) == (1, 4)
+    assert board.rank(1) == (2, 4)
+    assert board.rank(4) == (4, 4)
+    assert [standing.user_id for standing in board.leaders()] == [3, 1, 2, 4]
+
+
+def test_top_is_capped_and_sorted():
+    board = Leaderboard(size=3)
+    for user_id in range(1, 7):
+        board.update(user_id, f"P{user_id}", points=user_id * 10)
+    assert [standing.user_id for standing in board.leaders()] == [6, 5, 4]
+    board.update(1, "P1", points=100)
+    assert [standing.user_id for standing in board.leaders()] == [1, 6, 5]
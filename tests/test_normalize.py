@@ -0,0 +1,32 @@
+"""
+fold_word: one lookup key for dataset names and player input
+"""
+import pytest
+
+from AntakshariBot.data.normalize import fold_word
+
+
+@pytest.mark.parametrize("text, key", [
+    ("Herāt", "herat"),
+    ("HERAT", "herat"),
+    ("Jalālābād", "jalalabad"),
+    ("Ḩukūmatī Azrah", "hukumati azrah"),
+    ("Dasht-e Archī", "dasht e archi"),
+    ("Za'atara", "zaatara"),
+    ("Za’atara", "zaatara"),
+    ("Øresund", "oresund"),
+    ("Łódź", "lodz"),
+    ("Straße", "strasse"),
+    ("  St. Louis  ", "st louis"),
+    ("U.S.", "u s"),
+    ("12th Street", "12th street"),
+    ("", ""),
+    ("--", ""),
+])
+def test_fold_word(text, key):
+    assert fold_word(text) == key
+
+
+def test_fold_word_is_idempotent():
+    for text in ("Herāt", "Dasht-e Archī", "São Tomé", "Ærøskøbing"):
+        assert fold_word(fold_word(text)) == fold_word(text)
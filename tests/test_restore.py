@@ -0,0 +1,127 @@
+"""
+GameManager.restore_games: rebuilding games from stored documents and re-arming their deadlines
+"""
+import asyncio
+import time
+
+import pytest
+
+import config
+from AntakshariBot import game_manager as game_manager_module
+from AntakshariBot.data.data_loader import data_loader
+from AntakshariBot.data.word_index import build_index
+from AntakshariBot.game_manager import GameManager
+from AntakshariBot.game_state import ACTIVE, JOINING
+
+
+class FakeDatabase:
+    def __init__(self, docs):
+        self.docs = docs
+        self.tracked = []
+        self.created = []
+        self.ended = []
+
+    async def load_games(self):
+        return self.docs
+
+    def track_game(self, game):
+        self.tracked.append(game.chat_id)
+
+    def create_game(self, game):
+        self.created.append(game.chat_id)
+
+    async def end_game(self, chat_id):
+        self.ended.append(chat_id)
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = build_index(
+        ("india", "nepal"), ("mumbai", "delhi", "agra"), (),
+        alias_groups=[("Mumbai", "Bombay")]
+    )
+    monkeypatch.setattr(data_loader, "index", index)
+    return index
+
+
+def game_doc(chat_id, status=ACTIVE, **fields):
+    doc = {
+        "chat_id": chat_id, "status": status, "creator": 1, "current_player": 1,
+        "players": [{"id": 1, "name": "Asha", "score": 20}, {"id": 2, "name": "Ravi", "score": 10}],
+        "last_word": "india", "next_letter": "a", "round": 2, "theme": "all",
+        "used_words": ["india"], "deadline": time.time() + 20
+    }
+    doc.update(fields)
+    return doc
+
+
+def restore(monkeypatch, docs):
+    database = FakeDatabase(docs)
+    monkeypatch.setattr(game_manager_module, "db", database)
+
+    async def scenario():
+        manager = GameManager()
+        restored = await manager.restore_games(client=None)
+        timers = len(manager.timers)
+        await manager.timers.stop()
+        return manager, restored, timers
+
+    manager, restored, timers = asyncio.run(scenario())
+    return manager, database, restored, timers
+
+
+def test_restores_games_and_deadlines(monkeypatch, index):
+    now = time.time()
+    docs = [game_doc(1), game_doc(2, status=JOINING, deadline=now + 40)]
+    manager, database, restored, timers = restore(monkeypatch, docs)
+
+    assert restored == 2 and timers == 2
+    assert database.tracked == [1, 2]
+    game = manager.active_games[1]
+    assert game.current.id == 2 and game.players[1].score == 20
+    assert list(game.used_words) == [index.class_of[index.lookup("india")]]
+    assert abs(game.deadline - docs[0]["deadline"]) < 1
+    assert manager.expected_speakers == {1: 2}
+    assert abs(manager.active_games[2].deadline - (now + 40)) < 1
+
+
+def test_used_words_load_by_key_and_legacy_names(monkeypatch, index):
+    docs = [game_doc(1, used_words=["Bombay", "Delhi", "nowhere"])]
+    manager, database, restored, _ = restore(monkeypatch, docs)
+
+    used = manager.active_games[1].used_words
+    assert index.class_of[index.lookup("mumbai")] in used
+    assert index.class_of[index.lookup("delhi")] in used
+    assert len(used) == 2
+    # Stored in an older form: written whole on the next flush
+    assert database.created == [1] and database.tracked == []
+    assert manager.active_games[1].to_doc()["used_words"] == ["bombay", "delhi"]
+
+
+def test_missing_deadline_gets_the_full_time(monkeypatch, index):
+    now = time.time()
+    docs = [game_doc(1, deadline=None), game_doc(2, status=JOINING, deadline=None)]
+    manager, _, restored, _ = restore(monkeypatch, docs)
+
+    assert restored == 2
+    assert manager.active_games[1].deadline >= now + config.TURN_TIME
+    assert manager.active_games[2].deadline >= now + config.JOIN_TIME
+
+
+def test_missing_theme_uses_default(monkeypatch, index):
+    doc = game_doc(1)
+    del doc["theme"]
+    manager, _, restored, _ = restore(monkeypatch, [doc])
+    assert restored == 1 and manager.active_games[1].theme == config.DEFAULT_THEME
+
+
+def test_bad_document_does_not_stop_the_rest(monkeypatch, index):
+    docs = [game_doc(1, players=[{"name": "no id"}]), game_doc(2)]
+    manager, _, restored, _ = restore(monkeypatch, docs)
+    assert restored == 1 and list(manager.active_games) == [2]
+
+
+def test_game_without_players_is_ended(monkeypatch, index):
+    manager, database, restored, _ = restore(monkeypatch, [game_doc(1, players=[]), game_doc(2)])
+    assert restored == 1 and database.ended == [1]
+    assert 1 not in manager.active_games
@@ -0,0 +1,160 @@
+"""
+TimerWheel: deadlines fire once, on time, with the callback last scheduled for their key
+"""
+import asyncio
+import time
+
+from AntakshariBot.scheduler import TimerWheel
+
+TICK = 0.01
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_fires_after_delay():
+    async def scenario():
+        wheel = TimerWheel(tick=TICK)
+        fired = []
+
+        async def callback(value):
+            fired.append((value, loop.time()))
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        wheel.schedule("game", 0.05, callback, "done")
+        await asyncio.sleep(0.15)
+        await wheel.stop()
+        return started, fired
+
+    started, fired = run(scenario())
+    assert [value for value, _ in fired] == ["done"]
+    assert fired[0][1] - started >= 0.05
+
+
+def test_reschedule_replaces_pending_deadline():
+    async def scenario():
+        wheel = TimerWheel(tick=TICK)
+        fired = []
+
+        async def callback(value):
+            fired.append(value)
+
+        wheel.schedule("game", 0.03, callback, "first")
+        wheel.schedule("game", 0.08, callback, "second")
+        await asyncio.sleep(0.05)
+        early = list(fired)
+        await asyncio.sleep(0.1)
+        await wheel.stop()
+        return early, fired
+
+    early, fired = run(scenario())
+    assert early == []
+    assert fired == ["second"]
+
+
+def test_reschedule_to_same_tick_keeps_one_entry():
+    async def scenario():
+        wheel = TimerWheel(tick=TICK)
+        fired = []
+
+        async def callback(value):
+            fired.append(value)
+
+        wheel.schedule("game", 0.05, callback, "first")
+        wheel.schedule("game", 0.05, callback, "second")
+        entries = sum(len(slot) for slot in wheel.slots)
+        await asyncio.sleep(0.12)
+        await wheel.stop()
+        return entries, fired
+
+    entries, fired = run(scenario())
+    assert entries == 1
+    assert fired == ["second"]
+
+
+def test_cancel():
+    async def scenario():
+        wheel = TimerWheel(tick=TICK)
+        fired = []
+
+        async def callback():
+            fired.append(True)
+
+        wheel.schedule("game", 0.03, callback)
+        wheel.cancel("game")
+        await asyncio.sleep(0.08)
+        await wheel.stop()
+        return len(wheel), fired
+
+    assert run(scenario()) == (0, [])
+
+
+def test_delay_longer_than_one_revolution():
+    async def scenario():
+        # 4 slots of 10 ms: a 100 ms deadline passes its slot twice before it is due
+        wheel = TimerWheel(tick=TICK, slots=4)
+        fired = []
+
+        async def callback():
+            fired.append(loop.time())
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        wheel.schedule("game", 0.1, callback)
+        await asyncio.sleep(0.07)
+        early = list(fired)
+        await asyncio.sleep(0.12)
+        await wheel.stop()
+        return started, early, fired
+
+    started, early, fired = run(scenario())
+    assert early == []
+    assert len(fired) == 1 and fired[0] - started >= 0.1
+
+
+def test_callback_errors_do_not_stop_the_wheel():
+    async def scenario():
+        wheel = TimerWheel(tick=TICK)
+        fired = []
+
+        async def failing():
+            raise RuntimeError("boom")
+
+        async def callback():
+            fired.append(True)
+
+        wheel.schedule("a", 0.02, failing)
+        wheel.schedule("b", 0.04, callback)
+        await asyncio.sleep(0.1)
+        await wheel.stop()
+        return fired
+
+    assert run(scenario()) == [True]
+
+
+def test_loop_stall_while_idle_does_not_skip_the_deadline():
+    async def scenario():
+        wheel = TimerWheel(tick=0.05, slots=16)
+        fired = []
+
+        async def callback():
+            fired.append(loop.time())
+
+        loop = asyncio.get_running_loop()
+        # Fire once so the run loop goes idle, waiting for the next deadline
+        wheel.schedule("warmup", 0.05, callback)
+        await asyncio.sleep(0.2)
+
+        started = loop.time()
+        wheel.schedule("game", 0.3, callback)
+        time.sleep(0.5)  # the loop stalls past the deadline before the wheel wakes
+        await asyncio.sleep(0.3)
+        await wheel.stop()
+        return started, fired
+
+    started, fired = run(scenario())
+    assert len(fired) == 2
+    # Fires as soon as the loop is back, not a whole revolution (0.8 s) later
+    assert fired[1] - started < 0.7
@@ -0,0 +1,76 @@
+"""
+build_index alias classes: union-find over alternative names, and what they share
+"""
+from AntakshariBot.data.word_index import ALIAS, CITY, COUNTRY, build_index
+
+
+def build():
+    return build_index(
+        ("india", "united states"),
+        ("mumbai", "delhi", "new york"),
+        (),
+        alias_groups=[
+            ("Mumbai", "Bombay"),
+            ("United States", "USA"),
+            ("USA", "America", "U.S."),  # shares USA with the group before: one class
+            ("Atlantis", "Lemuria"),  # no known name: skipped
+        ],
+        country_cities={"india": ["mumbai", "delhi"], "united states": ["new york"]}
+    )
+
+
+def class_of(index, key):
+    return index.class_of[index.lookup(key)]
+
+
+def test_aliases_share_a_class():
+    index = build()
+    assert class_of(index, "bombay") == class_of(index, "mumbai")
+    assert class_of(index, "delhi") != class_of(index, "mumbai")
+
+
+def test_groups_sharing_a_name_merge():
+    index = build()
+    classes = {class_of(index, key) for key in ("united states", "usa", "america", "u s")}
+    assert len(classes) == 1
+    class_id = classes.pop()
+    assert class_id == min(index.members(class_id))
+    assert sorted(index.keys[word_id] for word_id in index.members(class_id)) == ["america", "u s", "united states", "usa"]
+
+
+def test_class_id_is_smallest_member():
+    index = build()
+    for class_id, members in index.class_members.items():
+        assert class_id == min(members)
+        assert all(index.class_of[word_id] == class_id for word_id in members)
+
+
+def test_alias_only_names_take_the_category_of_known_names():
+    index = build()
+    bombay = index.lookup("bombay")
+    assert index.has_flag(bombay, CITY) and index.has_flag(bombay, ALIAS)
+    assert index.has_flag(index.lookup("america"), COUNTRY)
+    assert index.lookup("atlantis") is None
+
+
+def test_aliases_share_countries():
+    index = build()
+    india = index.lookup("india")
+    theme = index.find_theme("cities of india")
+    assert theme is not None
+    assert theme.contains(index.lookup("bombay"))
+    assert index.country_ids[index.country_of[index.lookup("bombay")]] == india
+
+
+def test_words_without_aliases_are_their_own_class():
+    index = build()
+    delhi = index.lookup("delhi")
+    assert index.class_of[delhi] == delhi
+    assert index.members(delhi) == (delhi,)
+
+
+def test_names_with_digits_are_not_indexed():
+    index = build_index(("india",), ("delhi", "12th street", "administrative zone 1", "1 decembrie"), (),
+                        alias_groups=[("Delhi", "Delhi 6")])
+    assert sorted(index.keys) == ["delhi", "india"]
+    assert sorted(index.letter_ranges) == ["d", "i"]
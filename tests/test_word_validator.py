@@ -0,0 +1,38 @@
+"""
+WordValidator.validate_word: folded lookups, and the letters-only rule for every name
+"""
+import asyncio
+
+from AntakshariBot.data.word_index import build_index
+from AntakshariBot.game_state import UsedWords
+from AntakshariBot.word_validator import WordValidator
+
+
+def validator() -> WordValidator:
+    word_validator = WordValidator()
+    word_validator.index = build_index(
+        ("india", "afghanistan"), ("herāt", "delhi", "administrative zone 1", "12th street"), ()
+    )
+    word_validator.data_ready = True
+    return word_validator
+
+
+def validate(word: str, letter: str = ""):
+    return asyncio.run(validator().validate_word(word, letter, UsedWords()))
+
+
+def test_accents_and_case_fold():
+    result = validate("HERAT")
+    assert result["valid"] and result["word"] == "herāt" and result["next_letter"] == "t"
+
+
+def test_names_with_digits_are_rejected():
+    for word in ("Administrative Zone 1", "12th street", "sector 12"):
+        result = validate(word)
+        assert not result["valid"]
+        assert result["reason"] == "Word must contain only letters!"
+
+
+def test_required_letter():
+    assert not validate("delhi", "h")["valid"]
+    assert validate("delhi", "d")["valid"]